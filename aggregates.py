@@ -0,0 +1,293 @@
+"""
+Agregados combinables de resultados de exámenes
+
+Un PartialAggregate resume un conjunto de hojas con estructuras de tamaño
+independiente del número de estudiantes:
+    - conteo, media y M2 de la nota (algoritmo de Welford) y la distribución
+      exacta de notas (valor -> frecuencia), de la que se derivan extremos,
+      percentiles e histograma
+    - conteo, media y M2 de la nota por examen y por cohorte
+    - aciertos, estudiantes evaluados e histograma de opciones por pregunta
+
+Dos agregados se combinan de forma exacta (las preguntas se alinean por
+nombre), por lo que sirven tanto para unir archivos procesados en paralelo
+(batch.py) como para actualizar los resultados al agregar un lote nuevo a
+los datos cargados (DataManager.read_append) en tiempo proporcional al lote.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from answer_store import AnswerStore
+from item_analysis import NOT_ASKED, OPTIONS, difficulty_labels, question_sort_key, score_matrix
+
+# Columnas del histograma de opciones: en blanco y A-D (según su código)
+OPTION_COLUMNS = ('En blanco',) + OPTIONS
+
+PERCENTILES = (0.25, 0.50, 0.75, 0.90, 0.95)
+
+
+class RunningStats:
+    """Conteo, media, M2 y extremos con actualización de Welford
+
+    merge usa la fórmula de Chan et al. para combinar dos acumulados sin
+    volver a recorrer los valores.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'minimum', 'maximum')
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 minimum: float = float('inf'), maximum: float = float('-inf')):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> 'RunningStats':
+        """Acumulado de un arreglo de valores (se ignoran los NaN)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return cls()
+        mean = float(values.mean())
+        return cls(len(values), mean, float(np.square(values - mean).sum()),
+                   float(values.min()), float(values.max()))
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """Combina dos acumulados"""
+        if not other.count:
+            return self.copy()
+        if not self.count:
+            return other.copy()
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return RunningStats(count,
+                            self.mean + delta * other.count / count,
+                            self.m2 + other.m2 + delta ** 2 * self.count * other.count / count,
+                            min(self.minimum, other.minimum),
+                            max(self.maximum, other.maximum))
+
+    def copy(self) -> 'RunningStats':
+        return RunningStats(self.count, self.mean, self.m2, self.minimum, self.maximum)
+
+    @property
+    def variance(self) -> float:
+        """Varianza muestral (n - 1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    def __repr__(self) -> str:
+        return f"RunningStats(count={self.count}, mean={self.mean:.4f}, std={self.std:.4f})"
+
+
+def group_stats(keys: pd.Series, values: np.ndarray) -> Dict[str, RunningStats]:
+    """Acumulado de la nota por grupo (se ignoran los NaN)"""
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        # Agrupar por código evita convertir cada fila a texto; el código -1
+        # (valor ausente) corresponde a la última etiqueta, 'nan'
+        labels = list(keys.cat.categories.astype(str)) + ['nan']
+        frame = pd.DataFrame({'grupo': keys.cat.codes.to_numpy(), 'v': values})
+    else:
+        labels = None
+        frame = pd.DataFrame({'grupo': keys.astype(str).to_numpy(), 'v': values})
+    grouped = frame.groupby('grupo', sort=True)['v'].agg(['count', 'mean', 'var', 'min', 'max'])
+    groups = {}
+    for group, row in grouped.iterrows():
+        count = int(row['count'])
+        if count:
+            m2 = float(row['var']) * (count - 1) if count > 1 else 0.0
+            name = str(labels[group]) if labels is not None else str(group)
+            groups[name] = RunningStats(count, float(row['mean']), m2, float(row['min']), float(row['max']))
+    return dict(sorted(groups.items()))
+
+
+def merge_groups(left: Dict[str, RunningStats], right: Dict[str, RunningStats]) -> Dict[str, RunningStats]:
+    merged = dict(left)
+    for group, stats in right.items():
+        merged[group] = merged[group].merge(stats) if group in merged else stats
+    return merged
+
+
+def quantile_from_counts(values: np.ndarray, counts: np.ndarray, q: float) -> float:
+    """Cuantil con interpolación lineal (igual que pandas) a partir de frecuencias"""
+    n = int(counts.sum())
+    position = q * (n - 1)
+    lower, upper = int(np.floor(position)), int(np.ceil(position))
+    cumulative = np.cumsum(counts)
+    low_value = values[np.searchsorted(cumulative, lower, side='right')]
+    high_value = values[np.searchsorted(cumulative, upper, side='right')]
+    return float(low_value + (high_value - low_value) * (position - lower))
+
+
+class PartialAggregate:
+    """Agregado combinable de uno o varios conjuntos de hojas"""
+
+    def __init__(self, sources: List[str], questions: List[str], students: int, scores: RunningStats,
+                 score_values: np.ndarray, score_counts: np.ndarray,
+                 exams: Dict[str, RunningStats], cohorts: Dict[str, RunningStats],
+                 correct: np.ndarray, asked: np.ndarray, options: np.ndarray, error_count: int = 0):
+        self.sources = sources
+        self.questions = questions
+        # Hojas incluidas (con o sin nota)
+        self.students = students
+        self.scores = scores
+        # Distribución exacta de notas: valores ordenados y su frecuencia
+        self.score_values = score_values
+        self.score_counts = score_counts
+        # Acumulados de la nota por examen y por cohorte
+        self.exams = exams
+        self.cohorts = cohorts
+        # Por pregunta: aciertos, estudiantes evaluados y pregunta × OPTION_COLUMNS
+        self.correct = correct
+        self.asked = asked
+        self.options = options
+        self.error_count = error_count
+
+    @classmethod
+    def from_dataset(cls, source: str, store: AnswerStore, df: pd.DataFrame,
+                     error_count: int = 0, rows: Optional[np.ndarray] = None) -> 'PartialAggregate':
+        """Resume los datos de un archivo o de un lote
+
+        Con rows, solo se resumen esas filas del DataFrame (store debe tener
+        ya únicamente esas filas); las columnas se indexan sin copiar el
+        DataFrame.
+        """
+        exams, cohorts = df['examen'], df['año_ingreso']
+        notas = df['nota'].to_numpy(dtype=np.float64)
+        if rows is not None:
+            exams, cohorts, notas = exams.iloc[rows], cohorts.iloc[rows], notas[rows]
+        score_values, score_counts = np.unique(notas[~np.isnan(notas)], return_counts=True)
+
+        keys = store.key_matrix()
+        answers = store.answers
+        n_items = len(store.questions)
+        asked_mask = keys != NOT_ASKED
+        codes = answers.astype(np.int64) + np.arange(n_items, dtype=np.int64) * len(OPTION_COLUMNS)
+        options = np.bincount(codes[asked_mask], minlength=n_items * len(OPTION_COLUMNS))
+
+        return cls(
+            sources=[source],
+            questions=list(store.questions),
+            students=len(notas),
+            scores=RunningStats.from_values(notas),
+            score_values=score_values,
+            score_counts=score_counts.astype(np.int64),
+            exams=group_stats(exams, notas),
+            cohorts=group_stats(cohorts, notas),
+            correct=score_matrix(answers, keys).sum(axis=0).astype(np.int64),
+            asked=asked_mask.sum(axis=0).astype(np.int64),
+            options=options.reshape(n_items, len(OPTION_COLUMNS)).astype(np.int64),
+            error_count=error_count
+        )
+
+    @property
+    def count(self) -> int:
+        """Hojas con nota"""
+        return self.scores.count
+
+    def _aligned(self, questions: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Arreglos por pregunta reordenados a otra lista de preguntas (ceros si faltan)"""
+        if questions == self.questions:
+            return self.correct, self.asked, self.options
+        position = {question: i for i, question in enumerate(questions)}
+        index = np.array([position[q] for q in self.questions], dtype=np.int64)
+        correct = np.zeros(len(questions), dtype=np.int64)
+        asked = np.zeros(len(questions), dtype=np.int64)
+        options = np.zeros((len(questions), len(OPTION_COLUMNS)), dtype=np.int64)
+        correct[index] = self.correct
+        asked[index] = self.asked
+        options[index] = self.options
+        return correct, asked, options
+
+    def merge(self, other: 'PartialAggregate') -> 'PartialAggregate':
+        """Combina dos agregados; el resultado es exacto"""
+        if other.questions == self.questions:
+            questions = self.questions
+        else:
+            questions = sorted(set(self.questions) | set(other.questions), key=question_sort_key)
+        left, right = self._aligned(questions), other._aligned(questions)
+
+        values = np.concatenate([self.score_values, other.score_values])
+        counts = np.concatenate([self.score_counts, other.score_counts])
+        score_values, inverse = np.unique(values, return_inverse=True)
+        score_counts = np.bincount(inverse.reshape(-1), weights=counts, minlength=len(score_values))
+
+        return PartialAggregate(
+            sources=self.sources + other.sources,
+            questions=questions,
+            students=self.students + other.students,
+            scores=self.scores.merge(other.scores),
+            score_values=score_values,
+            score_counts=score_counts.astype(np.int64),
+            exams=merge_groups(self.exams, other.exams),
+            cohorts=merge_groups(self.cohorts, other.cohorts),
+            correct=left[0] + right[0],
+            asked=left[1] + right[1],
+            options=left[2] + right[2],
+            error_count=self.error_count + other.error_count
+        )
+
+    def percentiles(self, quantiles: Sequence[float] = PERCENTILES) -> Dict[float, float]:
+        """Percentiles exactos de la nota"""
+        if not self.count:
+            return {}
+        return {q: quantile_from_counts(self.score_values, self.score_counts, q) for q in quantiles}
+
+    def histogram(self, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Frecuencias e intervalos del histograma de notas (igual que np.histogram)"""
+        counts, edges = np.histogram(self.score_values, bins=bins, weights=self.score_counts)
+        return counts.astype(np.int64), edges
+
+    def summary(self) -> Dict:
+        """Resumen de notas"""
+        scores = self.scores
+        empty = float('nan')
+        return {
+            'archivos': len(self.sources),
+            'total_estudiantes': self.students,
+            'tipos_examen': len(self.exams),
+            'examen_tipos': sorted(self.exams),
+            'nota_promedio': scores.mean if scores.count else empty,
+            'nota_max': scores.maximum if scores.count else empty,
+            'nota_min': scores.minimum if scores.count else empty,
+            'std_nota': scores.std,
+            'percentiles': {f"P{int(q * 100)}": value for q, value in self.percentiles().items()},
+            'total_preguntas': len(self.questions),
+            'registros_con_errores': self.error_count
+        }
+
+    def question_table(self) -> pd.DataFrame:
+        """Aciertos, porcentaje y dificultad por pregunta"""
+        proportion = np.zeros(len(self.questions))
+        np.divide(self.correct, self.asked, out=proportion, where=self.asked > 0)
+        return pd.DataFrame({
+            'pregunta': list(self.questions),
+            'correctas': self.correct,
+            'total': self.asked,
+            'porcentaje_acierto': proportion * 100,
+            'dificultad': difficulty_labels(proportion)
+        })
+
+    def items_table(self) -> pd.DataFrame:
+        """Análisis por pregunta con la distribución de respuestas (%)"""
+        table = self.question_table()
+        shares = np.zeros(self.options.shape)
+        np.divide(self.options * 100, self.asked[:, None], out=shares, where=self.asked[:, None] > 0)
+        for column, label in enumerate(OPTION_COLUMNS):
+            table[f'{label} (%)'] = shares[:, column]
+        return table
+
+    @staticmethod
+    def group_table(groups: Dict[str, RunningStats], label: str) -> pd.DataFrame:
+        """Conteo, media y desviación estándar por grupo"""
+        rows = [{label: group, 'count': groups[group].count, 'mean': groups[group].mean,
+                 'std': groups[group].std}
+                for group in sorted(groups)]
+        return pd.DataFrame(rows, columns=[label, 'count', 'mean', 'std'])
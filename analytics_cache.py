@@ -0,0 +1,140 @@
+"""
+Caché de resultados de análisis
+
+Guarda los resultados de los cálculos de DataManager con una clave
+(estado de los datos, métrica, parámetros). El estado incluye la versión
+del conjunto de datos, de modo que una recarga invalida automáticamente las
+entradas anteriores. Las entradas se descartan por antigüedad de uso (LRU)
+cuando se supera el presupuesto de memoria.
+
+Si varios hilos piden a la vez un valor ausente, solo el primero lo calcula
+y los demás esperan su resultado (por ejemplo, varias consultas iguales al
+servicio local, server.py).
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Presupuesto de memoria por defecto (bytes)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def estimate_size(value: Any) -> int:
+    """Estima la memoria ocupada por un resultado (bytes)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class _Pending:
+    """Cálculo en curso de una clave (lo esperan los demás hilos que la piden)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.failed = False
+
+
+class AnalyticsCache:
+    """Caché LRU con presupuesto de memoria y contadores de aciertos/fallos
+
+    Es segura para usarse desde varios hilos; el cálculo de un valor ausente
+    se hace fuera del candado y una sola vez aunque lo pidan varios hilos.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._total_bytes = 0
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._lock = threading.RLock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Retorna el valor guardado para key o lo calcula y lo guarda
+
+        Si otro hilo ya está calculando key, espera y retorna su resultado;
+        si ese cálculo falla, lo intenta de nuevo en este hilo.
+        """
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+                pending: Optional[_Pending] = self._pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    pending = self._pending[key] = _Pending()
+                    break
+            pending.done.wait()
+            if not pending.failed:
+                with self._lock:
+                    self.hits += 1
+                return pending.value
+
+        try:
+            value = compute()
+        except BaseException:
+            pending.failed = True
+            raise
+        else:
+            pending.value = value
+            self.put(key, value)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.done.set()
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """Guarda un valor y descarta los menos usados si se excede el presupuesto"""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def clear(self):
+        """Elimina todas las entradas (los contadores se conservan)"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de uso de la caché"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
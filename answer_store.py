@@ -0,0 +1,365 @@
+"""
+Almacén columnar de respuestas
+
+En lugar de conservar en el DataFrame un diccionario por estudiante con sus
+respuestas y otro con la clave, las respuestas se guardan en una matriz
+contigua int8 (estudiante×pregunta) y las claves en una tabla deduplicada:
+cada clave distinta ocupa una sola fila y cada estudiante guarda únicamente
+el índice de su clave.
+
+El conjunto de preguntas se descubre durante la carga a partir de las
+claves: la matriz tiene una columna por pregunta de cualquier versión y, en
+la tabla de claves, las preguntas que una versión no incluye valen
+NOT_ASKED. Cada versión de examen guarda su clave una sola vez.
+
+Huella de memoria por estudiante (Q preguntas, medida con 20 preguntas):
+    - respuestas: Q bytes (int8)                         ->  20 B
+    - índice de clave: 1 byte (int8, hasta 127 claves)   ->   1 B
+    - tabla de claves: Q bytes por clave distinta         ->  ~0 B
+    - columnas escalares del DataFrame (código y nombre
+      internados, examen y cohorte categóricos,
+      correctas/incorrectas int8, nota float64)          -> ~180 B
+Total aproximado: ~200 B por estudiante (DataManager.get_memory_usage),
+frente a varios KB cuando se mantenían la lista original y dos
+diccionarios por fila. Un archivo de 200k hojas queda alrededor de 40 MB.
+"""
+
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from item_analysis import (BLANK, NOT_ASKED, encode_keys, encode_raw_answers, question_sort_key,
+                           score_matrix)
+from profiling import profiler
+
+# Columnas escalares que se conservan en el DataFrame de estudiantes
+STUDENT_FIELDS = ['codigo', 'apellidos_nombres', 'examen', 'correctas', 'incorrectas', 'nota']
+
+
+def smallest_int_dtype(max_value: int) -> np.dtype:
+    """Retorna el tipo entero con signo más pequeño que admite max_value"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _intern(values) -> List:
+    """Interna las cadenas para que los valores repetidos compartan memoria"""
+    return [sys.intern(v) if isinstance(v, str) else v for v in values]
+
+
+class AnswerStore:
+    """Respuestas codificadas en una matriz int8 y tabla deduplicada de claves"""
+
+    def __init__(self, answers: np.ndarray, key_table: np.ndarray, key_index: np.ndarray,
+                 questions: Sequence[str], exam_keys: Optional[Dict[str, int]] = None):
+        self.answers = np.ascontiguousarray(answers, dtype=np.int8)
+        self.key_table = np.ascontiguousarray(key_table, dtype=np.int8)
+        self.key_index = key_index
+        self.questions: List[str] = list(questions)
+        # Clave más frecuente de cada tipo de examen
+        self.exam_keys: Dict[str, int] = exam_keys or {}
+
+    def __len__(self) -> int:
+        return self.answers.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por las matrices del almacén"""
+        return self.answers.nbytes + self.key_table.nbytes + self.key_index.nbytes
+
+    def key_matrix(self) -> np.ndarray:
+        """Expande la tabla de claves a una matriz estudiante×pregunta"""
+        return self.key_table[self.key_index]
+
+    def correct_matrix(self) -> np.ndarray:
+        """Matriz booleana de aciertos estudiante×pregunta"""
+        return score_matrix(self.answers, self.key_matrix())
+
+    @property
+    def is_ragged(self) -> bool:
+        """Indica si alguna versión de examen no incluye todas las preguntas"""
+        return bool((self.key_table == NOT_ASKED).any())
+
+    def asked_mask(self) -> Optional[np.ndarray]:
+        """Máscara estudiante×pregunta de preguntas aplicadas; None si todas lo fueron"""
+        if not self.is_ragged:
+            return None
+        return self.key_matrix() != NOT_ASKED
+
+    def exam_questions(self) -> Dict[str, List[str]]:
+        """Preguntas de cada tipo de examen (según su clave más frecuente)"""
+        return {exam: [q for q, code in zip(self.questions, self.key_table[key_id]) if code != NOT_ASKED]
+                for exam, key_id in self.exam_keys.items()}
+
+    def take(self, rows: np.ndarray) -> 'AnswerStore':
+        """Almacén con solo las filas indicadas (la tabla de claves se comparte)"""
+        return AnswerStore(self.answers[rows], self.key_table, self.key_index[rows],
+                           self.questions, self.exam_keys)
+
+    def compact(self) -> 'AnswerStore':
+        """Almacén sin las preguntas que no se aplicaron a ninguna de sus filas"""
+        asked = (self.key_table[np.unique(self.key_index)] != NOT_ASKED).any(axis=0)
+        if asked.all():
+            return self
+        columns = np.flatnonzero(asked)
+        return AnswerStore(self.answers[:, columns], self.key_table[:, columns], self.key_index,
+                           [self.questions[i] for i in columns], self.exam_keys)
+
+    def _widened(self, questions: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Respuestas y tabla de claves con las columnas de otra lista de preguntas"""
+        if questions == self.questions:
+            return self.answers, self.key_table
+        position = {question: i for i, question in enumerate(questions)}
+        columns = [position[q] for q in self.questions]
+        answers = np.zeros((len(self), len(questions)), dtype=np.int8)
+        answers[:, columns] = self.answers
+        key_table = np.full((len(self.key_table), len(questions)), NOT_ASKED, dtype=np.int8)
+        key_table[:, columns] = self.key_table
+        return answers, key_table
+
+    def append(self, other: 'AnswerStore') -> 'AnswerStore':
+        """Nuevo almacén con las filas de otro a continuación de las propias
+
+        Las preguntas se unen por nombre. Las claves existentes conservan su
+        índice y las nuevas se agregan al final de la tabla, por lo que los
+        índices de las filas ya cargadas no se recalculan.
+        """
+        if other.questions == self.questions:
+            questions = self.questions
+        else:
+            questions = sorted(set(self.questions) | set(other.questions), key=question_sort_key)
+        answers, key_table = self._widened(questions)
+        other_answers, other_table = other._widened(questions)
+
+        key_ids = {row.tobytes(): i for i, row in enumerate(key_table)}
+        new_rows = []
+        remap = np.empty(len(other_table), dtype=np.int64)
+        for i, row in enumerate(other_table):
+            key_id = key_ids.get(row.tobytes())
+            if key_id is None:
+                key_id = key_ids[row.tobytes()] = len(key_table) + len(new_rows)
+                new_rows.append(row)
+            remap[i] = key_id
+        if new_rows:
+            key_table = np.vstack([key_table] + new_rows)
+
+        dtype = smallest_int_dtype(max(len(key_table) - 1, 0))
+        key_index = np.concatenate([self.key_index.astype(dtype, copy=False),
+                                    remap[other.key_index].astype(dtype)])
+        exam_keys = dict(self.exam_keys)
+        for exam, key_id in other.exam_keys.items():
+            exam_keys.setdefault(exam, int(remap[key_id]))
+        return AnswerStore(np.concatenate([answers, other_answers]), key_table, key_index,
+                           questions, exam_keys)
+
+
+def _finish_student_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Aplica los tipos compactos a las columnas escalares"""
+    df['codigo'] = pd.Series(_intern(df['codigo']), index=df.index, dtype=object)
+    df['apellidos_nombres'] = pd.Series(_intern(df['apellidos_nombres']), index=df.index, dtype=object)
+    df['examen'] = df['examen'].astype('category')
+    # Año de ingreso (primeros 4 dígitos del código)
+    df['año_ingreso'] = df['codigo'].astype(str).str[:4].astype('category')
+
+    # Los valores no numéricos quedan como NaN y los informa la validación
+    for column in ('correctas', 'incorrectas'):
+        df[column] = pd.to_numeric(df[column], errors='coerce', downcast='integer')
+    df['nota'] = pd.to_numeric(df['nota'])
+    return df
+
+
+def append_student_frame(df: pd.DataFrame, other: pd.DataFrame) -> pd.DataFrame:
+    """Concatena dos DataFrames de estudiantes conservando los tipos compactos"""
+    frame = pd.concat([df, other], ignore_index=True)
+    # Categorías distintas en cada parte se convertirían en object
+    for column in ('examen', 'año_ingreso'):
+        frame[column] = union_categoricals([df[column], other[column]], sort_categories=True)
+    return frame
+
+
+class AnswerStoreBuilder:
+    """Construye el almacén de forma incremental, por bloques de tamaño fijo
+
+    Los registros se acumulan hasta completar un bloque; al vaciarlo, las
+    respuestas se codifican en una matriz int8 y los registros originales se
+    descartan, de modo que la memoria usada no depende del tamaño del archivo
+    sino del tamaño del bloque y de las columnas compactas ya construidas.
+
+    Si no se indican las preguntas, se descubren en las claves: cada clave
+    distinta agrega las preguntas nuevas que contenga. Los bloques anteriores
+    se completan con columnas en blanco al construir el almacén y las
+    columnas se ordenan por nombre en orden natural.
+
+    Las respuestas ausentes o fuera de A-D de las preguntas que el
+    estudiante debía responder quedan en flagged_answers (filas, columnas y
+    códigos MISSING / INVALID) para la validación; en el almacén se guardan
+    como BLANK.
+    """
+
+    def __init__(self, questions: Optional[Sequence[str]] = None, chunk_size: int = 10_000):
+        self.questions: List[str] = list(questions or [])
+        self.chunk_size = chunk_size
+        # Con preguntas fijas se ignoran las que no estén en la lista
+        self._discover = questions is None
+        self._question_set = set(self.questions)
+
+        self._pending: List[Dict] = []
+        self._answer_chunks: List[np.ndarray] = []
+        self._key_index: List[int] = []
+        self._key_ids: Dict[Tuple, int] = {}
+        # Última clave vista por tipo de examen: evita recalcular su firma
+        self._last_keys: Dict[str, Tuple[Dict, int]] = {}
+        self._exam_key_counts: Counter = Counter()
+        self._columns: Dict[str, List] = {field: [] for field in STUDENT_FIELDS}
+        self.flagged_answers: Tuple[np.ndarray, np.ndarray, np.ndarray] = (
+            np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int8))
+
+        # Acumulados para mostrar resultados parciales durante la carga
+        self.count = 0
+        self.nota_sum = 0.0
+
+    def __len__(self) -> int:
+        return self.count + len(self._pending)
+
+    def add(self, record: Dict) -> bool:
+        """Agrega un registro validado; retorna True si se completó un bloque"""
+        self._pending.append(record)
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+            return True
+        return False
+
+    def extend(self, records: Sequence[Dict]):
+        """Agrega varios registros"""
+        for record in records:
+            self.add(record)
+        self.flush()
+
+    def _key_id(self, exam: str, key: Dict) -> int:
+        """Identificador de la clave; las claves nuevas registran sus preguntas"""
+        last = self._last_keys.get(exam)
+        if last is not None and last[0] == key:
+            return last[1]
+
+        signature = tuple(key.items())
+        key_id = self._key_ids.get(signature)
+        if key_id is None:
+            key_id = self._key_ids[signature] = len(self._key_ids)
+            if self._discover:
+                for question in key:
+                    if question not in self._question_set:
+                        self._question_set.add(question)
+                        self.questions.append(question)
+        self._last_keys[exam] = (key, key_id)
+        return key_id
+
+    def flush(self):
+        """Codifica los registros pendientes y los descarta"""
+        chunk = self._pending
+        if not chunk:
+            return
+        self._pending = []
+
+        with profiler.span('codificar_bloque', 'carga', registros=len(chunk)):
+            self._encode_chunk(chunk)
+
+    def _encode_chunk(self, chunk: List[Dict]):
+        """Agrega un bloque de registros a las columnas y matrices parciales"""
+        # Deduplicar claves: cada clave distinta recibe un identificador
+        for record in chunk:
+            exam = record['examen']
+            key_id = self._key_id(exam, record['respuestas_correctas'] or {})
+            self._key_index.append(key_id)
+            self._exam_key_counts[(exam, key_id)] += 1
+
+        # Respuestas con las preguntas conocidas hasta este bloque
+        self._answer_chunks.append(encode_raw_answers((r['respuestas_estudiante'] for r in chunk),
+                                                      self.questions))
+
+        for field, values in self._columns.items():
+            column = [record[field] for record in chunk]
+            if field in ('codigo', 'apellidos_nombres', 'examen'):
+                column = _intern(column)
+            values.extend(column)
+
+        self.count += len(chunk)
+        self.nota_sum += float(np.sum(pd.to_numeric(self._columns['nota'][-len(chunk):], errors='coerce')))
+
+    def partial_summary(self) -> Dict:
+        """Resumen de los registros procesados hasta el momento"""
+        return {
+            'total_estudiantes': self.count,
+            'nota_promedio': self.nota_sum / self.count if self.count else 0.0
+        }
+
+    def _ordered_questions(self) -> List[str]:
+        if self._discover:
+            return sorted(self.questions, key=question_sort_key)
+        return self.questions
+
+    def build_store(self) -> AnswerStore:
+        """Concatena los bloques en un AnswerStore"""
+        self.flush()
+        questions = self._ordered_questions()
+        position = {question: i for i, question in enumerate(questions)}
+
+        # Matriz final: cada bloque ocupa las columnas de las preguntas que conocía
+        answers = np.zeros((self.count, len(questions)), dtype=np.int8)
+        row = 0
+        for chunk in self._answer_chunks:
+            columns = [position[q] for q in self.questions[:chunk.shape[1]]]
+            answers[row:row + len(chunk), columns] = chunk
+            row += len(chunk)
+        self.questions = list(questions)
+        self._answer_chunks = [answers]
+
+        # Claves con el mismo contenido (p. ej. en distinto orden) se fusionan
+        raw_table = encode_keys((dict(signature) for signature in self._key_ids), questions)
+        if len(raw_table):
+            key_table, remap = np.unique(raw_table, axis=0, return_inverse=True)
+            remap = remap.reshape(-1)
+        else:
+            key_table, remap = raw_table, np.zeros(0, dtype=np.int64)
+        key_index = remap[np.array(self._key_index, dtype=np.int64)].astype(
+            smallest_int_dtype(max(len(key_table) - 1, 0)))
+
+        exam_key_counts: Counter = Counter()
+        for (exam, key_id), count in self._exam_key_counts.items():
+            exam_key_counts[(exam, int(remap[key_id]))] += count
+        exam_keys: Dict[str, int] = {}
+        for (exam, key_id), _ in exam_key_counts.most_common():
+            exam_keys.setdefault(exam, key_id)
+
+        self._flag_answers(answers, key_table, key_index)
+        return AnswerStore(answers, key_table, key_index, questions, exam_keys)
+
+    def _flag_answers(self, answers: np.ndarray, key_table: np.ndarray, key_index: np.ndarray):
+        """Registra las respuestas ausentes o inválidas y las reemplaza por BLANK"""
+        flagged = answers < BLANK
+        rows, columns = np.nonzero(flagged)
+        if not len(rows):
+            return
+        # Las preguntas de otras versiones del examen no se responden
+        asked = key_table[key_index[rows], columns] != NOT_ASKED
+        self.flagged_answers = (rows[asked], columns[asked], answers[rows[asked], columns[asked]])
+        np.maximum(answers, BLANK, out=answers)
+
+    def build_frame(self) -> pd.DataFrame:
+        """Crea el DataFrame compacto de estudiantes"""
+        self.flush()
+        return _finish_student_frame(pd.DataFrame(self._columns, columns=STUDENT_FIELDS))
+
+    def build(self) -> Tuple[AnswerStore, pd.DataFrame]:
+        """Retorna el almacén y el DataFrame; los datos intermedios se liberan"""
+        store = self.build_store()
+        df = self.build_frame()
+        self._answer_chunks = []
+        self._key_index = []
+        self._columns = {field: [] for field in STUDENT_FIELDS}
+        return store, df
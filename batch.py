@@ -0,0 +1,168 @@
+"""
+Análisis por lotes de varios archivos de resultados
+
+Cada sesión de examen produce varios archivos (uno por sección o versión).
+Los archivos se reparten entre procesos (ProcessPoolExecutor); cada proceso
+carga su archivo con DataManager.read_file y retorna un agregado parcial
+compacto (aggregates.PartialAggregate) en lugar de los datos completos:
+distribución de notas, acumulados por examen y por cohorte, y aciertos e
+histograma de opciones por pregunta.
+
+El proceso principal combina los agregados (las preguntas se alinean por
+nombre) para obtener el reporte institucional y el de cada archivo. Los
+resultados no dependen del orden en que terminan los procesos.
+
+Uso:
+    python batch.py resultados/ -o reportes/ --procesos 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from aggregates import PartialAggregate
+from data_manager import DataManager
+from export import TABLE_FORMATS, find_input_files, write_json, write_table
+
+
+class BatchResult(NamedTuple):
+    """Resultado de un lote"""
+    total: Optional[PartialAggregate]           # combinación de todos los archivos
+    per_file: Dict[str, PartialAggregate]       # en el orden de entrada
+    errors: Dict[str, str]                      # archivo -> mensaje
+
+
+def analyze_file(source: str, use_cache: bool = True) -> Tuple[str, Optional[PartialAggregate], Optional[str]]:
+    """Carga un archivo y retorna su agregado (se ejecuta en un proceso de trabajo)"""
+    data_manager = DataManager()
+    data_manager.use_cache = use_cache
+    result = data_manager.read_file(source)
+    if not result.success:
+        return source, None, result.message
+    return source, PartialAggregate.from_dataset(source, result.store, result.df,
+                                                  result.validation.omitted), None
+
+
+def run_batch(sources: Sequence[str], max_workers: Optional[int] = None,
+              use_cache: bool = True) -> BatchResult:
+    """Analiza los archivos en paralelo y combina sus agregados
+
+    Con max_workers=1 los archivos se procesan en el proceso actual.
+    """
+    aggregates: Dict[str, PartialAggregate] = {}
+    errors: Dict[str, str] = {}
+
+    def collect(source: str, aggregate: Optional[PartialAggregate], error: Optional[str]):
+        if error is not None:
+            errors[source] = error
+        else:
+            aggregates[source] = aggregate
+
+    if max_workers == 1 or len(sources) <= 1:
+        for source in sources:
+            collect(*analyze_file(source, use_cache))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(analyze_file, source, use_cache): source for source in sources}
+            for future in as_completed(futures):
+                try:
+                    collect(*future.result())
+                except Exception as e:
+                    collect(futures[future], None, f"Error inesperado: {e}")
+
+    # Combinar en el orden de entrada para que el resultado sea reproducible
+    per_file = {source: aggregates[source] for source in sources if source in aggregates}
+    total = None
+    for aggregate in per_file.values():
+        total = aggregate if total is None else total.merge(aggregate)
+    return BatchResult(total, per_file, errors)
+
+
+def write_report(aggregate: PartialAggregate, directory: str, formats: Sequence[str]):
+    """Escribe resumen.json y las tablas de un agregado"""
+    os.makedirs(directory, exist_ok=True)
+    write_json(os.path.join(directory, 'resumen.json'), {
+        'archivos': [os.path.abspath(source) for source in aggregate.sources],
+        'resumen': aggregate.summary()
+    })
+    write_table(directory, 'preguntas', aggregate.items_table(), formats)
+    write_table(directory, 'examenes', aggregate.group_table(aggregate.exams, 'examen'), formats)
+    write_table(directory, 'cohortes', aggregate.group_table(aggregate.cohorts, 'año_ingreso'), formats)
+
+
+def report_directories(sources: Sequence[str]) -> Dict[str, str]:
+    """Subdirectorio del reporte de cada archivo: su ruta relativa a la carpeta común, sin extensión
+
+    Así los archivos con el mismo nombre en carpetas distintas no se
+    sobrescriben; si aun así dos coinciden (p. ej. a.json y a.jsonl), se
+    agrega un sufijo numérico.
+    """
+    paths = [os.path.abspath(source) for source in sources]
+    root = os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else ''
+    directories: Dict[str, str] = {}
+    used = set()
+    for source, path in zip(sources, paths):
+        base = os.path.splitext(os.path.relpath(path, root))[0]
+        name, suffix = base, 1
+        while name in used:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        used.add(name)
+        directories[source] = name
+    return directories
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='batch.py',
+        description="Analiza varios archivos de resultados en paralelo y genera "
+                    "un reporte institucional y uno por archivo.")
+    parser.add_argument('entradas', nargs='+',
+                        help="Archivos JSON/JSON Lines o directorios que los contengan")
+    parser.add_argument('-o', '--salida', default='reportes',
+                        help="Directorio de salida (por defecto: reportes)")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Número de procesos (por defecto: núcleos disponibles)")
+    parser.add_argument('--tablas', nargs='+', choices=TABLE_FORMATS, default=list(TABLE_FORMATS),
+                        help="Formatos de las tablas (por defecto: json csv)")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="No leer ni escribir la caché binaria junto a los archivos")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    sources = find_input_files(args.entradas)
+    if not sources:
+        print("No se encontraron archivos de entrada", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    result = run_batch(sources, args.procesos, not args.sin_cache)
+    for source, error in result.errors.items():
+        print(f"[ERROR] {source}: {error}", file=sys.stderr)
+
+    if result.total is not None:
+        write_report(result.total, os.path.join(args.salida, 'institucional'), args.tablas)
+        directories = report_directories(sources)
+        for source, aggregate in result.per_file.items():
+            write_report(aggregate, os.path.join(args.salida, 'archivos', directories[source]), args.tablas)
+
+        files_table = pd.DataFrame([
+            {'archivo': source, **{k: v for k, v in aggregate.summary().items()
+                                   if k not in ('examen_tipos', 'percentiles', 'archivos')}}
+            for source, aggregate in result.per_file.items()])
+        write_table(args.salida, 'archivos', files_table, args.tablas)
+
+    print(f"{len(result.per_file)}/{len(sources)} archivos procesados "
+          f"en {time.perf_counter() - start:.2f} s")
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
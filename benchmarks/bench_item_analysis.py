@@ -0,0 +1,69 @@
+"""
+Benchmark del análisis por pregunta vectorizado
+
+Genera matrices de respuestas sintéticas de tamaño creciente y mide el
+tiempo del análisis por pregunta tal como lo calcula la aplicación
+(DataManager.get_questions_analysis): el agregado del conjunto
+(PartialAggregate.from_dataset) y su tabla por pregunta (question_table).
+El tiempo por estudiante debe mantenerse aproximadamente constante
+(escalamiento lineal con N).
+
+Uso:
+    python benchmarks/bench_item_analysis.py [N1 N2 ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import PartialAggregate  # noqa: E402
+from answer_store import AnswerStore  # noqa: E402
+from item_analysis import QUESTIONS  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000, 100_000, 500_000]
+REPEATS = 5
+
+
+def synthetic_dataset(n_students: int, seed: int = 0):
+    """Genera un almacén de respuestas con 4 versiones de examen y su DataFrame de estudiantes"""
+    rng = np.random.default_rng(seed)
+    exam_keys = rng.integers(1, 5, size=(4, len(QUESTIONS)), dtype=np.int8)
+    key_index = rng.integers(0, 4, size=n_students).astype(np.int8)
+    keys = exam_keys[key_index]
+    guesses = rng.integers(1, 5, size=keys.shape, dtype=np.int8)
+    answers = np.where(rng.random(keys.shape) < 0.6, keys, guesses).astype(np.int8)
+    store = AnswerStore(answers, exam_keys, key_index, QUESTIONS)
+    df = pd.DataFrame({
+        'examen': pd.Categorical.from_codes(key_index, ['P', 'Q', 'R', 'S']),
+        'año_ingreso': pd.Categorical.from_codes(rng.integers(0, 5, size=n_students),
+                                                 ['2019', '2020', '2021', '2022', '2023']),
+        'nota': ((answers == keys).sum(axis=1) * 20 / len(QUESTIONS)).astype(np.float64)
+    })
+    return store, df
+
+
+def best_time(func, repeats: int = REPEATS) -> float:
+    """Retorna el mejor tiempo de varias ejecuciones"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(sizes):
+    print(f"{'N':>10} {'tiempo (ms)':>12} {'µs/estudiante':>14}")
+    for n in sizes:
+        store, df = synthetic_dataset(n)
+        elapsed = best_time(lambda: PartialAggregate.from_dataset('sintetico', store, df).question_table())
+        print(f"{n:>10} {elapsed * 1e3:>12.2f} {elapsed * 1e6 / n:>14.4f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
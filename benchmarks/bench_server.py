@@ -0,0 +1,99 @@
+"""
+Benchmark del servicio local (server.py)
+
+Carga un archivo en el servicio, lo atiende en localhost y mide:
+    - la latencia de la primera consulta a cada ruta (cálculo) y de la
+      siguiente (respuesta guardada), con el tamaño JSON y el comprimido
+    - consultas por segundo con varios clientes concurrentes pidiendo las
+      mismas rutas
+    - cuántas veces se calculó cada métrica cuando varios clientes piden a
+      la vez un filtro nuevo (debe ser una)
+
+Uso:
+    python benchmarks/bench_server.py datos.json [--clientes 8] [--consultas 50]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import threading
+import time
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import AnalyticsService, start_server  # noqa: E402
+
+ROUTES = ('grupos', 'resumen', 'preguntas', 'psicometria', 'distractores', 'cohortes',
+          'comparaciones?columna=examen', 'buscar?q=quispe', 'graficas/histogram', 'graficas/boxplot')
+
+
+def fetch(url: str) -> bytes:
+    request = Request(url, headers={'Accept-Encoding': 'gzip'})
+    with urlopen(request) as response:
+        return response.read()
+
+
+def timed(url: str):
+    start = time.perf_counter()
+    body = fetch(url)
+    return time.perf_counter() - start, body
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('archivo')
+    parser.add_argument('--clientes', type=int, default=8)
+    parser.add_argument('--consultas', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    service = AnalyticsService()
+    start = time.perf_counter()
+    success, message = service.add_dataset(args.archivo, name='datos')
+    print(f"{message} ({time.perf_counter() - start:.2f} s)")
+    if not success:
+        return 1
+    server = start_server(service)
+    base = f"{server.url}/api/datos/"
+
+    print(f"\n{'ruta':<30} {'primera (ms)':>13} {'siguiente (ms)':>15} {'JSON (KB)':>10} {'gzip (KB)':>10}")
+    for route in ROUTES:
+        cold, body = timed(base + route)
+        warm, _ = timed(base + route)
+        print(f"{route:<30} {cold * 1e3:>13.1f} {warm * 1e3:>15.2f} "
+              f"{len(gzip.decompress(body)) / 1024:>10.1f} {len(body) / 1024:>10.1f}")
+
+    def client():
+        for i in range(args.consultas):
+            fetch(base + ROUTES[i % len(ROUTES)])
+
+    threads = [threading.Thread(target=client) for _ in range(args.clientes)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total = args.clientes * args.consultas
+    print(f"\n{args.clientes} clientes × {args.consultas} consultas: {total / elapsed:,.0f} consultas/s")
+
+    # Un filtro nuevo pedido a la vez por todos los clientes
+    data_manager = service.datasets['datos']
+    exam = data_manager.groups.labels('examen')[0]
+    misses = data_manager.cache.misses
+    threads = [threading.Thread(target=fetch, args=(f"{base}psicometria?examen={exam}",))
+               for _ in range(args.clientes)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"Filtro nuevo con {args.clientes} clientes a la vez: {time.perf_counter() - start:.2f} s, "
+          f"{data_manager.cache.misses - misses} métricas calculadas")
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
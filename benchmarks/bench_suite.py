@@ -0,0 +1,296 @@
+"""
+Suite de benchmarks de rendimiento
+
+Genera conjuntos sintéticos (generate_dataset.py) de varios tamaños y mide,
+para cada uno, el tiempo y el pico de memoria de:
+    - carga: JSON sin caché y desde la caché binaria
+    - resumen y percentiles, análisis por pregunta, psicometría,
+      distractores, cohortes, calibración TRI 2PL y comparaciones bootstrap
+      entre exámenes y cohortes (DataManager)
+    - índice de búsqueda y consultas de estudiantes
+    - cada gráfica de VisualizationEngine: prepare_* (datos), update_*
+      (figura) y dibujo con el backend Agg
+    - inicio de la aplicación (import main + módulos pesados)
+
+Los resultados se escriben en JSON con la versión del código y del entorno
+para comparar entre versiones; con --comparar se marcan las regresiones
+respecto de un archivo anterior. Se verifican los objetivos de
+exam_analytics_requirements.md:
+    RNF-002: cada gráfica (datos + figura + dibujo) en menos de 3 s
+    RNF-007: memoria de los datos cargados menor a 500 MB
+    RNF-008: inicio de la aplicación en menos de 5 s
+
+Uso:
+    python benchmarks/bench_suite.py                       # 1k, 10k, 100k y 1M
+    python benchmarks/bench_suite.py 1000 10000 -o resultados.json
+    python benchmarks/bench_suite.py 1000 --comparar anterior.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from data_manager import DataManager  # noqa: E402
+from generate_dataset import DatasetSpec, write_dataset  # noqa: E402
+from visualization import VisualizationEngine  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+CHART_NAMES = ('histogram', 'boxplot', 'questions', 'distractors', 'cohort')
+
+# Consultas de búsqueda por medición (prefijos de código y partes de nombre)
+SEARCH_QUERIES = ('2019', '20210001', 'QUISPE', 'maria', 'ROJAS DÍAZ', 'luer')
+
+# Objetivos de los requisitos no funcionales
+CHART_BUDGET_S = 3.0
+MEMORY_BUDGET_BYTES = 500 * 1024 ** 2
+STARTUP_BUDGET_S = 5.0
+
+# Un paso es regresión si tarda más que el anterior por encima de esta fracción
+DEFAULT_TOLERANCE = 0.2
+# ... y al menos este tiempo (s), para no marcar el ruido de los pasos muy cortos
+MIN_REGRESSION_S = 0.005
+
+
+def measure(func: Callable[[], object], repeats: int, memory: bool,
+            setup: Optional[Callable[[], None]] = None) -> Dict:
+    """Mejor tiempo de varias ejecuciones y, opcionalmente, pico de memoria
+
+    El pico se mide en una ejecución aparte con tracemalloc, que no se
+    incluye en los tiempos por su sobrecosto.
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {'segundos': best, 'pico_bytes': peak}
+
+
+def dataset_path(directory: str, spec: DatasetSpec) -> str:
+    """Archivo del conjunto sintético; se genera solo si no existe"""
+    name = f"sintetico_n{spec.students}_q{spec.questions}_v{spec.versions}_s{spec.seed}.json"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        print(f"Generando {name}...", flush=True)
+        write_dataset(path, spec)
+    return path
+
+
+def bench_dataset(path: str, repeats: int, memory: bool) -> List[Dict]:
+    """Mide todos los pasos sobre un archivo"""
+    results = []
+
+    def record(step: str, func: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+               step_repeats: int = repeats):
+        result = measure(func, step_repeats, memory, setup)
+        results.append({'paso': step, **result})
+        print(f"  {step:<28} {result['segundos'] * 1e3:>10.1f} ms"
+              + (f" {result['pico_bytes'] / 1024 ** 2:>9.1f} MB" if result['pico_bytes'] is not None else ''),
+              flush=True)
+
+    def load(use_cache: bool) -> DataManager:
+        data_manager = DataManager()
+        data_manager.use_cache = use_cache
+        success, message = data_manager.load_data(path)
+        if not success:
+            raise RuntimeError(message)
+        return data_manager
+
+    # La carga de JSON es la más lenta: una sola medición
+    record('carga_json', lambda: load(False), step_repeats=1)
+    load(True)  # escribe la caché binaria
+    record('carga_cache', lambda: load(True))
+
+    data_manager = load(True)
+    reset = data_manager.clear_computed
+    record('resumen', lambda: (data_manager.get_summary(), data_manager.get_percentiles()), reset)
+    record('preguntas', data_manager.get_questions_analysis, reset)
+    record('psicometria', data_manager.get_item_report, reset)
+    record('distractores', data_manager.get_distractor_analysis, reset)
+    record('cohortes', data_manager.get_cohort_stats, reset)
+    record('tri_2pl', data_manager.get_irt, reset, step_repeats=1)
+    record('comparaciones', lambda: [data_manager.get_comparisons(column)
+                                     for column in ('examen', 'año_ingreso')], reset)
+
+    record('indice_busqueda', data_manager.get_search_index, reset)
+    data_manager.get_search_index()
+    record('busqueda', lambda: [data_manager.search_students(query) for query in SEARCH_QUERIES])
+
+    viz_engine = VisualizationEngine(data_manager)
+    for name in CHART_NAMES:
+        prepare = getattr(viz_engine, f'prepare_{name}')
+        record(f'grafica_{name}_datos', prepare, reset)
+        data = prepare()
+
+        def build(name=name, data=data):
+            chart = viz_engine.new_chart(name)
+            viz_engine.update_chart(chart, name, data)
+            return chart
+
+        record(f'grafica_{name}_figura', build)
+        chart = build()
+        canvas = FigureCanvasAgg(chart.figure)
+        record(f'grafica_{name}_dibujo', canvas.draw)
+
+    memory_usage = data_manager.get_memory_usage()
+    results.append({'paso': 'memoria_datos', 'segundos': None, 'pico_bytes': memory_usage['total']})
+    print(f"  {'memoria_datos':<28} {'':>10}    {memory_usage['total'] / 1024 ** 2:>9.1f} MB")
+    return results
+
+
+def bench_startup(repeats: int) -> float:
+    """Tiempo de import main más la importación de los módulos pesados (proceso nuevo)"""
+    code = ("import time; start = time.perf_counter(); import main; main.import_backend(); "
+            "print(time.perf_counter() - start)")
+    best = float('inf')
+    for _ in range(repeats):
+        completed = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR,
+                                   capture_output=True, text=True, check=True)
+        best = min(best, float(completed.stdout.strip()))
+    return best
+
+
+def environment() -> Dict:
+    """Versión del código y del entorno de la medición"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def check_targets(results: List[Dict], startup: Optional[float]) -> List[str]:
+    """Objetivos no cumplidos (RNF-002, RNF-007, RNF-008)"""
+    failures = []
+    charts: Dict[tuple, float] = {}
+    for result in results:
+        if result['paso'].startswith('grafica_'):
+            name = result['paso'].rsplit('_', 1)[0]
+            key = (result['n'], name)
+            charts[key] = charts.get(key, 0.0) + result['segundos']
+        elif result['paso'] == 'memoria_datos' and result['pico_bytes'] > MEMORY_BUDGET_BYTES:
+            failures.append(f"RNF-007: n={result['n']} usa {result['pico_bytes'] / 1024 ** 2:.0f} MB")
+    for (n, name), seconds in sorted(charts.items()):
+        if seconds > CHART_BUDGET_S:
+            failures.append(f"RNF-002: n={n} {name} tarda {seconds:.2f} s")
+    if startup is not None and startup > STARTUP_BUDGET_S:
+        failures.append(f"RNF-008: inicio en {startup:.2f} s")
+    return failures
+
+
+def compare(results: List[Dict], previous_path: str, tolerance: float) -> List[str]:
+    """Pasos más lentos que en un archivo de resultados anterior"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = {(r['n'], r['paso']): r for r in json.load(f)['resultados']}
+    regressions = []
+    print(f"\nComparación con {previous_path}:")
+    for result in results:
+        before = previous.get((result['n'], result['paso']))
+        if before is None or not result['segundos'] or not before['segundos']:
+            continue
+        ratio = result['segundos'] / before['segundos']
+        slower = result['segundos'] - before['segundos'] > MIN_REGRESSION_S
+        flag = ' <- regresión' if ratio > 1 + tolerance and slower else ''
+        print(f"  n={result['n']:<9} {result['paso']:<28} {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append(f"n={result['n']} {result['paso']}: {ratio:.2f}x")
+    return regressions
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Mide el rendimiento con conjuntos sintéticos.")
+    parser.add_argument('tamanos', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help="Número de estudiantes de cada conjunto (por defecto: 1k 10k 100k 1M)")
+    parser.add_argument('--preguntas', type=int, default=20)
+    parser.add_argument('--versiones', type=int, default=4)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--repeticiones', type=int, default=3,
+                        help="Mediciones por paso; se reporta la menor (por defecto: 3)")
+    parser.add_argument('--sin-memoria', action='store_true',
+                        help="No medir el pico de memoria (tracemalloc)")
+    parser.add_argument('--datos', default=os.path.join(tempfile.gettempdir(), 'examanalytics_bench'),
+                        help="Directorio de los conjuntos generados (se reutilizan)")
+    parser.add_argument('-o', '--salida', default='benchmark_resultados.json',
+                        help="Archivo JSON de resultados")
+    parser.add_argument('--comparar', default=None,
+                        help="Resultados anteriores con los que comparar")
+    parser.add_argument('--tolerancia', type=float, default=DEFAULT_TOLERANCE,
+                        help="Aumento de tiempo tolerado al comparar (por defecto: 0.2)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    os.makedirs(args.datos, exist_ok=True)
+
+    results = []
+    for n in args.tamanos:
+        spec = DatasetSpec(students=n, questions=args.preguntas, versions=args.versiones, seed=args.semilla)
+        path = dataset_path(args.datos, spec)
+        print(f"n={n} ({os.path.getsize(path) / 1e6:.1f} MB)", flush=True)
+        for result in bench_dataset(path, args.repeticiones, not args.sin_memoria):
+            results.append({'n': n, 'preguntas': args.preguntas, **result})
+
+    startup = bench_startup(args.repeticiones)
+    print(f"inicio de la aplicación: {startup * 1e3:.0f} ms")
+
+    failures = check_targets(results, startup)
+    report = {'entorno': environment(), 'inicio_segundos': startup,
+              'resultados': results, 'objetivos_incumplidos': failures}
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Resultados en {args.salida}")
+
+    for failure in failures:
+        print(f"[OBJETIVO] {failure}", file=sys.stderr)
+    regressions = compare(results, args.comparar, args.tolerancia) if args.comparar else []
+    for regression in regressions:
+        print(f"[REGRESIÓN] {regression}", file=sys.stderr)
+    return 1 if failures or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Presupuesto de tiempo de importación de la interfaz (RNF-008)
+
+Ejecuta `python -X importtime -c "import main"` en un proceso nuevo, suma
+el tiempo acumulado de la importación de main.py y verifica que:
+    - no supere el presupuesto (por defecto 300 ms)
+    - no se importen pandas, numpy, matplotlib ni seaborn al iniciar
+      (se importan en segundo plano después de mostrar la ventana)
+
+Muestra los módulos más costosos. El código de salida es 1 si alguna
+verificación falla, de modo que puede usarse en integración continua.
+
+Uso:
+    python benchmarks/check_startup.py [--presupuesto MS] [--repeticiones N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 300
+
+# Módulos que no deben importarse antes de mostrar la ventana
+DEFERRED_MODULES = ('pandas', 'numpy', 'matplotlib', 'seaborn')
+
+
+def measure_imports(module: str = 'main') -> Dict[str, Tuple[int, int]]:
+    """Tiempos de importación (propio, acumulado) en µs por módulo"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verifica el tiempo de importación de main.py")
+    parser.add_argument('--presupuesto', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Tiempo máximo en ms (por defecto: {DEFAULT_BUDGET_MS})")
+    parser.add_argument('--repeticiones', type=int, default=5,
+                        help="Mediciones; se usa la menor (por defecto: 5)")
+    args = parser.parse_args(argv)
+
+    runs = [measure_imports() for _ in range(args.repeticiones)]
+    times = min(runs, key=lambda run: run['main'][1])
+    total_ms = times['main'][1] / 1000
+
+    print(f"{'módulo':<40} {'propio (ms)':>12} {'acumulado (ms)':>15}")
+    slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)[:15]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{name:<40} {self_us / 1000:>12.1f} {cumulative_us / 1000:>15.1f}")
+
+    failures = []
+    if total_ms > args.presupuesto:
+        failures.append(f"import main tardó {total_ms:.0f} ms (presupuesto {args.presupuesto:.0f} ms)")
+    eager = sorted({name.split('.')[0] for name in times} & set(DEFERRED_MODULES))
+    if eager:
+        failures.append(f"Se importan al iniciar: {', '.join(eager)}")
+
+    print(f"\nimport main: {total_ms:.0f} ms (presupuesto {args.presupuesto:.0f} ms)")
+    for failure in failures:
+        print(f"[ERROR] {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Generador de archivos de resultados sintéticos
+
+Produce archivos con el esquema exacto que lee DataManager (arreglo JSON o
+JSON Lines) a partir de un modelo logístico de dos parámetros con adivinación:
+
+    P(acierto) = c + (1 - c) / (1 + exp(-a (θ - b)))
+
+donde θ es la habilidad del estudiante, b la dificultad y a la
+discriminación de cada pregunta, y c la probabilidad de acertar al azar.
+Las respuestas incorrectas se reparten entre los distractores con pesos
+propios de cada pregunta (unos distractores atraen más que otros) y una
+fracción de respuestas queda en blanco.
+
+Cada versión de examen tiene su propia clave y, opcionalmente, solo un
+subconjunto de las preguntas. El resultado depende únicamente de la semilla.
+
+Uso:
+    python benchmarks/generate_dataset.py datos.json --estudiantes 10000
+    python benchmarks/generate_dataset.py datos.jsonl --estudiantes 1000000 \\
+        --preguntas 60 --versiones 4 --preguntas-version 50 --semilla 7
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+OPTIONS = ('A', 'B', 'C', 'D')
+
+# Registros generados por bloque
+CHUNK_SIZE = 10_000
+
+SURNAMES = ('QUISPE', 'FLORES', 'SÁNCHEZ', 'RODRÍGUEZ', 'GARCÍA', 'MAMANI', 'CHÁVEZ', 'RAMOS',
+            'TORRES', 'DÍAZ', 'MENDOZA', 'VARGAS', 'CASTILLO', 'ROJAS', 'HUAMÁN', 'PÉREZ',
+            'GÓMEZ', 'CRUZ', 'LUERA', 'ESPINOZA', 'GUTIÉRREZ', 'ÁLVAREZ', 'CCAMA', 'TICONA')
+GIVEN_NAMES = ('Ana', 'Luis', 'María', 'José', 'Rosa', 'Carlos', 'Lucía', 'Jorge', 'Carmen',
+               'Miguel', 'Elena', 'Diego', 'Sofía', 'Juan', 'Valeria', 'Pedro', 'Gabriela',
+               'Andrés', 'Patricia', 'Raúl', 'Milagros', 'César', 'Fiorella', 'Hugo')
+
+
+class DatasetSpec(NamedTuple):
+    """Parámetros del conjunto sintético"""
+    students: int = 1_000
+    questions: int = 20
+    versions: int = 4
+    # Preguntas por versión (None = todas); el subconjunto se elige al azar
+    questions_per_version: Optional[int] = None
+    first_cohort: int = 2015
+    last_cohort: int = 2023
+    ability_mean: float = 0.0
+    ability_sd: float = 1.0
+    difficulty_mean: float = 0.0
+    difficulty_sd: float = 1.0
+    min_discrimination: float = 0.3
+    max_discrimination: float = 2.0
+    guessing: float = 0.2
+    blank_rate: float = 0.03
+    # Nota máxima (escala vigesimal)
+    max_score: float = 20.0
+    seed: int = 0
+
+
+def version_names(count: int) -> List[str]:
+    """A, B, ..., Z, AA, AB, ..."""
+    names = []
+    for i in range(count):
+        name = ''
+        i += 1
+        while i:
+            i, rest = divmod(i - 1, 26)
+            name = chr(ord('A') + rest) + name
+        names.append(name)
+    return names
+
+
+def generate_records(spec: DatasetSpec) -> Iterator[Dict]:
+    """Genera los registros uno por uno (vectorizado por bloques)"""
+    rng = np.random.default_rng(spec.seed)
+    n_items = spec.questions
+    questions = [f"Q{i}" for i in range(1, n_items + 1)]
+    exams = version_names(spec.versions)
+
+    # Parámetros de las preguntas (compartidos por todas las versiones)
+    difficulty = rng.normal(spec.difficulty_mean, spec.difficulty_sd, size=n_items)
+    discrimination = rng.uniform(spec.min_discrimination, spec.max_discrimination, size=n_items)
+    distractor_weights = rng.dirichlet(np.ones(len(OPTIONS) - 1), size=n_items)
+
+    # Clave y preguntas de cada versión
+    keys = rng.integers(0, len(OPTIONS), size=(spec.versions, n_items))
+    per_version = min(spec.questions_per_version or n_items, n_items)
+    asked = np.zeros((spec.versions, n_items), dtype=bool)
+    for v in range(spec.versions):
+        asked[v, np.sort(rng.choice(n_items, size=per_version, replace=False))] = True
+    key_dicts = [{q: OPTIONS[keys[v, i]] for i, q in enumerate(questions) if asked[v, i]}
+                 for v in range(spec.versions)]
+
+    cohorts = np.arange(spec.first_cohort, spec.last_cohort + 1)
+    serial = 0
+    for start in range(0, spec.students, CHUNK_SIZE):
+        n = min(CHUNK_SIZE, spec.students - start)
+        version = rng.integers(0, spec.versions, size=n)
+        ability = rng.normal(spec.ability_mean, spec.ability_sd, size=(n, 1))
+        logistic = 1 / (1 + np.exp(-discrimination * (ability - difficulty)))
+        correct = rng.random((n, n_items)) < spec.guessing + (1 - spec.guessing) * logistic
+
+        # Distractor elegido: posición 0-2 entre las opciones distintas de la clave
+        cumulative = np.cumsum(distractor_weights, axis=1)
+        offset = (rng.random((n, n_items, 1)) > cumulative[None, :, :-1]).sum(axis=2) + 1
+        student_keys = keys[version]
+        chosen = np.where(correct, student_keys, (student_keys + offset) % len(OPTIONS))
+        blank = rng.random((n, n_items)) < spec.blank_rate
+        student_asked = asked[version]
+
+        cohort = cohorts[rng.integers(0, len(cohorts), size=n)]
+        surnames = rng.integers(0, len(SURNAMES), size=(n, 2))
+        given = rng.integers(0, len(GIVEN_NAMES), size=n)
+
+        for row in range(n):
+            answers = {}
+            n_correct = n_wrong = 0
+            for i in np.flatnonzero(student_asked[row]):
+                if blank[row, i]:
+                    answers[questions[i]] = ''
+                    continue
+                answers[questions[i]] = OPTIONS[chosen[row, i]]
+                if correct[row, i]:
+                    n_correct += 1
+                else:
+                    n_wrong += 1
+            serial += 1
+            yield {
+                'codigo': f"{cohort[row]}{serial:06d}",
+                'apellidos_nombres': (f"{SURNAMES[surnames[row, 0]]} {SURNAMES[surnames[row, 1]]}, "
+                                      f"{GIVEN_NAMES[given[row]]}"),
+                'examen': exams[version[row]],
+                'correctas': n_correct,
+                'incorrectas': n_wrong,
+                'nota': round(n_correct * spec.max_score / per_version, 2),
+                'respuestas_estudiante': answers,
+                'respuestas_correctas': key_dicts[version[row]]
+            }
+
+
+def write_dataset(path: str, spec: DatasetSpec, json_lines: Optional[bool] = None) -> int:
+    """Escribe el conjunto en un archivo; retorna el número de registros
+
+    Si no se indica el formato, se usa JSON Lines para la extensión .jsonl.
+    """
+    if json_lines is None:
+        json_lines = path.lower().endswith('.jsonl')
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        if not json_lines:
+            f.write('[')
+        for record in generate_records(spec):
+            text = json.dumps(record, ensure_ascii=False)
+            if json_lines:
+                f.write(text + '\n')
+            else:
+                f.write((',\n' if count else '\n') + text)
+            count += 1
+        if not json_lines:
+            f.write('\n]\n')
+    return count
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(description="Genera un archivo de resultados sintético.")
+    parser.add_argument('salida', help="Archivo a crear (.json o .jsonl)")
+    parser.add_argument('--estudiantes', type=int, default=defaults.students)
+    parser.add_argument('--preguntas', type=int, default=defaults.questions)
+    parser.add_argument('--versiones', type=int, default=defaults.versions)
+    parser.add_argument('--preguntas-version', type=int, default=None,
+                        help="Preguntas de cada versión (por defecto: todas)")
+    parser.add_argument('--cohortes', type=int, nargs=2, metavar=('DESDE', 'HASTA'),
+                        default=[defaults.first_cohort, defaults.last_cohort])
+    parser.add_argument('--habilidad', type=float, nargs=2, metavar=('MEDIA', 'DE'),
+                        default=[defaults.ability_mean, defaults.ability_sd])
+    parser.add_argument('--dificultad', type=float, nargs=2, metavar=('MEDIA', 'DE'),
+                        default=[defaults.difficulty_mean, defaults.difficulty_sd])
+    parser.add_argument('--discriminacion', type=float, nargs=2, metavar=('MIN', 'MAX'),
+                        default=[defaults.min_discrimination, defaults.max_discrimination])
+    parser.add_argument('--azar', type=float, default=defaults.guessing,
+                        help="Probabilidad de acertar al azar")
+    parser.add_argument('--blancos', type=float, default=defaults.blank_rate,
+                        help="Fracción de respuestas en blanco")
+    parser.add_argument('--semilla', type=int, default=defaults.seed)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    spec = DatasetSpec(
+        students=args.estudiantes, questions=args.preguntas, versions=args.versiones,
+        questions_per_version=args.preguntas_version,
+        first_cohort=args.cohortes[0], last_cohort=args.cohortes[1],
+        ability_mean=args.habilidad[0], ability_sd=args.habilidad[1],
+        difficulty_mean=args.dificultad[0], difficulty_sd=args.dificultad[1],
+        min_discrimination=args.discriminacion[0], max_discrimination=args.discriminacion[1],
+        guessing=args.azar, blank_rate=args.blancos, seed=args.semilla)
+    count = write_dataset(args.salida, spec)
+    print(f"{count} registros escritos en {args.salida} ({os.path.getsize(args.salida) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Canvas Tk de las gráficas persistentes
+
+Este módulo importa el backend TkAgg de matplotlib, que es costoso de
+cargar; main.py lo importa en segundo plano después de mostrar la ventana.
+"""
+
+from tkinter import BOTH
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from profiling import profiler
+from visualization import Chart, VisualizationEngine
+
+
+class TracedCanvas(FigureCanvasTkAgg):
+    """Canvas que registra en el perfil la duración de cada dibujo completo"""
+
+    trace_name = 'dibujo'
+
+    def draw(self):
+        with profiler.span(self.trace_name, 'dibujo'):
+            super().draw()
+
+
+class ChartView:
+    """Canvas Tk de una gráfica persistente
+
+    El canvas se crea una sola vez. Cuando solo cambian los artistas
+    dinámicos se restaura el fondo guardado y se redibujan únicamente esos
+    artistas (blitting); en otro caso se programa un redibujo completo.
+    """
+
+    def __init__(self, parent_frame, chart: Chart, name: str = ''):
+        self.chart = chart
+        self.canvas = TracedCanvas(chart.figure, parent_frame)
+        self.canvas.trace_name = f'dibujo:{name}' if name else 'dibujo'
+        self.name = name
+        self.canvas.get_tk_widget().pack(fill=BOTH, expand=True)
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        """Guarda el fondo sin artistas dinámicos y luego los dibuja encima"""
+        if event.canvas is not self.canvas:
+            return
+        self._background = self.canvas.copy_from_bbox(self.chart.figure.bbox)
+        self.chart.draw_dynamic()
+
+    def refresh(self, mode: str):
+        """Redibuja según el modo retornado por VisualizationEngine.update_*"""
+        if mode == VisualizationEngine.REDRAW_LAYOUT:
+            self.chart.figure.tight_layout()
+        if mode != VisualizationEngine.REDRAW_BLIT or self._background is None:
+            self.canvas.draw_idle()
+            return
+
+        with profiler.span(f'blit:{self.name}', 'dibujo'):
+            self.canvas.restore_region(self._background)
+            self.chart.draw_dynamic()
+            self.canvas.blit(self.chart.figure.bbox)
@@ -0,0 +1,251 @@
+"""
+ExamAnalytics - modo de línea de comandos
+
+Genera los reportes sin interfaz gráfica (no importa Tk), por ejemplo desde
+cron en un servidor después de cada lote de lectura:
+
+    python cli.py resultados/*.json -o reportes/
+    python cli.py resultados/ -o reportes/ --tablas csv --graficas png pdf
+    python cli.py resultados.json --perfil traza.json
+    python cli.py resultados.json --examen A B --cohorte 2021
+    python cli.py resultados.json --similitud
+    python cli.py resultados.json --tri 2PL
+    python cli.py resultados.json --reporte
+
+Por cada archivo de entrada se crea un directorio <salida>/<nombre>/ con:
+    - resumen.json: resumen, percentiles, preguntas por examen, errores de
+      carga y resumen de la validación
+    - preguntas, psicometria, distractores, cohortes y validacion (todas las
+      observaciones) en JSON y/o CSV
+    - intervalos (bootstrap de media, mediana y cuartiles por examen y
+      cohorte) y pruebas (permutación entre pares de grupos)
+    - con --similitud, los pares de estudiantes con respuestas incorrectas
+      idénticas inusuales (similitud)
+    - con --tri, los parámetros de las preguntas (tri), la habilidad de cada
+      estudiante (habilidades) y las curvas características (icc)
+    - las gráficas del análisis en PNG y/o PDF (backend Agg)
+    - con --reporte, el reporte PDF completo (reporte.pdf, ver report.py)
+
+El código de salida es 0 si todos los archivos se procesaron y 1 si alguno
+falló.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+import matplotlib
+import pandas as pd
+
+matplotlib.use('Agg')
+
+from batch import report_directories  # noqa: E402
+from data_manager import DataManager  # noqa: E402
+from export import TABLE_FORMATS, find_input_files, write_json, write_table  # noqa: E402
+from group_index import DataFilter  # noqa: E402
+from irt import MODELS  # noqa: E402
+from profiling import profiler  # noqa: E402
+from report import generate_reports, report_sections  # noqa: E402
+from visualization import VisualizationEngine  # noqa: E402
+
+CHART_FORMATS = ('png', 'pdf')
+
+# Gráficas que se exportan, en orden
+CHART_NAMES = ('histogram', 'boxplot', 'questions', 'distractors', 'cohort')
+
+CHART_DPI = 150
+
+# Columnas cuyos grupos se comparan (intervalos y pruebas)
+COMPARISON_COLUMNS = ('examen', 'año_ingreso')
+
+
+def build_summary(data_manager: DataManager, source: str) -> Dict:
+    """Resumen del archivo para resumen.json"""
+    summary = dict(data_manager.get_summary())
+    summary['examen_tipos'] = [str(exam) for exam in summary['examen_tipos']]
+    report = data_manager.get_item_report()
+    return {
+        'archivo': os.path.abspath(source),
+        'filtro': data_manager.filter.describe(),
+        'resumen': summary,
+        'percentiles': {f"P{int(q * 100)}": value
+                        for q, value in data_manager.get_percentiles((0.25, 0.50, 0.75, 0.90, 0.95)).items()},
+        'confiabilidad_kr20': report.reliability,
+        'errores_carga': data_manager.load_errors,
+        'validacion': data_manager.validation.summary().to_dict(orient='records')
+    }
+
+
+def comparison_table(data_manager: DataManager, field: str) -> pd.DataFrame:
+    """Intervalos o pruebas de las comparaciones por examen y por cohorte, en una tabla"""
+    tables = [getattr(data_manager.get_comparisons(column), field).assign(variable=column)
+              for column in COMPARISON_COLUMNS]
+    table = pd.concat(tables, ignore_index=True)
+    return table[['variable'] + [column for column in table.columns if column != 'variable']]
+
+
+def export_tables(data_manager: DataManager, directory: str, formats: Sequence[str],
+                  similarity: bool = False, irt_model: Optional[str] = None) -> List[str]:
+    """Exporta las tablas de análisis"""
+    distractors = data_manager.get_distractor_analysis()
+    tables = {
+        'preguntas': data_manager.get_questions_analysis(),
+        'psicometria': data_manager.get_item_report().items,
+        'distractores': distractors.options,
+        'cohortes': data_manager.get_cohort_stats(),
+        'validacion': data_manager.validation.issues(data_manager.df),
+        'intervalos': comparison_table(data_manager, 'intervals'),
+        'pruebas': comparison_table(data_manager, 'tests')
+    }
+    if similarity:
+        tables['similitud'] = data_manager.get_similarity().pairs
+    if irt_model:
+        calibration = data_manager.get_irt(irt_model)
+        rows = data_manager.filtered_rows()
+        codes = data_manager.df['codigo'] if rows is None else data_manager.df['codigo'].iloc[rows]
+        tables['tri'] = calibration.item_table()
+        tables['habilidades'] = pd.DataFrame({'codigo': codes.to_numpy(), 'habilidad': calibration.abilities,
+                                              'error_estandar': calibration.ability_se})
+    paths = []
+    for name, table in tables.items():
+        paths.extend(write_table(directory, name, table, formats))
+    return paths
+
+
+def export_charts(viz_engine: VisualizationEngine, directory: str, formats: Sequence[str],
+                  irt_model: Optional[str] = None) -> List[str]:
+    """Dibuja y guarda las gráficas con el backend Agg"""
+    paths = []
+    names = CHART_NAMES
+    if irt_model:
+        viz_engine.ICC_MODEL = irt_model
+        names += ('icc',)
+    for name in names:
+        chart = viz_engine.new_chart(name)
+        viz_engine.update_chart(chart, name, getattr(viz_engine, f'prepare_{name}')())
+        chart.figure.tight_layout()
+        for fmt in formats:
+            path = os.path.join(directory, f"{name}.{fmt}")
+            chart.figure.savefig(path, dpi=CHART_DPI, bbox_inches='tight')
+            paths.append(path)
+    return paths
+
+
+def process_file(source: str, output_dir: str, table_formats: Sequence[str],
+                 chart_formats: Sequence[str], use_cache: bool = True,
+                 data_filter: DataFilter = DataFilter(), similarity: bool = False,
+                 irt_model: Optional[str] = None, report: bool = False,
+                 name: Optional[str] = None) -> Optional[str]:
+    """Genera el reporte de un archivo en output_dir/name; retorna un mensaje de error o None
+
+    Si no se indica name se usa el nombre del archivo sin extensión.
+    """
+    data_manager = DataManager()
+    data_manager.use_cache = use_cache
+    success, message = data_manager.load_data(source)
+    if not success:
+        return message
+    data_manager.set_filter(data_filter)
+    if not data_manager.filtered_count():
+        return f"Ningún estudiante cumple el filtro ({data_filter.describe()})"
+
+    if name is None:
+        name = os.path.splitext(os.path.basename(source))[0]
+    directory = os.path.join(output_dir, name)
+    os.makedirs(directory, exist_ok=True)
+
+    write_json(os.path.join(directory, 'resumen.json'), build_summary(data_manager, source))
+    if table_formats:
+        export_tables(data_manager, directory, table_formats, similarity, irt_model)
+    if chart_formats:
+        export_charts(VisualizationEngine(data_manager), directory, chart_formats, irt_model)
+    if report:
+        generate_reports(data_manager, report_sections(data_manager, os.path.join(directory, 'reporte.pdf')),
+                         source, irt_model=irt_model or VisualizationEngine.ICC_MODEL)
+    return None
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description="Genera reportes de análisis de exámenes sin interfaz gráfica.")
+    parser.add_argument('entradas', nargs='+',
+                        help="Archivos JSON/JSON Lines o directorios que los contengan")
+    parser.add_argument('-o', '--salida', default='reportes',
+                        help="Directorio de salida (por defecto: reportes)")
+    parser.add_argument('--tablas', nargs='*', choices=TABLE_FORMATS, default=list(TABLE_FORMATS),
+                        help="Formatos de las tablas (por defecto: json csv; vacío para omitirlas)")
+    parser.add_argument('--graficas', nargs='*', choices=CHART_FORMATS, default=['png'],
+                        help="Formatos de las gráficas (por defecto: png; vacío para omitirlas)")
+    parser.add_argument('--examen', nargs='+', metavar='TIPO',
+                        help="Analiza solo estos tipos de examen")
+    parser.add_argument('--cohorte', nargs='+', metavar='AÑO',
+                        help="Analiza solo estos años de ingreso")
+    parser.add_argument('--similitud', action='store_true',
+                        help="Busca pares de estudiantes con respuestas incorrectas idénticas inusuales "
+                             "(tabla similitud)")
+    parser.add_argument('--tri', choices=MODELS, metavar='MODELO',
+                        help="Calibra un modelo de Teoría de Respuesta al Ítem (1PL o 2PL) y exporta "
+                             "sus parámetros, las habilidades y las curvas características")
+    parser.add_argument('--reporte', action='store_true',
+                        help="Genera además el reporte PDF completo (reporte.pdf)")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="No leer ni escribir la caché binaria junto a los archivos")
+    parser.add_argument('--perfil', metavar='TRAZA',
+                        help="Registra el perfil de ejecución (tiempos y memoria) y lo guarda "
+                             "como traza de Chrome en TRAZA (JSON)")
+    return parser.parse_args(argv)
+
+
+def print_profile(limit: int = 15):
+    """Muestra los pasos con mayor tiempo total"""
+    print(f"\n{'paso':<36} {'llamadas':>9} {'total (ms)':>11} {'máximo (ms)':>12}")
+    for stats in profiler.summary()[:limit]:
+        print(f"{stats.name:<36} {stats.count:>9} {stats.total * 1e3:>11.1f} {stats.maximum * 1e3:>12.1f}")
+    peak = profiler.peak_memory()
+    if peak is not None:
+        print(f"Pico de memoria: {peak / 1024 ** 2:.1f} MB")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.perfil:
+        profiler.enable(memory=True)
+    files = find_input_files(args.entradas)
+    if not files:
+        print("No se encontraron archivos de entrada", file=sys.stderr)
+        return 1
+
+    data_filter = DataFilter(tuple(args.examen) if args.examen else None,
+                             tuple(args.cohorte) if args.cohorte else None)
+    directories = report_directories(files)
+    failures = 0
+    for source in files:
+        start = time.perf_counter()
+        try:
+            error = process_file(source, args.salida, args.tablas, args.graficas, not args.sin_cache,
+                                 data_filter, args.similitud, args.tri, args.reporte,
+                                 directories[source])
+        except Exception as e:
+            error = f"Error inesperado: {e}"
+
+        elapsed = time.perf_counter() - start
+        if error:
+            failures += 1
+            print(f"[ERROR] {source}: {error}", file=sys.stderr)
+        else:
+            print(f"[OK] {source} ({elapsed:.2f} s)")
+
+    print(f"{len(files) - failures}/{len(files)} archivos procesados")
+    if args.perfil:
+        profiler.disable()
+        profiler.export_chrome_trace(args.perfil)
+        print_profile()
+        print(f"Traza guardada en {args.perfil}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Cliente del servicio local de análisis (server.py)
+
+RemoteDataManager ofrece, sobre HTTP, la parte de la interfaz de
+DataManager que usa la aplicación de escritorio (resumen, indicadores,
+distractores, comparaciones, similitud, búsqueda y filtros), y
+RemoteVisualizationEngine obtiene del servicio los datos de cada gráfica y
+los dibuja con los mismos métodos update_* de VisualizationEngine. Así
+ExamAnalyticsApp funciona como cliente liviano: no carga el archivo ni
+calcula nada, solo dibuja.
+
+    python main.py --servidor http://127.0.0.1:8765 --conjunto resultados
+"""
+
+import copy
+import gzip
+import json
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+import numpy as np
+import pandas as pd
+
+from analytics_cache import AnalyticsCache
+from comparisons import ComparisonReport
+from distractors import DistractorReport
+from group_index import DataFilter
+from psychometrics import ItemReport
+from search_index import DEFAULT_PAGE_SIZE, SearchResult
+from server import API_PREFIX, decode_value
+from similarity import DEFAULT_ALPHA, SimilarityReport
+from visualization import VisualizationEngine
+
+# Espera máxima de una consulta (s)
+DEFAULT_TIMEOUT = 120
+
+# Presupuesto de la caché local de respuestas (bytes)
+CLIENT_CACHE_BYTES = 16 * 1024 * 1024
+
+
+class ServiceError(Exception):
+    """El servicio no respondió o respondió con un error"""
+
+
+class AnalyticsClient:
+    """Consultas JSON (con gzip) a un servicio local"""
+
+    def __init__(self, base_url: str, timeout: float = DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def get(self, path: str, params: Sequence[Tuple[str, str]] = ()) -> Dict:
+        """GET de una ruta bajo /api; retorna el JSON decodificado (tablas y arreglos incluidos)"""
+        url = f"{self.base_url}{API_PREFIX}/{path}"
+        if params:
+            url += '?' + urlencode(params)
+        request = Request(url, headers={'Accept-Encoding': 'gzip', 'Accept': 'application/json'})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                encoding = response.headers.get('Content-Encoding')
+        except HTTPError as e:
+            body = e.read()
+            if e.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            try:
+                message = json.loads(body.decode('utf-8'))['error']
+            except (ValueError, KeyError):
+                message = f"HTTP {e.code}"
+            raise ServiceError(message) from None
+        except (URLError, OSError) as e:
+            raise ServiceError(f"No se pudo conectar con {self.base_url}: {e}") from None
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        return decode_value(json.loads(body.decode('utf-8')))
+
+    def datasets(self) -> List[Dict]:
+        """Conjuntos cargados en el servicio"""
+        return self.get('conjuntos')['conjuntos']
+
+
+class _RemoteGroups:
+    """Grupos de las columnas categóricas (la parte de GroupIndex que usa la interfaz)"""
+
+    def __init__(self, labels: Dict[str, List[str]]):
+        self._labels = labels
+
+    def labels(self, column: str) -> List[str]:
+        return list(self._labels.get(column, []))
+
+
+class RemoteDataManager:
+    """Consultas de solo lectura a un conjunto del servicio con la interfaz de DataManager
+
+    Las respuestas se guardan por estado (versión y filtro) igual que en
+    DataManager.cached, por lo que volver a un filtro no repite la consulta.
+    """
+
+    def __init__(self, client: AnalyticsClient, dataset: Optional[str] = None):
+        self.client = client
+        self.dataset = dataset
+        self.is_loaded = False
+        self.filter = DataFilter()
+        self.version = 0
+        self.groups: Optional[_RemoteGroups] = None
+        # No disponibles en el cliente (requieren los datos completos)
+        self.df = None
+        self.validation = None
+        self.cache = AnalyticsCache(CLIENT_CACHE_BYTES)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def connect(self) -> str:
+        """Elige el conjunto (el único, si no se indicó) y lee sus grupos; retorna un mensaje"""
+        datasets = {entry['nombre']: entry for entry in self.client.datasets()}
+        if self.dataset is None:
+            if len(datasets) != 1:
+                raise ServiceError(f"Indique el conjunto: {', '.join(datasets) or 'ninguno cargado'}")
+            self.dataset = next(iter(datasets))
+        if self.dataset not in datasets:
+            raise ServiceError(f"El servicio no tiene el conjunto {self.dataset}")
+        groups = self._get('grupos', filtered=False)
+        with self._lock:
+            self.groups = _RemoteGroups({column: groups[column] for column in ('examen', 'año_ingreso')})
+            self._total = groups['estudiantes']
+            self.version = groups['version']
+            self.filter = DataFilter()
+            self.is_loaded = True
+        return (f"Conectado a {self.client.base_url}: {self.dataset} "
+                f"({self._total:,} registros)")
+
+    def _params(self, extra: Sequence[Tuple[str, str]] = ()) -> List[Tuple[str, str]]:
+        params = [('examen', label) for label in self.filter.exams or ()]
+        params += [('cohorte', label) for label in self.filter.cohorts or ()]
+        return params + list(extra)
+
+    def _get(self, route: str, extra: Sequence[Tuple[str, str]] = (), filtered: bool = True) -> Dict:
+        params = self._params(extra) if filtered else list(extra)
+        return self.client.get(f"{quote(self.dataset, safe='')}/{route}", params)
+
+    def cached(self, route: str, extra: Sequence[Tuple[str, str]] = ()) -> Dict:
+        """Respuesta de una ruta con el filtro activo (una consulta por estado)
+
+        La consulta usa los parámetros de la misma vista que da la clave,
+        aunque otro hilo cambie el filtro mientras se espera la respuesta.
+        """
+        view = self.with_filter(self.filter)
+        return self.cache.get_or_compute((view.state_key(), route, tuple(extra)),
+                                         lambda: view._get(route, extra))
+
+    def state_key(self) -> Tuple:
+        return (self.version, self.filter)
+
+    def set_filter(self, data_filter: DataFilter):
+        self.filter = data_filter
+
+    def with_filter(self, data_filter: DataFilter) -> 'RemoteDataManager':
+        """Vista con otro filtro que comparte el cliente y la caché (como DataManager.with_filter)"""
+        view = copy.copy(self)
+        view.filter = data_filter
+        return view
+
+    def total_count(self) -> int:
+        return self._total if self.is_loaded else 0
+
+    def filtered_count(self) -> int:
+        if not self.is_loaded:
+            return 0
+        if self.filter.is_empty:
+            return self._total
+        return self.cached('grupos')['filtrados']
+
+    def get_summary(self) -> Dict:
+        if not self.is_loaded:
+            return {}
+        return self.cached('resumen')['resumen']
+
+    def get_percentiles(self) -> Dict[float, float]:
+        if not self.is_loaded:
+            return {}
+        return {float(q): value for q, value in self.cached('resumen')['percentiles'].items()}
+
+    def get_questions_analysis(self) -> pd.DataFrame:
+        if not self.is_loaded:
+            return pd.DataFrame()
+        return self.cached('preguntas')['preguntas']
+
+    def get_item_report(self) -> Optional[ItemReport]:
+        if not self.is_loaded:
+            return None
+        data = self.cached('psicometria')
+        return ItemReport(data['preguntas'], data['confiabilidad_kr20'], data['estudiantes'])
+
+    def get_distractor_analysis(self) -> Optional[DistractorReport]:
+        if not self.is_loaded:
+            return None
+        data = self.cached('distractores')
+        return DistractorReport(data['proporciones'], data['opciones'], data['claves'])
+
+    def get_cohort_stats(self) -> pd.DataFrame:
+        if not self.is_loaded:
+            return pd.DataFrame()
+        return self.cached('cohortes')['cohortes']
+
+    def get_comparisons(self, column: str) -> Optional[ComparisonReport]:
+        if not self.is_loaded:
+            return None
+        data = self.cached('comparaciones', (('columna', column),))
+        return ComparisonReport(data['columna'], data['intervalos'], data['pruebas'], data['remuestras'],
+                                data['confianza'], data['semilla'])
+
+    def get_similarity(self, alpha: float = DEFAULT_ALPHA) -> Optional[SimilarityReport]:
+        if not self.is_loaded:
+            return None
+        data = self.cached('similitud', (('alfa', repr(alpha)),))
+        return SimilarityReport(data['pares'], data['pares_comparados'], data['pares_marcados'], data['alfa'])
+
+    def get_chart_data(self, name: str, model: str) -> Optional[Dict]:
+        if not self.is_loaded:
+            return None
+        extra = (('modelo', model),) if name == 'icc' else ()
+        return self.cached(f'graficas/{name}', extra)['datos']
+
+    def has_search_index(self) -> bool:
+        """El índice de búsqueda vive en el servicio"""
+        return self.is_loaded
+
+    def get_search_index(self):
+        return None
+
+    def search_students(self, query: str, offset: int = 0,
+                        limit: int = DEFAULT_PAGE_SIZE) -> Tuple[pd.DataFrame, Optional[SearchResult]]:
+        """Busca en el servicio (las búsquedas no se guardan en la caché local)"""
+        if not self.is_loaded:
+            return pd.DataFrame(), None
+        data = self._get('buscar', (('q', query), ('desde', str(offset)), ('limite', str(limit))), filtered=False)
+        students = data['estudiantes']
+        return students, SearchResult(np.arange(len(students)), data['total'], data['desde'], data['limite'])
+
+
+class RemoteVisualizationEngine(VisualizationEngine):
+    """VisualizationEngine cuyos datos de gráficas se calculan en el servicio"""
+
+    def _fetch(self, name: str) -> Optional[Dict]:
+        return self.data_manager.get_chart_data(name, self.ICC_MODEL)
+
+    def prepare_histogram(self) -> Optional[Dict]:
+        return self._fetch('histogram')
+
+    def prepare_boxplot(self) -> Optional[Dict]:
+        return self._fetch('boxplot')
+
+    def prepare_questions(self) -> Optional[Dict]:
+        return self._fetch('questions')
+
+    def prepare_distractors(self) -> Optional[Dict]:
+        return self._fetch('distractors')
+
+    def prepare_cohort(self) -> Optional[Dict]:
+        return self._fetch('cohort')
+
+    def prepare_icc(self) -> Optional[Dict]:
+        return self._fetch('icc')
+
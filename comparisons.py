@@ -0,0 +1,275 @@
+"""
+Comparación de notas entre grupos (RF-012, RF-015)
+
+Para cada grupo (tipo de examen o año de ingreso) se estiman intervalos de
+confianza bootstrap (método de percentiles) de la media, la mediana y los
+cuartiles; para cada par de grupos, una prueba de permutación de la
+diferencia de medias, el tamaño del efecto (d de Cohen) y el p-valor
+ajustado por comparaciones múltiples (Holm).
+
+Las notas toman pocos valores distintos, por lo que cada remuestreo se
+representa por las frecuencias de esos valores en lugar de por una fila de
+índices:
+    - bootstrap: las frecuencias de un remuestreo con reemplazo siguen una
+      distribución multinomial con las proporciones observadas
+    - permutación: las frecuencias del primer grupo en una permutación de
+      los dos grupos juntos siguen una distribución hipergeométrica
+      multivariada
+Cada lote es una matriz remuestreo × valor; medias y cuantiles salen de
+productos y sumas acumuladas por fila, con el mismo resultado que
+remuestrear los estudiantes. Si hay demasiados valores distintos (notas
+continuas) los lotes son matrices de índices remuestreo × estudiante.
+
+Los lotes tienen un tamaño fijo y cada uno recibe su propia semilla
+derivada de la semilla del análisis (SeedSequence.spawn), por lo que el
+resultado es reproducible y no depende del número de procesos entre los
+que se reparten (ProcessPoolExecutor).
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Remuestreos bootstrap y permutaciones por grupo o par de grupos
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_SEED = 20240601
+
+# Nivel de significación de las pruebas (sobre el p-valor ajustado)
+SIGNIFICANCE = 0.05
+
+# Cuantiles estimados además de la media (0.5 = mediana)
+QUANTILES = (0.25, 0.5, 0.75)
+
+# Máximo de valores distintos para remuestrear con frecuencias
+MAX_DISTINCT_VALUES = 1024
+
+# Elementos por lote (remuestreos × valores o estudiantes)
+BATCH_ELEMENTS = 1 << 22
+
+# Trabajo mínimo (elementos) para repartir los lotes entre procesos
+MIN_PARALLEL_ELEMENTS = 1 << 25
+
+# Magnitud del efecto según |d| (Cohen)
+EFFECT_SIZES = ((0.2, 'despreciable'), (0.5, 'pequeño'), (0.8, 'mediano'), (np.inf, 'grande'))
+
+
+class ComparisonReport(NamedTuple):
+    """Intervalos por grupo y pruebas entre pares de grupos"""
+    column: str
+    intervals: pd.DataFrame     # grupo, estudiantes, estadistico, valor, inferior, superior
+    tests: pd.DataFrame         # una fila por par de grupos
+    resamples: int
+    confidence: float
+    seed: int
+
+    def interval(self, statistic: str) -> pd.DataFrame:
+        """Intervalos de un estadístico ('media', 'mediana', 'P25', ...) indexados por grupo"""
+        rows = self.intervals[self.intervals['estadistico'] == statistic]
+        return rows.set_index('grupo')
+
+
+def statistic_names(quantiles: Sequence[float] = QUANTILES) -> List[str]:
+    return ['media'] + ['mediana' if q == 0.5 else f"P{q * 100:g}" for q in quantiles]
+
+
+class _Sample(NamedTuple):
+    """Notas de un grupo: valores distintos y frecuencias, o las notas (values, None)"""
+    values: np.ndarray
+    counts: Optional[np.ndarray]
+
+    @property
+    def size(self) -> int:
+        return int(self.counts.sum()) if self.counts is not None else len(self.values)
+
+    @property
+    def width(self) -> int:
+        """Columnas de un remuestreo (valores distintos o estudiantes)"""
+        return len(self.values) if self.counts is not None else self.size
+
+
+def _sample(scores: np.ndarray, values: Optional[np.ndarray] = None) -> _Sample:
+    """Frecuencias de las notas sobre values (o sus propios valores distintos)"""
+    if values is None:
+        values = np.unique(scores)
+    if len(values) > MAX_DISTINCT_VALUES:
+        return _Sample(np.asarray(scores, dtype=np.float64), None)
+    counts = np.bincount(np.searchsorted(values, scores), minlength=len(values))
+    return _Sample(values, counts)
+
+
+def _count_quantiles(values: np.ndarray, counts: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """Cuantiles (interpolación lineal) de cada fila de una matriz de frecuencias"""
+    n = int(counts[0].sum())
+    cumulative = np.cumsum(counts, axis=1)
+    result = np.empty((len(counts), len(quantiles)))
+    for k, q in enumerate(quantiles):
+        position = q * (n - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, n - 1)
+        # Índice del primer valor cuya frecuencia acumulada supera la posición
+        low_value = values[(cumulative <= lower).sum(axis=1)]
+        high_value = values[(cumulative <= upper).sum(axis=1)]
+        result[:, k] = low_value + (high_value - low_value) * (position - lower)
+    return result
+
+
+def _bootstrap_batch(sample: _Sample, size: int, quantiles: Sequence[float],
+                     seed: np.random.SeedSequence) -> np.ndarray:
+    """Media y cuantiles de size remuestreos (matriz remuestreo × estadístico)"""
+    rng = np.random.default_rng(seed)
+    n = sample.size
+    if sample.counts is not None:
+        counts = rng.multinomial(n, sample.counts / n, size=size)
+        means = counts @ sample.values / n
+        return np.column_stack([means, _count_quantiles(sample.values, counts, quantiles)])
+    resampled = sample.values[rng.integers(0, n, size=(size, n))]
+    return np.column_stack([resampled.mean(axis=1), np.quantile(resampled, quantiles, axis=1).T])
+
+
+def _permutation_batch(first: _Sample, second: _Sample, size: int,
+                       seed: np.random.SeedSequence) -> np.ndarray:
+    """Diferencias de medias (primero - segundo) en size permutaciones de ambos grupos"""
+    rng = np.random.default_rng(seed)
+    n_first, n_second = first.size, second.size
+    if first.counts is not None and second.counts is not None:
+        pooled = first.counts + second.counts
+        counts = rng.multivariate_hypergeometric(pooled, n_first, size=size)
+        first_sums = counts @ first.values
+        total = pooled @ first.values
+    else:
+        pooled = np.concatenate([_expand(first), _expand(second)])
+        permuted = rng.permuted(np.broadcast_to(pooled, (size, len(pooled))), axis=1)
+        first_sums = permuted[:, :n_first].sum(axis=1)
+        total = pooled.sum()
+    return first_sums / n_first - (total - first_sums) / n_second
+
+
+def _expand(sample: _Sample) -> np.ndarray:
+    """Notas individuales de un grupo"""
+    return sample.values if sample.counts is None else np.repeat(sample.values, sample.counts)
+
+
+def _batch_sizes(total: int, width: int) -> List[int]:
+    """Remuestreos por lote, con a lo sumo BATCH_ELEMENTS elementos cada uno"""
+    size = max(1, min(total, BATCH_ELEMENTS // max(width, 1)))
+    sizes = [size] * (total // size)
+    if total % size:
+        sizes.append(total % size)
+    return sizes
+
+
+class _Task(NamedTuple):
+    """Lote de remuestreos: función, argumentos y elementos de su matriz"""
+    function: Callable
+    args: Tuple
+    elements: int
+
+
+def _run(tasks: List[_Task], max_workers: Optional[int]) -> List[np.ndarray]:
+    """Ejecuta los lotes en orden, repartidos entre procesos si el trabajo lo justifica
+
+    Los procesos se crean con 'spawn' para poder usarse desde la interfaz,
+    que tiene hilos en ejecución.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2 or sum(task.elements for task in tasks) < MIN_PARALLEL_ELEMENTS:
+        return [task.function(*task.args) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [executor.submit(task.function, *task.args) for task in tasks]
+        return [future.result() for future in futures]
+
+
+def holm_adjust(p_values: np.ndarray) -> np.ndarray:
+    """P-valores ajustados por el método de Holm-Bonferroni"""
+    m = len(p_values)
+    order = np.argsort(p_values, kind='stable')
+    adjusted = np.maximum.accumulate(np.minimum(1, (m - np.arange(m)) * p_values[order]))
+    result = np.empty(m)
+    result[order] = adjusted
+    return result
+
+
+def effect_size_label(d: float) -> str:
+    if np.isnan(d):
+        return ''
+    return next(label for limit, label in EFFECT_SIZES if abs(d) < limit)
+
+
+def cohens_d(first: np.ndarray, second: np.ndarray) -> float:
+    """Diferencia de medias en unidades de la desviación estándar combinada"""
+    n1, n2 = len(first), len(second)
+    if n1 < 2 or n2 < 2:
+        return float('nan')
+    pooled = ((n1 - 1) * first.var(ddof=1) + (n2 - 1) * second.var(ddof=1)) / (n1 + n2 - 2)
+    return float((first.mean() - second.mean()) / np.sqrt(pooled)) if pooled > 0 else float('nan')
+
+
+def compare_groups(groups: Dict[str, np.ndarray], column: str, resamples: int = DEFAULT_RESAMPLES,
+                   confidence: float = DEFAULT_CONFIDENCE, seed: int = DEFAULT_SEED,
+                   quantiles: Sequence[float] = QUANTILES,
+                   max_workers: Optional[int] = None) -> ComparisonReport:
+    """Intervalos bootstrap por grupo y pruebas de permutación entre pares de grupos
+
+    groups asocia cada grupo con sus notas (sin NaN). Con max_workers=1 todo
+    se calcula en el proceso actual.
+    """
+    groups = {label: np.asarray(scores, dtype=np.float64) for label, scores in groups.items()}
+    groups = {label: scores[~np.isnan(scores)] for label, scores in groups.items()}
+    groups = {label: scores for label, scores in groups.items() if len(scores)}
+    all_values = np.unique(np.concatenate(list(groups.values()))) if groups else np.zeros(0)
+    samples = {label: _sample(scores, all_values) for label, scores in groups.items()}
+    pairs = list(combinations(groups, 2))
+
+    # Una semilla por lote, en un orden fijo
+    seeds = iter(np.random.SeedSequence(seed).spawn(
+        sum(len(_batch_sizes(resamples, sample.width)) for sample in samples.values())
+        + sum(len(_batch_sizes(resamples, samples[a].width + samples[b].width)) for a, b in pairs)))
+    tasks, owners = [], []
+    for label, sample in samples.items():
+        for size in _batch_sizes(resamples, sample.width):
+            tasks.append(_Task(_bootstrap_batch, (sample, size, tuple(quantiles), next(seeds)),
+                               size * sample.width))
+            owners.append(label)
+    for pair in pairs:
+        first, second = samples[pair[0]], samples[pair[1]]
+        width = first.width + second.width
+        for size in _batch_sizes(resamples, width):
+            tasks.append(_Task(_permutation_batch, (first, second, size, next(seeds)), size * width))
+            owners.append(pair)
+    results: Dict = {}
+    for owner, batch in zip(owners, _run(tasks, max_workers)):
+        results.setdefault(owner, []).append(batch)
+
+    alpha = 1 - confidence
+    names = statistic_names(quantiles)
+    interval_rows = []
+    for label, scores in groups.items():
+        estimates = np.concatenate([[scores.mean()], np.quantile(scores, quantiles)])
+        bootstrap = np.concatenate(results[label])
+        lower, upper = np.quantile(bootstrap, [alpha / 2, 1 - alpha / 2], axis=0)
+        for k, name in enumerate(names):
+            interval_rows.append((label, len(scores), name, estimates[k], lower[k], upper[k]))
+    intervals = pd.DataFrame(interval_rows, columns=['grupo', 'estudiantes', 'estadistico',
+                                                     'valor', 'inferior', 'superior'])
+
+    test_rows = []
+    for pair in pairs:
+        first, second = groups[pair[0]], groups[pair[1]]
+        observed = first.mean() - second.mean()
+        differences = np.concatenate(results[pair])
+        # Dos colas; el +1 incluye la partición observada (p-valor nunca 0)
+        extreme = np.count_nonzero(np.abs(differences) >= abs(observed) - 1e-12)
+        d = cohens_d(first, second)
+        test_rows.append((pair[0], pair[1], len(first), len(second), observed, d, effect_size_label(d),
+                          (extreme + 1) / (len(differences) + 1)))
+    tests = pd.DataFrame(test_rows, columns=['grupo_a', 'grupo_b', 'estudiantes_a', 'estudiantes_b',
+                                             'diferencia_medias', 'd_cohen', 'efecto', 'p_valor'])
+    tests['p_ajustado'] = holm_adjust(tests['p_valor'].to_numpy())
+    tests['significativa'] = tests['p_ajustado'] < SIGNIFICANCE
+    return ComparisonReport(column, intervals, tests, resamples, confidence, seed)
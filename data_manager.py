@@ -0,0 +1,651 @@
+"""
+Carga y análisis de los datos de exámenes
+
+DataManager concentra la carga de archivos (con caché en disco), la
+validación de registros y todos los cálculos estadísticos. No depende de Tk
+ni de matplotlib, por lo que puede usarse tanto desde la interfaz gráfica
+como desde la línea de comandos (cli.py).
+"""
+
+import copy
+import json
+import os
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from aggregates import PartialAggregate
+from analytics_cache import DEFAULT_MAX_BYTES, AnalyticsCache
+from answer_store import AnswerStore, AnswerStoreBuilder, append_student_frame
+from comparisons import DEFAULT_RESAMPLES, DEFAULT_SEED, ComparisonReport, compare_groups
+from dataset_cache import load_dataset, new_hasher, save_dataset
+from distractors import DistractorReport, distractor_analysis
+from group_index import DataFilter, GroupIndex
+from irt import TWO_PL, IrtCalibration, calibrate
+from json_stream import JsonRecordReader
+from profiling import profiler
+from psychometrics import ItemReport, item_report
+from search_index import DEFAULT_PAGE_SIZE, SearchResult, StudentSearchIndex
+from similarity import DEFAULT_ALPHA, SimilarityReport, find_similar_pairs
+from task_runner import TaskCancelled
+from validation import ValidationReport, validate_dataset
+
+
+# Campos obligatorios de cada registro
+REQUIRED_FIELDS = ['codigo', 'apellidos_nombres', 'examen', 'correctas',
+                   'incorrectas', 'nota', 'respuestas_estudiante', 'respuestas_correctas']
+
+# Registros por bloque durante la carga incremental
+LOAD_CHUNK_SIZE = 10_000
+
+# Máximo de mensajes de error que se conservan por carga
+MAX_LOAD_ERRORS = 100
+
+
+class LoadProgress(NamedTuple):
+    """Estado de una carga en curso"""
+    records: int
+    errors: int
+    bytes_read: int
+    total_bytes: int
+    summary: Dict
+
+    @property
+    def fraction(self) -> float:
+        """Fracción del archivo leída (0 a 1)"""
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+
+class LoadResult(NamedTuple):
+    """Resultado de leer un archivo de resultados"""
+    success: bool
+    message: str
+    store: Optional[AnswerStore] = None
+    df: Optional[pd.DataFrame] = None
+    load_errors: List[str] = []
+    validation: Optional[ValidationReport] = None
+    groups: Optional[GroupIndex] = None
+
+
+class AppendResult(NamedTuple):
+    """Resultado de leer un lote nuevo para agregarlo a los datos cargados"""
+    success: bool
+    message: str
+    # Versión de los datos sobre la que se preparó el lote
+    base_version: int = -1
+    store: Optional[AnswerStore] = None
+    df: Optional[pd.DataFrame] = None
+    # Agregados actualizados (None si aún no se habían calculado)
+    aggregate: Optional[PartialAggregate] = None
+    # Pares (codigo, examen) de los registros agregados
+    record_keys: frozenset = frozenset()
+    added: int = 0
+    duplicates: int = 0
+    load_errors: List[str] = []
+    # Reporte de validación e índices de grupos de los datos combinados
+    validation: Optional[ValidationReport] = None
+    groups: Optional[GroupIndex] = None
+
+
+def validate_record(record) -> Optional[str]:
+    """Valida un registro; retorna la descripción del error o None"""
+    if not isinstance(record, dict):
+        return "No es un objeto JSON"
+    missing_fields = [field for field in REQUIRED_FIELDS if field not in record]
+    if missing_fields:
+        return f"Faltan campos {missing_fields}"
+    for field in ('respuestas_estudiante', 'respuestas_correctas'):
+        if record[field] is not None and not isinstance(record[field], dict):
+            return f"'{field}' no es un objeto"
+    return None
+
+
+class _PerVersion:
+    """Un resultado que se calcula una vez por versión de los datos
+
+    Lo comparten una instancia de DataManager y todas sus vistas
+    (with_filter), incluidas las que crea cached() para cada cálculo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = -1
+
+    def get(self, version: int, compute: Callable[[], object]):
+        with self._lock:
+            if self._version != version:
+                self._value, self._version = compute(), version
+            return self._value
+
+    def set(self, version: int, value):
+        with self._lock:
+            self._value, self._version = value, version
+
+    def current(self, version: int):
+        """El resultado de esa versión si ya se calculó; None en caso contrario"""
+        with self._lock:
+            return self._value if self._version == version else None
+
+    def clear(self):
+        self.set(-1, None)
+
+
+class DataManager:
+    """Gestor de datos para el análisis de exámenes"""
+
+    def __init__(self, cache_bytes: int = DEFAULT_MAX_BYTES):
+        self.df: Optional[pd.DataFrame] = None
+        # Respuestas codificadas y claves deduplicadas
+        self.store: Optional[AnswerStore] = None
+        self.is_loaded = False
+        # Registros omitidos en la última carga (faltan campos)
+        self.load_errors: List[str] = []
+        # Observaciones de la validación del conjunto (sección 5.2)
+        self.validation: Optional[ValidationReport] = None
+        # Filas por tipo de examen y año de ingreso, y filtro activo (RF-023)
+        self.groups: Optional[GroupIndex] = None
+        self.filter = DataFilter()
+        self.chunk_size = LOAD_CHUNK_SIZE
+        # Caché binaria junto al archivo fuente (<archivo>.eacache)
+        self.use_cache = True
+        # Se incrementa cada vez que cambian los datos cargados
+        self.version = 0
+        # Resultados de análisis ya calculados para el estado actual
+        self.cache = AnalyticsCache(cache_bytes)
+        # Índice de búsqueda de estudiantes (uno por versión de los datos)
+        self._search_index = _PerVersion()
+        # Agregados de notas, preguntas y grupos (se actualizan al agregar lotes)
+        self._aggregate = _PerVersion()
+        # Última calibración TRI de cada modelo (punto de partida de la siguiente)
+        self._last_irt: Dict[str, IrtCalibration] = {}
+        # Pares (codigo, examen) cargados, para descartar duplicados en los lotes
+        self._record_keys: Optional[set] = None
+        self._record_keys_version = -1
+
+    def load_data(self, file_path: str,
+                  progress_callback: Optional[Callable[[LoadProgress], None]] = None) -> Tuple[bool, str]:
+        """Carga y valida los datos del archivo JSON (arreglo o JSON Lines)"""
+        result = self.read_file(file_path, progress_callback)
+        self.apply_load(result)
+        return result.success, result.message
+
+    def read_file(self, file_path: str,
+                  progress_callback: Optional[Callable[[LoadProgress], None]] = None) -> LoadResult:
+        """Lee y valida un archivo sin modificar los datos cargados actualmente
+
+        El archivo se lee registro por registro; cada registro se valida al
+        llegar y se agrega al almacén columnar por bloques de tamaño fijo.
+        Los registros inválidos se omiten y se informan en load_errors.
+        progress_callback recibe un LoadProgress al completar cada bloque;
+        si lanza TaskCancelled, la lectura se interrumpe.
+
+        Si existe una caché binaria válida para el archivo, se abre con
+        memoria mapeada en lugar de leer el JSON; tras una lectura exitosa
+        del JSON se escribe la caché para las próximas cargas.
+
+        Este método no modifica el estado del gestor, por lo que puede
+        ejecutarse en un hilo de trabajo mientras la interfaz sigue usando
+        los datos anteriores.
+        """
+        with profiler.span('cargar_archivo', 'carga', archivo=os.path.basename(file_path)):
+            result = self._read_file(file_path, progress_callback)
+            if result.success:
+                with profiler.span('indices_grupos', 'carga'):
+                    result = result._replace(groups=GroupIndex.from_frame(result.df))
+            return result
+
+    def _read_file(self, file_path: str,
+                   progress_callback: Optional[Callable[[LoadProgress], None]]) -> LoadResult:
+        try:
+            if self.use_cache:
+                with profiler.span('leer_cache', 'carga'):
+                    cached = load_dataset(file_path)
+                if cached is not None:
+                    if progress_callback:
+                        size = os.path.getsize(file_path)
+                        progress_callback(LoadProgress(len(cached.df), cached.error_count, size, size,
+                                                       {'total_estudiantes': len(cached.df),
+                                                        'nota_promedio': float(cached.df['nota'].mean())}))
+                    message = self._load_message(len(cached.df), cached.error_count) + " (caché)"
+                    return LoadResult(True, message, cached.store, cached.df, cached.load_errors,
+                                      cached.validation)
+
+            hasher = new_hasher() if self.use_cache else None
+            reader = JsonRecordReader(file_path, hasher=hasher)
+            builder = AnswerStoreBuilder(chunk_size=self.chunk_size)
+            errors: List[str] = []
+            error_count = 0
+            # Tiempo de interpretar el JSON y de validar, acumulado por bloque
+            phases = profiler.phases('carga')
+            validate = phases.wrap(validate_record, 'validar')
+
+            def report():
+                phases.emit(registros=builder.count)
+                if progress_callback:
+                    progress_callback(LoadProgress(builder.count, error_count, reader.bytes_read,
+                                                   reader.total_bytes, builder.partial_summary()))
+
+            for i, record in enumerate(phases.iterate(reader, 'interpretar_json')):
+                error = validate(record)
+                if error:
+                    error_count += 1
+                    if len(errors) < MAX_LOAD_ERRORS:
+                        errors.append(f"Registro {i + 1}: {error}")
+                    continue
+                if builder.add(record):
+                    report()
+
+            # Validar estructura
+            if len(builder) == 0:
+                if errors:
+                    return LoadResult(False, f"Ningún registro válido. {errors[0]}")
+                return LoadResult(False, "El archivo debe contener una lista de registros")
+
+            # Crear almacén columnar y DataFrame compacto
+            with profiler.span('construir_almacen', 'carga'):
+                store, df = builder.build()
+            report()
+
+            with profiler.span('validar_conjunto', 'carga', registros=len(df)):
+                validation = validate_dataset(store, df, builder.flagged_answers, error_count)
+
+            if self.use_cache:
+                with profiler.span('guardar_cache', 'carga'):
+                    save_dataset(file_path, store, df, hasher.hexdigest(), errors, error_count, validation)
+            return LoadResult(True, self._load_message(len(df), error_count), store, df, errors, validation)
+
+        except TaskCancelled:
+            raise
+        except json.JSONDecodeError:
+            return LoadResult(False, "Error: El archivo no es un JSON válido")
+        except FileNotFoundError:
+            return LoadResult(False, "Error: Archivo no encontrado")
+        except Exception as e:
+            return LoadResult(False, f"Error inesperado: {str(e)}")
+
+    def apply_load(self, result: LoadResult):
+        """Reemplaza los datos actuales por los de una lectura exitosa"""
+        if not result.success:
+            return
+        self.store = result.store
+        self.df = result.df
+        self.load_errors = result.load_errors
+        self.validation = result.validation
+        self.groups = result.groups
+        self.filter = DataFilter()
+        self.is_loaded = True
+        self.version += 1
+        self.cache.clear()
+
+    def append_data(self, file_path: str,
+                    progress_callback: Optional[Callable[[LoadProgress], None]] = None) -> Tuple[bool, str]:
+        """Agrega los registros nuevos de un archivo a los datos cargados"""
+        result = self.read_append(file_path, progress_callback)
+        self.apply_append(result)
+        return result.success, result.message
+
+    def _existing_record_keys(self, version: int, df: pd.DataFrame) -> set:
+        """Pares (codigo, examen) de los datos cargados; se calculan una vez por carga"""
+        if self._record_keys_version != version:
+            self._record_keys = set(zip(df['codigo'], df['examen'].astype(object)))
+            self._record_keys_version = version
+        return self._record_keys
+
+    def read_append(self, file_path: str,
+                    progress_callback: Optional[Callable[[LoadProgress], None]] = None) -> AppendResult:
+        """Lee un lote nuevo y prepara los datos combinados sin modificar el estado
+
+        Los registros cuyo par (codigo, examen) ya está cargado, o se repite
+        dentro del lote, se descartan (se conserva el primero). Si los
+        agregados del estado actual ya se calcularon, se combinan con los del
+        lote, de modo que el resumen, las preguntas y las cohortes se
+        actualizan en tiempo proporcional al lote. Como read_file, puede
+        ejecutarse en un hilo de trabajo; apply_append aplica el resultado.
+        """
+        if not self.is_loaded:
+            return AppendResult(False, "Primero cargue un archivo de datos")
+
+        version, store, df, validation = self.version, self.store, self.df, self.validation
+        aggregate = self._aggregate.current(version)
+        loaded = self.read_file(file_path, progress_callback)
+        if not loaded.success:
+            return AppendResult(False, loaded.message)
+
+        with profiler.span('descartar_duplicados', 'carga'):
+            existing = self._existing_record_keys(version, df)
+            fresh = set()
+            keep = np.zeros(len(loaded.df), dtype=bool)
+            for i, key in enumerate(zip(loaded.df['codigo'], loaded.df['examen'].astype(object))):
+                if key not in existing and key not in fresh:
+                    fresh.add(key)
+                    keep[i] = True
+        rows = np.flatnonzero(keep)
+        added, duplicates = len(rows), len(keep) - len(rows)
+        if not added:
+            return AppendResult(False, f"El archivo no contiene registros nuevos ({duplicates} duplicados)")
+
+        with profiler.span('combinar_lote', 'carga', registros=added):
+            batch_store = loaded.store.take(rows)
+            batch_df = loaded.df.iloc[rows].reset_index(drop=True)
+            if aggregate is not None:
+                aggregate = aggregate.merge(PartialAggregate.from_dataset(file_path, batch_store, batch_df))
+            merged_store = store.append(batch_store)
+            merged_df = append_student_frame(df, batch_df)
+            if validation is not None and loaded.validation is not None:
+                validation = validation.append(loaded.validation.take(rows), merged_store.questions)
+            groups = GroupIndex.from_frame(merged_df)
+
+        message = f"Se agregaron {added} registros"
+        if duplicates:
+            message += f" ({duplicates} duplicados omitidos)"
+        if loaded.load_errors:
+            message += f" ({len(loaded.load_errors)} registros con errores omitidos)"
+        return AppendResult(True, message, version, merged_store, merged_df, aggregate, frozenset(fresh),
+                            added, duplicates, loaded.load_errors, validation, groups)
+
+    def apply_append(self, result: AppendResult) -> bool:
+        """Aplica un lote preparado por read_append
+
+        Retorna False si el lote no se aplicó porque los datos cambiaron
+        mientras se leía.
+        """
+        if not result.success or result.base_version != self.version:
+            return False
+        self.store = result.store
+        self.df = result.df
+        self.load_errors = (self.load_errors + result.load_errors)[:MAX_LOAD_ERRORS]
+        self.validation = result.validation
+        self.groups = result.groups
+        self.version += 1
+        self.cache.clear()
+        if result.aggregate is not None:
+            self._aggregate.set(self.version, result.aggregate)
+        if self._record_keys_version == result.base_version:
+            self._record_keys |= result.record_keys
+            self._record_keys_version = self.version
+        return True
+
+    def get_aggregate(self) -> Optional[PartialAggregate]:
+        """Agregados de los estudiantes que cumplen el filtro activo"""
+        if not self.is_loaded:
+            return None
+
+        if self.filter.is_empty:
+            return self.get_full_aggregate()
+        return self.cached('agregados', lambda view: PartialAggregate.from_dataset(
+            '', view.filtered_store(), view.df, rows=view.filtered_rows()))
+
+    def get_full_aggregate(self) -> Optional[PartialAggregate]:
+        """Agregados del conjunto completo; se calculan una vez por carga
+
+        Tras agregar un lote se reciben ya combinados desde apply_append.
+        """
+        if not self.is_loaded:
+            return None
+
+        version, store, df = self.version, self.store, self.df
+
+        def compute():
+            with profiler.span('calcular:agregados', 'calculo'):
+                return PartialAggregate.from_dataset('', store, df)
+
+        return self._aggregate.get(version, compute)
+
+    def clear_computed(self):
+        """Descarta los resultados calculados (análisis, agregados, calibraciones TRI e índice de búsqueda)
+
+        Los datos cargados no cambian; la próxima consulta vuelve a calcular
+        desde cero (útil para medir tiempos).
+        """
+        self.cache.clear()
+        self._last_irt.clear()
+        self._aggregate.clear()
+        self._search_index.clear()
+
+    def state_key(self) -> Tuple:
+        """Identifica el estado actual de los datos y del filtro para detectar cambios"""
+        return (self.version, self.filter)
+
+    def set_filter(self, data_filter: DataFilter):
+        """Cambia el filtro de estudiantes que usan todas las estadísticas y gráficas
+
+        Los resultados de cada filtro se guardan por separado en la caché, por
+        lo que volver a un filtro anterior no recalcula nada.
+        """
+        self.filter = data_filter
+
+    def with_filter(self, data_filter: DataFilter) -> 'DataManager':
+        """Vista de los mismos datos con otro filtro, sin cambiar el de esta instancia
+
+        La vista comparte los datos, la caché de resultados, los agregados
+        completos y el índice de búsqueda, por lo que varios hilos pueden
+        consultar a la vez con filtros distintos (servicio local, server.py).
+        Sus datos y su filtro no cambian aunque cambien los de esta instancia.
+        """
+        view = copy.copy(self)
+        view.filter = data_filter
+        return view
+
+    def filtered_rows(self) -> Optional[np.ndarray]:
+        """Filas que cumplen el filtro activo (ordenadas); None si no hay filtro"""
+        if not self.is_loaded or self.filter.is_empty:
+            return None
+        return self.cached('filas', lambda view: view.groups.select(view.filter))
+
+    def total_count(self) -> int:
+        """Estudiantes cargados (sin filtro)"""
+        return len(self.df) if self.is_loaded else 0
+
+    def filtered_count(self) -> int:
+        """Estudiantes que cumplen el filtro activo"""
+        if not self.is_loaded:
+            return 0
+        rows = self.filtered_rows()
+        return len(self.df) if rows is None else len(rows)
+
+    def filtered_store(self) -> Optional[AnswerStore]:
+        """Respuestas de los estudiantes que cumplen el filtro activo
+
+        Solo incluye las preguntas aplicadas a alguno de esos estudiantes.
+        """
+        rows = self.filtered_rows()
+        return self.store if rows is None else self.store.take(rows).compact()
+
+    def get_group_scores(self, column: str) -> Dict[str, np.ndarray]:
+        """Notas de cada grupo de una columna (examen o año_ingreso) dentro del filtro"""
+        if not self.is_loaded:
+            return {}
+
+        def compute(view: 'DataManager'):
+            notas = view.df['nota'].to_numpy()
+            return {label: notas[rows] for label, rows in view.filtered_groups(column).items()}
+
+        return self.cached('notas_por_grupo', compute, column)
+
+    def get_comparisons(self, column: str, resamples: int = DEFAULT_RESAMPLES,
+                        seed: int = DEFAULT_SEED) -> Optional[ComparisonReport]:
+        """Intervalos bootstrap y pruebas de permutación de la nota entre los grupos de una columna"""
+        if not self.is_loaded:
+            return None
+
+        return self.cached('comparaciones', lambda view: compare_groups(
+            view.get_group_scores(column), column, resamples, seed=seed), column, resamples, seed)
+
+    def filtered_groups(self, column: str) -> Dict[str, np.ndarray]:
+        """Filas de cada grupo de una columna dentro del filtro (solo grupos no vacíos)"""
+        rows = self.filtered_rows()
+        groups = {}
+        for label in self.groups.labels(column):
+            group = self.groups.rows(column, label)
+            if rows is not None:
+                group = np.intersect1d(group, rows, assume_unique=True)
+            if len(group):
+                groups[label] = group
+        return groups
+
+    def get_similarity(self, alpha: float = DEFAULT_ALPHA,
+                       max_workers: Optional[int] = None) -> Optional[SimilarityReport]:
+        """Pares de estudiantes del mismo tipo de examen con respuestas incorrectas idénticas inusuales"""
+        if not self.is_loaded:
+            return None
+
+        return self.cached('similitud', lambda view: find_similar_pairs(
+            view.store, view.df, view.filtered_groups('examen'), alpha, max_workers=max_workers), alpha)
+
+    @staticmethod
+    def _load_message(count: int, error_count: int) -> str:
+        message = f"Datos cargados exitosamente: {count} registros"
+        if error_count:
+            message += f" ({error_count} registros con errores omitidos)"
+        return message
+
+    def cached(self, metric: str, compute: Callable[['DataManager'], object], *params):
+        """Calcula una métrica una sola vez por estado de los datos
+
+        compute recibe una vista (with_filter) con los datos y el filtro de la
+        clave, de modo que el resultado corresponde a la clave aunque otro
+        hilo cambie el filtro mientras se calcula. Los resultados se
+        comparten entre llamadas y no deben modificarse.
+        """
+        view = self.with_filter(self.filter)
+
+        def traced_compute():
+            with profiler.span(f'calcular:{metric}', 'calculo'):
+                return compute(view)
+
+        return self.cache.get_or_compute((view.state_key(), metric) + params, traced_compute)
+
+    def get_summary(self) -> Dict:
+        """Retorna resumen de los datos cargados"""
+        if not self.is_loaded:
+            return {}
+
+        def compute(view: 'DataManager'):
+            summary = view.get_aggregate().summary()
+            return {
+                'total_estudiantes': summary['total_estudiantes'],
+                'tipos_examen': summary['tipos_examen'],
+                'examen_tipos': summary['examen_tipos'],
+                'nota_promedio': summary['nota_promedio'],
+                'nota_max': summary['nota_max'],
+                'nota_min': summary['nota_min'],
+                'std_nota': summary['std_nota'],
+                'total_preguntas': summary['total_preguntas'],
+                'preguntas_por_examen': {exam: len(questions)
+                                         for exam, questions in view.store.exam_questions().items()
+                                         if exam in summary['examen_tipos']}
+            }
+
+        return self.cached('summary', compute)
+
+    def get_percentiles(self, quantiles: Tuple[float, ...] = (0.25, 0.50, 0.75, 0.90)) -> Dict[float, float]:
+        """Percentiles de la nota"""
+        if not self.is_loaded:
+            return {}
+
+        return self.cached('percentiles', lambda view: view.get_aggregate().percentiles(quantiles),
+                           tuple(quantiles))
+
+    def get_questions_analysis(self) -> pd.DataFrame:
+        """Analiza el rendimiento por pregunta"""
+        if not self.is_loaded:
+            return pd.DataFrame()
+
+        return self.cached('questions', lambda view: view.get_aggregate().question_table())
+
+    def get_item_report(self) -> Optional[ItemReport]:
+        """Discriminación, punto-biserial y confiabilidad de todas las preguntas"""
+        if not self.is_loaded:
+            return None
+
+        def compute(view: 'DataManager'):
+            store = view.filtered_store()
+            return item_report(store.correct_matrix(), store.questions, store.asked_mask())
+
+        return self.cached('item_report', compute)
+
+    def get_distractor_analysis(self) -> Optional[DistractorReport]:
+        """Frecuencias por opción y efectividad de distractores de todas las preguntas"""
+        if not self.is_loaded:
+            return None
+
+        def compute(view: 'DataManager'):
+            store = view.filtered_store()
+            return distractor_analysis(store.answers, store.key_matrix(), store.questions)
+
+        return self.cached('distractors', compute)
+
+    def get_irt(self, model: str = TWO_PL) -> Optional[IrtCalibration]:
+        """Parámetros TRI (1PL o 2PL) de las preguntas y habilidad de los estudiantes del filtro
+
+        La calibración parte de la última calculada con el mismo modelo (otro
+        filtro o los datos antes de agregar un lote), por lo que cambiar el
+        filtro solo requiere unas pocas iteraciones del EM.
+        """
+        if not self.is_loaded:
+            return None
+
+        def compute(view: 'DataManager'):
+            store = view.filtered_store()
+            result = calibrate(store.correct_matrix(), store.questions, store.asked_mask(), model,
+                               warm_start=self._last_irt.get(model))
+            self._last_irt[model] = result
+            return result
+
+        return self.cached('tri', compute, model)
+
+    def get_cohort_stats(self) -> pd.DataFrame:
+        """Nota promedio y número de estudiantes por año de ingreso"""
+        if not self.is_loaded:
+            return pd.DataFrame()
+
+        # Año de ingreso precalculado al cargar (primeros 4 dígitos del código)
+        return self.cached('cohorts', lambda view: PartialAggregate.group_table(
+            view.get_aggregate().cohorts, 'año_ingreso'))
+
+    def has_search_index(self) -> bool:
+        """Indica si el índice de búsqueda del conjunto actual ya está construido"""
+        return self.is_loaded and self._search_index.current(self.version) is not None
+
+    def get_search_index(self) -> Optional[StudentSearchIndex]:
+        """Índice de búsqueda del conjunto actual; se construye una vez por versión"""
+        if not self.is_loaded:
+            return None
+
+        version, df = self.version, self.df
+
+        def compute():
+            with profiler.span('construir_indice_busqueda', 'calculo'):
+                return StudentSearchIndex(df['codigo'], df['apellidos_nombres'])
+
+        return self._search_index.get(version, compute)
+
+    def search_students(self, query: str, offset: int = 0,
+                        limit: int = DEFAULT_PAGE_SIZE) -> Tuple[pd.DataFrame, Optional[SearchResult]]:
+        """Busca estudiantes por prefijo de código o parte del nombre
+
+        Retorna la página de filas solicitada (ordenada por relevancia) y el
+        resultado con el total de coincidencias.
+        """
+        index = self.get_search_index()
+        if index is None:
+            return pd.DataFrame(), None
+        result = index.search(query, offset, limit)
+        return self.df.iloc[result.rows], result
+
+    def get_memory_usage(self) -> Dict[str, int]:
+        """Retorna la memoria ocupada por los datos cargados (bytes)"""
+        if not self.is_loaded:
+            return {}
+
+        df_bytes = int(self.df.memory_usage(deep=True).sum())
+        total = df_bytes + self.store.nbytes
+        return {
+            'dataframe': df_bytes,
+            'respuestas': self.store.nbytes,
+            'total': total,
+            'por_estudiante': total // max(len(self.df), 1)
+        }
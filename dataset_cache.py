@@ -0,0 +1,222 @@
+"""
+Caché binaria en disco de los datos cargados
+
+Tras la primera carga exitosa de un archivo se escribe un directorio
+auxiliar (<archivo>.eacache) con una columna .npy por campo, el reporte de
+validación (validation.npz) y un encabezado meta.json. Las cargas posteriores abren esas columnas con memoria mapeada
+(np.load(mmap_mode='r')), sin copiar ni volver a interpretar el JSON; el
+sistema operativo solo lee del disco las páginas de las columnas que se usan.
+
+La caché se asocia al archivo fuente mediante su tamaño, fecha de
+modificación y hash de contenido (BLAKE2b):
+    - si cambia el tamaño, la caché se descarta;
+    - si coinciden tamaño y fecha, se usa directamente;
+    - si solo cambia la fecha, se recalcula el hash y se usa si coincide.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from answer_store import AnswerStore
+from validation import RULE_INDEX, RULES, ValidationReport
+
+# Versión del formato; cambiarla invalida las cachés existentes
+CACHE_VERSION = 3
+CACHE_SUFFIX = '.eacache'
+META_FILE = 'meta.json'
+HASH_BLOCK = 1 << 20
+
+_STORE_ARRAYS = ('answers', 'key_table', 'key_index')
+_VALIDATION_ARRAYS = ('rules', 'rows', 'columns', 'values')
+VALIDATION_FILE = 'validation.npz'
+
+
+class CachedDataset(NamedTuple):
+    """Datos recuperados de la caché"""
+    store: AnswerStore
+    df: pd.DataFrame
+    load_errors: List[str]
+    error_count: int
+    validation: ValidationReport
+
+
+def new_hasher():
+    """Crea el objeto hash usado para identificar el contenido del archivo"""
+    return hashlib.blake2b(digest_size=20)
+
+
+def file_hash(file_path: str) -> str:
+    """Calcula el hash de contenido de un archivo leyendo por bloques"""
+    hasher = new_hasher()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def cache_dir_for(source_path: str) -> str:
+    """Ruta del directorio de caché asociado a un archivo fuente"""
+    return os.path.abspath(source_path) + CACHE_SUFFIX
+
+
+def _source_signature(source_path: str) -> Dict:
+    stat = os.stat(source_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _column_kind(series: pd.Series) -> str:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return 'numeric'
+    if pd.api.types.infer_dtype(series, skipna=False) == 'integer':
+        return 'integer'
+    return 'string'
+
+
+def save_dataset(source_path: str, store: AnswerStore, df: pd.DataFrame, content_hash: str,
+                 load_errors: Optional[List[str]] = None, error_count: int = 0,
+                 validation: Optional[ValidationReport] = None) -> bool:
+    """Escribe la caché del archivo fuente; retorna False si no fue posible
+
+    La caché es solo una optimización: cualquier error de escritura (por
+    ejemplo, un directorio de solo lectura) se ignora.
+    """
+    target = cache_dir_for(source_path)
+    staging = f"{target}.tmp-{os.getpid()}"
+    try:
+        os.makedirs(staging, exist_ok=True)
+        for name in _STORE_ARRAYS:
+            np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(getattr(store, name)))
+
+        columns = []
+        for i, (name, series) in enumerate(df.items()):
+            kind = _column_kind(series)
+            file_name = f"col{i}.npy"
+            column = {'name': name, 'kind': kind, 'file': file_name}
+            if kind == 'category':
+                values = series.cat.codes.to_numpy()
+                column['categories'] = series.cat.categories.tolist()
+            elif kind == 'numeric':
+                values = series.to_numpy()
+            elif kind == 'integer':
+                values = series.to_numpy(dtype=np.int64)
+            else:
+                values = series.astype(str).to_numpy(dtype=str)
+            np.save(os.path.join(staging, file_name), values)
+            columns.append(column)
+
+        if validation is not None:
+            np.savez(os.path.join(staging, VALIDATION_FILE),
+                     **{name: getattr(validation, name) for name in _VALIDATION_ARRAYS})
+
+        meta = {
+            'version': CACHE_VERSION,
+            'source': _source_signature(source_path),
+            'hash': content_hash,
+            'rows': len(df),
+            'questions': store.questions,
+            'exam_keys': [[exam, int(key)] for exam, key in store.exam_keys.items()],
+            'columns': columns,
+            'load_errors': list(load_errors or []),
+            'error_count': error_count,
+            # Nombres de las reglas en el orden de los índices guardados
+            'validation_rules': [rule.name for rule in RULES] if validation is not None else None
+        }
+        with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        os.replace(staging, target)
+        return True
+    except (OSError, TypeError, ValueError):
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
+
+
+def _read_meta(source_path: str) -> Optional[Dict]:
+    """Lee el encabezado y verifica que corresponda al archivo fuente actual"""
+    meta_path = os.path.join(cache_dir_for(source_path), META_FILE)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get('version') != CACHE_VERSION:
+        return None
+    current = _source_signature(source_path)
+    cached = meta.get('source', {})
+    if current['size'] != cached.get('size'):
+        return None
+    if current['mtime_ns'] != cached.get('mtime_ns'):
+        # Mismo tamaño pero distinta fecha: confirmar por contenido
+        if file_hash(source_path) != meta.get('hash'):
+            return None
+        meta['source'] = current
+        try:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+        except OSError:
+            pass
+    return meta
+
+
+def load_dataset(source_path: str) -> Optional[CachedDataset]:
+    """Abre la caché del archivo con memoria mapeada; None si no es válida"""
+    try:
+        meta = _read_meta(source_path)
+        if meta is None:
+            return None
+        directory = cache_dir_for(source_path)
+
+        def open_array(file_name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, file_name), mmap_mode='r')
+
+        arrays = {name: open_array(f"{name}.npy") for name in _STORE_ARRAYS}
+        exam_keys = {exam: key for exam, key in meta['exam_keys']}
+        store = AnswerStore(arrays['answers'], arrays['key_table'], arrays['key_index'],
+                            meta['questions'], exam_keys)
+
+        data = {}
+        for column in meta['columns']:
+            values = open_array(column['file'])
+            kind = column['kind']
+            if kind == 'category':
+                data[column['name']] = pd.Categorical.from_codes(values, column['categories'])
+            elif kind in ('string', 'integer'):
+                # Las columnas de texto se convierten a objetos de Python
+                data[column['name']] = pd.Series(values.astype(object), dtype=object)
+            else:
+                data[column['name']] = values
+        df = pd.DataFrame(data, columns=[c['name'] for c in meta['columns']], copy=False)
+        if len(df) != meta['rows'] or len(store) != meta['rows']:
+            return None
+
+        error_count = meta.get('error_count', 0)
+        validation = _load_validation(directory, meta, store, error_count)
+        return CachedDataset(store, df, meta.get('load_errors', []), error_count, validation)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _load_validation(directory: str, meta: Dict, store: AnswerStore, error_count: int) -> ValidationReport:
+    """Lee el reporte de validación guardado (las reglas se traducen por nombre)"""
+    names = meta.get('validation_rules')
+    if names is None:
+        return ValidationReport.empty(store.questions, len(store), error_count)
+    with np.load(os.path.join(directory, VALIDATION_FILE)) as arrays:
+        data = {name: arrays[name] for name in _VALIDATION_ARRAYS}
+    # Las reglas que ya no existen se descartan
+    lookup = np.array([RULE_INDEX.get(name, -1) for name in names] + [-1], dtype=np.int8)
+    rules = lookup[data['rules']]
+    keep = rules >= 0
+    return ValidationReport(rules[keep], data['rows'][keep], data['columns'][keep], data['values'][keep],
+                            store.questions, len(store), error_count)
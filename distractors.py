@@ -0,0 +1,161 @@
+"""
+Análisis de distractores por pregunta (RF-014, RF-020)
+
+Las frecuencias de cada opción se obtienen para todas las preguntas y
+todos los cuartiles de puntaje con un único np.bincount sobre el código
+combinado (cuartil, pregunta, opción elegida, ¿es la clave?). Un segundo
+bincount cuenta cuántos estudiantes tienen cada opción como clave, de modo
+que con varias versiones de examen una opción solo se evalúa como
+distractor para los estudiantes cuya clave es otra.
+
+Las preguntas que no pertenecen a la versión del estudiante (NOT_ASKED en
+la clave) se cuentan en una casilla aparte y no entran en los denominadores.
+
+Las filas se procesan por bloques para acotar la memoria de los códigos
+intermedios con cientos de miles de hojas.
+"""
+
+from typing import NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from item_analysis import BLANK, NOT_ASKED, OPTIONS, score_matrix
+
+# Cuartiles de puntaje total (Q1 = inferior, Q4 = superior)
+N_GROUPS = 4
+
+# Un distractor elegido por menos de esta fracción no funciona
+MIN_DISTRACTOR_RATE = 0.05
+
+# Filas procesadas por bloque
+BLOCK_ROWS = 65_536
+
+# Etiquetas de las columnas de frecuencia: opciones A-D y en blanco
+RESPONSE_LABELS = OPTIONS + ('En blanco',)
+
+
+class DistractorReport(NamedTuple):
+    """Resultado del análisis de distractores"""
+    # Fracción de estudiantes que eligió cada respuesta: pregunta × (A..D, blanco)
+    proportions: pd.DataFrame
+    # Una fila por (pregunta, opción) con frecuencias por cuartil y marcas
+    options: pd.DataFrame
+    # Opción que es clave para la mayoría de estudiantes en cada pregunta
+    main_keys: np.ndarray
+
+
+def score_groups(scores: np.ndarray, asked: np.ndarray, n_groups: int = N_GROUPS) -> np.ndarray:
+    """Grupo de puntaje (0 = inferior) de cada estudiante
+
+    Los estudiantes se ordenan por proporción de acierto sobre las preguntas
+    de su versión (asked: número de preguntas aplicadas a cada uno).
+    """
+    n_students = scores.shape[0]
+    totals = scores.sum(axis=1, dtype=np.int64)
+    proportion = np.divide(totals, asked, out=np.zeros(n_students), where=asked > 0)
+    ranks = np.empty(n_students, dtype=np.int64)
+    ranks[np.argsort(proportion, kind='stable')] = np.arange(n_students)
+    return (ranks * n_groups // max(n_students, 1)).astype(np.int8)
+
+
+def option_counts(answers: np.ndarray, keys: np.ndarray, groups: np.ndarray,
+                  n_groups: int = N_GROUPS):
+    """Cuenta respuestas por (grupo, pregunta, opción)
+
+    Retorna (chosen, chosen_as_key, key_counts), cada uno de forma
+    grupo × pregunta × (BLANK + opciones + no aplicada):
+        chosen: estudiantes que eligieron la opción
+        chosen_as_key: de ellos, los que la tenían como clave
+        key_counts: estudiantes cuya clave es la opción
+    La última casilla cuenta a los estudiantes sin la pregunta en su versión.
+    """
+    n_students, n_items = answers.shape
+    n_codes = len(OPTIONS) + 2
+    not_asked_code = n_codes - 1
+    cells = n_groups * n_items * n_codes
+    chosen_pairs = np.zeros(cells * 2, dtype=np.int64)
+    key_counts = np.zeros(cells, dtype=np.int64)
+    item_offsets = np.arange(n_items, dtype=np.int64) * n_codes
+
+    for start in range(0, n_students, BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        base = groups[block].astype(np.int64)[:, None] * (n_items * n_codes) + item_offsets
+        block_answers, block_keys = answers[block], keys[block]
+        not_asked = block_keys == NOT_ASKED
+        is_key = (block_answers == block_keys) & (block_keys > BLANK)
+        answer_codes = np.where(not_asked, not_asked_code, block_answers)
+        key_codes = np.where(not_asked, not_asked_code, block_keys)
+        codes = (base + answer_codes) * 2 + is_key
+        chosen_pairs += np.bincount(codes.ravel(), minlength=cells * 2)
+        key_counts += np.bincount((base + key_codes).ravel(), minlength=cells)
+
+    chosen_pairs = chosen_pairs.reshape(n_groups, n_items, n_codes, 2)
+    shape = (n_groups, n_items, n_codes)
+    return chosen_pairs.sum(axis=3), chosen_pairs[..., 1], key_counts.reshape(shape)
+
+
+def distractor_analysis(answers: np.ndarray, keys: np.ndarray,
+                        questions: Sequence[str]) -> DistractorReport:
+    """Frecuencias por opción y efectividad de los distractores de todas las preguntas
+
+    Un distractor se marca como no funcional si lo elige menos del 5% de
+    los estudiantes para quienes es incorrecto, o si el cuartil superior lo
+    elige con más frecuencia que el inferior.
+    """
+    asked = keys != NOT_ASKED
+    groups = score_groups(score_matrix(answers, keys), asked.sum(axis=1))
+    chosen, chosen_as_key, key_counts = option_counts(answers, keys, groups)
+    # Se descarta la casilla de preguntas no aplicadas
+    chosen, chosen_as_key, key_counts = chosen[..., :-1], chosen_as_key[..., :-1], key_counts[..., :-1]
+
+    # Estudiantes de cada grupo que respondieron cada pregunta
+    group_asked = key_counts.sum(axis=2, keepdims=True)
+    # Elecciones y estudiantes elegibles cuando la opción es un distractor
+    distractor_chosen = chosen - chosen_as_key
+    eligible = group_asked - key_counts
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total_chosen = chosen.sum(axis=0)
+        response_share = total_chosen / group_asked.sum(axis=0)
+        distractor_rate = distractor_chosen.sum(axis=0) / eligible.sum(axis=0)
+        group_rate = distractor_chosen / eligible
+        group_share = chosen / group_asked
+
+    # Reordenar las columnas a A..D y luego en blanco
+    order = list(range(1, len(OPTIONS) + 1)) + [BLANK]
+    proportions = pd.DataFrame(response_share[:, order], index=list(questions), columns=RESPONSE_LABELS)
+
+    key_totals = key_counts.sum(axis=0)
+    main_keys = np.argmax(key_totals[:, 1:], axis=1) + 1
+    option_codes = np.arange(1, len(OPTIONS) + 1)
+
+    # Tabla larga: una fila por (pregunta, opción A-D)
+    n_items = len(questions)
+    is_main_key = option_codes[None, :] == main_keys[:, None]
+    rate = distractor_rate[:, 1:]
+    lower_rate, upper_rate = group_rate[0, :, 1:], group_rate[-1, :, 1:]
+    has_students = eligible.sum(axis=0)[:, 1:] > 0
+    rarely_chosen = has_students & ~is_main_key & (rate < MIN_DISTRACTOR_RATE)
+    attracts_top = has_students & ~is_main_key & (upper_rate > lower_rate)
+
+    reasons = np.full((n_items, len(OPTIONS)), '', dtype=object)
+    reasons[rarely_chosen] = 'Elegido por menos del 5%'
+    reasons[attracts_top] = np.where(rarely_chosen[attracts_top],
+                                     'Elegido por menos del 5%; atrae al grupo superior',
+                                     'Atrae más al grupo superior')
+
+    options = pd.DataFrame({
+        'pregunta': np.repeat(list(questions), len(OPTIONS)),
+        'opcion': np.tile(OPTIONS, n_items),
+        'es_clave': is_main_key.ravel(),
+        'elegida': total_chosen[:, 1:].ravel(),
+        'proporcion': response_share[:, 1:].ravel(),
+        'tasa_distractor': rate.ravel()
+    })
+    for g in range(N_GROUPS):
+        options[f'proporcion_q{g + 1}'] = group_share[g, :, 1:].ravel()
+    options['no_funcional'] = (rarely_chosen | attracts_top).ravel()
+    options['motivo'] = reasons.ravel()
+
+    return DistractorReport(proportions, options, main_keys)
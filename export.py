@@ -0,0 +1,77 @@
+"""
+Escritura de archivos de reporte (JSON y CSV)
+
+Funciones compartidas por los modos de línea de comandos (cli.py y
+batch.py). No importa matplotlib, de modo que los procesos de trabajo del
+análisis por lotes no pagan su costo de carga.
+"""
+
+import json
+import math
+import os
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Extensiones reconocidas al recibir un directorio
+INPUT_EXTENSIONS = ('.json', '.jsonl')
+
+# Formatos de tabla admitidos
+TABLE_FORMATS = ('json', 'csv')
+
+
+def find_input_files(paths: Sequence[str]) -> List[str]:
+    """Expande directorios a sus archivos .json/.jsonl (ordenados)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.lower().endswith(INPUT_EXTENSIONS)))
+        else:
+            files.append(path)
+    return files
+
+
+def json_safe(value):
+    """Convierte datos con tipos de NumPy/pandas a tipos de JSON
+
+    Los valores no finitos (NaN, infinito) y los ausentes de pandas se
+    convierten en null: json.dump escribiría NaN, que no es JSON válido, y
+    no llama a default para np.float64 (es subclase de float).
+    """
+    if isinstance(value, dict):
+        return {str(key): json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return json_safe(value.tolist())
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    if value is None or isinstance(value, str):
+        return value
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return str(value)
+
+
+def write_json(path: str, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(json_safe(data), f, ensure_ascii=False, indent=2, allow_nan=False)
+
+
+def write_table(directory: str, name: str, table: pd.DataFrame, formats: Sequence[str]) -> List[str]:
+    """Escribe una tabla en los formatos pedidos; retorna las rutas creadas"""
+    paths = []
+    for fmt in formats:
+        path = os.path.join(directory, f"{name}.{fmt}")
+        if fmt == 'csv':
+            table.to_csv(path, index=False, encoding='utf-8')
+        else:
+            write_json(path, table.to_dict(orient='records'))
+        paths.append(path)
+    return paths
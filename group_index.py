@@ -0,0 +1,109 @@
+"""
+Índices de grupos y filtro de estudiantes (RF-023)
+
+Al cargar los datos, las filas se agrupan por tipo de examen y por año de
+ingreso: para cada columna se ordenan los índices de fila por categoría con
+un solo argsort estable de los códigos categóricos y se guardan los límites
+de cada grupo. Las filas de un grupo son un tramo de ese arreglo, ya
+ordenado de menor a mayor, por lo que consultarlas no recorre el DataFrame.
+
+Un DataFilter elige tipos de examen y años de ingreso. Sus filas son la
+unión de los tramos elegidos en cada columna y la intersección entre
+columnas; cambiar el filtro cuesta una operación sobre arreglos de índices,
+no una copia del DataFrame.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Columnas categóricas con índice de grupos
+GROUP_COLUMNS = ('examen', 'año_ingreso')
+
+
+class DataFilter(NamedTuple):
+    """Selección de estudiantes por columna (None = todos)"""
+    exams: Optional[Tuple[str, ...]] = None
+    cohorts: Optional[Tuple[str, ...]] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return self.exams is None and self.cohorts is None
+
+    def selections(self) -> Dict[str, Tuple[str, ...]]:
+        """Grupos elegidos por columna (solo las columnas filtradas)"""
+        selected = {'examen': self.exams, 'año_ingreso': self.cohorts}
+        return {column: labels for column, labels in selected.items() if labels is not None}
+
+    def describe(self) -> str:
+        """Descripción breve para la interfaz y los reportes"""
+        if self.is_empty:
+            return "Todos los estudiantes"
+        parts = []
+        if self.exams is not None:
+            parts.append(f"Examen: {', '.join(self.exams)}")
+        if self.cohorts is not None:
+            parts.append(f"Cohorte: {', '.join(self.cohorts)}")
+        return ' | '.join(parts)
+
+
+class GroupIndex:
+    """Filas de cada grupo de las columnas categóricas"""
+
+    def __init__(self, n_rows: int, groups: Dict[str, Tuple[List[str], np.ndarray, np.ndarray]]):
+        self.n_rows = n_rows
+        # columna -> (etiquetas, filas ordenadas por grupo, límites de cada grupo)
+        self._groups = groups
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Sequence[str] = GROUP_COLUMNS) -> 'GroupIndex':
+        """Construye los índices de las columnas categóricas del DataFrame"""
+        groups = {}
+        for column in columns:
+            categorical = df[column].astype('category').cat
+            codes = categorical.codes.to_numpy()
+            n_categories = len(categorical.categories)
+            # Los valores ausentes (código -1) quedan fuera de todos los grupos
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(n_categories + 1) - 0.5)
+            sizes = np.diff(bounds)
+            # Solo los grupos con estudiantes
+            present = np.flatnonzero(sizes)
+            labels = [str(categorical.categories[i]) for i in present]
+            starts = bounds[present]
+            groups[column] = (labels, order, np.column_stack([starts, starts + sizes[present]]))
+        return cls(len(df), groups)
+
+    def labels(self, column: str) -> List[str]:
+        """Grupos con al menos un estudiante, en el orden de las categorías"""
+        return list(self._groups[column][0])
+
+    def sizes(self, column: str) -> Dict[str, int]:
+        """Número de estudiantes de cada grupo"""
+        labels, _, bounds = self._groups[column]
+        return dict(zip(labels, (bounds[:, 1] - bounds[:, 0]).tolist()))
+
+    def rows(self, column: str, label: str) -> np.ndarray:
+        """Filas de un grupo (vista ordenada; vacía si el grupo no existe)"""
+        labels, order, bounds = self._groups[column]
+        try:
+            start, end = bounds[labels.index(label)]
+        except ValueError:
+            return order[:0]
+        return order[start:end]
+
+    def union(self, column: str, labels: Sequence[str]) -> np.ndarray:
+        """Filas ordenadas de varios grupos de una columna"""
+        parts = [self.rows(column, label) for label in labels]
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+
+    def select(self, data_filter: DataFilter) -> Optional[np.ndarray]:
+        """Filas que cumplen el filtro, ordenadas; None si el filtro incluye a todos"""
+        rows = None
+        for column, labels in data_filter.selections().items():
+            selected = self.union(column, labels)
+            rows = selected if rows is None else np.intersect1d(rows, selected, assume_unique=True)
+        return rows
@@ -0,0 +1,84 @@
+"""
+Motor de análisis por pregunta (item analysis) vectorizado
+
+Las respuestas de todos los estudiantes se codifican una sola vez en una
+matriz estudiante×pregunta de enteros pequeños (int8) y las claves en otra
+matriz del mismo tamaño. Con ambas matrices, las métricas de todas las
+preguntas se obtienen en una única pasada de NumPy.
+
+Las preguntas se descubren al cargar los datos, por lo que cada versión de
+examen puede tener su propio conjunto. La matriz tiene una columna por
+pregunta conocida; en la clave, las preguntas que no forman parte de la
+versión del estudiante se marcan con NOT_ASKED y quedan fuera de los
+cálculos (máscara AnswerStore.asked_mask).
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Preguntas del formato original (Q1 a Q20)
+QUESTIONS: List[str] = [f"Q{i}" for i in range(1, 21)]
+
+# Codificación de opciones: 0 = en blanco / no válida, 1..4 = A..D
+OPTIONS = ('A', 'B', 'C', 'D')
+BLANK = 0
+# En la matriz de claves: la pregunta no pertenece a la versión del examen
+NOT_ASKED = -1
+OPTION_CODES: Dict[str, int] = {option: code for code, option in enumerate(OPTIONS, start=1)}
+# Códigos que solo existen durante la carga (encode_raw_answers): la
+# validación los registra y luego se guardan como BLANK
+MISSING = -2    # la pregunta no aparece en las respuestas del estudiante
+INVALID = -3    # respuesta distinta de A-D y de en blanco
+_ABSENT = object()
+RAW_ANSWER_CODES: Dict[object, int] = {**OPTION_CODES, '': BLANK, None: BLANK, _ABSENT: MISSING}
+
+# Umbrales de dificultad (proporción de acierto)
+EASY_THRESHOLD = 0.7
+HARD_THRESHOLD = 0.3
+
+
+def encode_raw_answers(answer_dicts: Iterable[Optional[Dict[str, str]]],
+                       questions: Sequence[str]) -> np.ndarray:
+    """Codifica una secuencia de diccionarios {pregunta: opción} en una matriz int8
+
+    Las respuestas ausentes se codifican como MISSING y las que no son A-D
+    ni en blanco, como INVALID.
+    """
+    lookup = RAW_ANSWER_CODES
+    flat = [lookup.get(answers.get(q, _ABSENT), INVALID) if answers else MISSING
+            for answers in answer_dicts for q in questions]
+    matrix = np.fromiter(flat, dtype=np.int8, count=len(flat))
+    return matrix.reshape(-1, len(questions))
+
+
+def encode_keys(key_dicts: Iterable[Optional[Dict[str, str]]],
+                questions: Sequence[str]) -> np.ndarray:
+    """Codifica claves {pregunta: opción} en una matriz int8
+
+    Las preguntas ausentes de una clave se codifican como NOT_ASKED; las
+    presentes con una opción fuera de A-D, como BLANK.
+    """
+    lookup = OPTION_CODES
+    flat = [lookup.get(key[q], BLANK) if key and q in key else NOT_ASKED
+            for key in key_dicts for q in questions]
+    matrix = np.fromiter(flat, dtype=np.int8, count=len(flat))
+    return matrix.reshape(-1, len(questions))
+
+
+def question_sort_key(question: str):
+    """Orden natural de nombres de pregunta (Q2 antes que Q10)"""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part)
+            for part in re.split(r'(\d+)', str(question)) if part]
+
+
+def difficulty_labels(proportions: np.ndarray) -> np.ndarray:
+    """Clasifica cada proporción de acierto en Fácil / Moderada / Difícil"""
+    return np.where(proportions > EASY_THRESHOLD, 'Fácil',
+                    np.where(proportions < HARD_THRESHOLD, 'Difícil', 'Moderada'))
+
+
+def score_matrix(answers: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Retorna la matriz booleana de aciertos (respuesta igual a la clave)"""
+    return (answers == keys) & (keys > BLANK)
@@ -0,0 +1,140 @@
+"""
+Lectura incremental de archivos de resultados
+
+Recorre un archivo JSON registro por registro sin cargarlo completo en
+memoria. Admite dos formatos:
+    - Arreglo JSON de objetos (formato original: [{...}, {...}, ...])
+    - JSON Lines: un objeto JSON por línea
+"""
+
+import codecs
+import json
+import os
+from typing import Any, Iterator, Optional
+
+# Tamaño de cada lectura del archivo (bytes)
+READ_SIZE = 1 << 20
+
+# Tamaño máximo aceptado para un único registro antes de abortar
+MAX_RECORD_CHARS = 16 << 20
+
+_WHITESPACE = ' \t\n\r'
+
+# Caracteres que pueden continuar un número JSON
+_NUMBER_CHARS = '0123456789+-.eE'
+
+
+class JsonRecordReader:
+    """Iterador de registros de un archivo JSON (arreglo o JSON Lines)
+
+    El atributo bytes_read indica cuántos bytes del archivo se han consumido,
+    lo que permite informar progreso sobre total_bytes. Si se entrega un
+    hasher, el contenido del archivo se procesa en la misma lectura.
+    """
+
+    def __init__(self, file_path: str, read_size: int = READ_SIZE, hasher=None):
+        self.file_path = file_path
+        # Objeto hashlib opcional que recibe todos los bytes leídos
+        self.hasher = hasher
+        self.read_size = read_size
+        self.total_bytes = os.path.getsize(file_path)
+        self.bytes_read = 0
+        self.is_json_lines = False
+
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._file = None
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[Any]:
+        with open(self.file_path, 'rb') as self._file:
+            first = self._peek_char()
+            if first is None:
+                return
+            if first == '[':
+                self._pos += 1
+                yield from self._iter_array()
+            else:
+                self.is_json_lines = True
+                yield from self._iter_lines()
+            self._drain()
+
+    def _fill(self) -> bool:
+        """Lee el siguiente bloque del archivo; retorna False al llegar al final"""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.read_size)
+        self.bytes_read += len(chunk)
+        if self.hasher is not None:
+            self.hasher.update(chunk)
+        if not chunk:
+            self._eof = True
+            self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(b'', final=True)
+        else:
+            self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(chunk)
+        self._pos = 0
+        return True
+
+    def _drain(self):
+        """Consume el resto del archivo para que el hash cubra todo el contenido"""
+        if self.hasher is None:
+            return
+        for chunk in iter(lambda: self._file.read(self.read_size), b''):
+            self.bytes_read += len(chunk)
+            self.hasher.update(chunk)
+
+    def _peek_char(self) -> Optional[str]:
+        """Salta espacios en blanco y retorna el siguiente carácter sin consumirlo"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def _decode_value(self) -> Any:
+        """Decodifica un valor JSON completo, leyendo más datos si hace falta"""
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if len(self._buffer) - self._pos > MAX_RECORD_CHARS or not self._fill():
+                    raise
+                continue
+            # Un número que llega al final del bloque podría estar incompleto
+            # ('333.' de '333.5e2'): se lee más hasta que lo siga otro carácter
+            tail = end
+            while tail < len(self._buffer) and self._buffer[tail] in _NUMBER_CHARS:
+                tail += 1
+            if tail == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _iter_array(self) -> Iterator[Any]:
+        """Recorre los elementos de un arreglo JSON de nivel superior"""
+        if self._peek_char() == ']':
+            self._pos += 1
+            return
+        while True:
+            if self._peek_char() is None:
+                raise json.JSONDecodeError("Arreglo JSON incompleto", self._buffer, self._pos)
+            yield self._decode_value()
+
+            separator = self._peek_char()
+            if separator == ',':
+                self._pos += 1
+            elif separator == ']':
+                self._pos += 1
+                return
+            else:
+                raise json.JSONDecodeError("Se esperaba ',' o ']'", self._buffer, self._pos)
+
+    def _iter_lines(self) -> Iterator[Any]:
+        """Recorre un archivo JSON Lines (un valor por línea)"""
+        while self._peek_char() is not None:
+            yield self._decode_value()
+
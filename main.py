@@ -3,254 +3,57 @@ ExamAnalytics Desktop - MVP
 Sistema de Análisis de Resultados de Exámenes
 
 Requisitos:
-pip install ttkbootstrap pandas matplotlib seaborn numpy
+pip install ttkbootstrap pandas matplotlib numpy
+
+Al iniciar solo se importan tkinter y ttkbootstrap: la ventana se muestra
+de inmediato y pandas, numpy y matplotlib (DataManager, VisualizationEngine
+y el canvas TkAgg) se importan en un hilo de trabajo. Si el usuario los
+necesita antes de que terminen de cargarse, se importan en ese momento.
+Presupuesto de importación medido con -X importtime:
+benchmarks/check_startup.py.
+
+Con --servidor la aplicación funciona como cliente liviano del servicio
+local (server.py): no carga archivos y obtiene estadísticas, búsquedas y
+datos de gráficas por HTTP (client.py).
+
+    python main.py --servidor http://127.0.0.1:8765 --conjunto resultados
 
 Autor: FLORES LUERA, Miguel
 Versión: 1.0.0
 """
 
+import importlib.util
+import threading
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import filedialog, messagebox
 import ttkbootstrap as ttk_bs
 from ttkbootstrap.constants import *
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import json
 import os
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-import threading
-from collections import Counter
-
-# Configuración global de matplotlib
-plt.style.use('default')
-sns.set_palette("husl")
-
-
-class DataManager:
-    """Gestor de datos para el análisis de exámenes"""
-
-    def __init__(self):
-        self.data: List[Dict] = []
-        self.df: Optional[pd.DataFrame] = None
-        self.is_loaded = False
-
-    def load_data(self, file_path: str) -> Tuple[bool, str]:
-        """Carga y valida los datos del archivo JSON"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
-
-            # Validar estructura
-            if not self.data or not isinstance(self.data, list):
-                return False, "El archivo debe contener una lista de registros"
-
-            # Validar campos requeridos
-            required_fields = ['codigo', 'apellidos_nombres', 'examen', 'correctas',
-                               'incorrectas', 'nota', 'respuestas_estudiante', 'respuestas_correctas']
-
-            for i, record in enumerate(self.data):
-                missing_fields = [field for field in required_fields if field not in record]
-                if missing_fields:
-                    return False, f"Registro {i + 1}: Faltan campos {missing_fields}"
-
-            # Crear DataFrame
-            self.df = pd.DataFrame(self.data)
-            self.is_loaded = True
-            return True, f"Datos cargados exitosamente: {len(self.data)} registros"
-
-        except json.JSONDecodeError:
-            return False, "Error: El archivo no es un JSON válido"
-        except FileNotFoundError:
-            return False, "Error: Archivo no encontrado"
-        except Exception as e:
-            return False, f"Error inesperado: {str(e)}"
-
-    def get_summary(self) -> Dict:
-        """Retorna resumen de los datos cargados"""
-        if not self.is_loaded:
-            return {}
-
-        return {
-            'total_estudiantes': len(self.df),
-            'tipos_examen': self.df['examen'].nunique(),
-            'examen_tipos': list(self.df['examen'].unique()),
-            'nota_promedio': self.df['nota'].mean(),
-            'nota_max': self.df['nota'].max(),
-            'nota_min': self.df['nota'].min(),
-            'std_nota': self.df['nota'].std()
-        }
-
-    def get_questions_analysis(self) -> pd.DataFrame:
-        """Analiza el rendimiento por pregunta"""
-        if not self.is_loaded:
-            return pd.DataFrame()
-
-        questions_data = []
-        for i in range(1, 21):  # Q1 to Q20
-            q_key = f"Q{i}"
-            correct_count = 0
-            total_count = len(self.df)
-
-            for _, row in self.df.iterrows():
-                student_answer = row['respuestas_estudiante'].get(q_key)
-                correct_answer = row['respuestas_correctas'].get(q_key)
-                if student_answer == correct_answer:
-                    correct_count += 1
-
-            difficulty_index = correct_count / total_count if total_count > 0 else 0
-
-            questions_data.append({
-                'pregunta': q_key,
-                'correctas': correct_count,
-                'total': total_count,
-                'porcentaje_acierto': difficulty_index * 100,
-                'dificultad': 'Fácil' if difficulty_index > 0.7 else 'Difícil' if difficulty_index < 0.3 else 'Moderada'
-            })
-
-        return pd.DataFrame(questions_data)
-
-
-class VisualizationEngine:
-    """Motor de visualizaciones para la aplicación"""
-
-    def __init__(self, data_manager: DataManager):
-        self.data_manager = data_manager
-
-    def create_histogram_notas(self, parent_frame) -> FigureCanvasTkAgg:
-        """Crea histograma de distribución de notas"""
-        fig = Figure(figsize=(10, 6), dpi=100)
-        ax = fig.add_subplot(111)
-
-        if self.data_manager.is_loaded:
-            notas = self.data_manager.df['nota']
-            ax.hist(notas, bins=20, alpha=0.7, color='skyblue', edgecolor='black')
-            ax.set_xlabel('Nota')
-            ax.set_ylabel('Frecuencia')
-            ax.set_title('Distribución de Notas Finales')
-            ax.grid(True, alpha=0.3)
-
-            # Añadir línea de promedio
-            mean_nota = notas.mean()
-            ax.axvline(mean_nota, color='red', linestyle='--',
-                       label=f'Promedio: {mean_nota:.2f}')
-            ax.legend()
-        else:
-            ax.text(0.5, 0.5, 'No hay datos cargados',
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=ax.transAxes, fontsize=14)
-
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, parent_frame)
-        return canvas
-
-    def create_boxplot_exams(self, parent_frame) -> FigureCanvasTkAgg:
-        """Crea boxplot comparando notas por tipo de examen"""
-        fig = Figure(figsize=(10, 6), dpi=100)
-        ax = fig.add_subplot(111)
-
-        if self.data_manager.is_loaded:
-            df = self.data_manager.df
-            exam_types = df['examen'].unique()
-            data_for_boxplot = [df[df['examen'] == exam]['nota'].values for exam in exam_types]
-
-            ax.boxplot(data_for_boxplot, labels=exam_types)
-            ax.set_xlabel('Tipo de Examen')
-            ax.set_ylabel('Nota')
-            ax.set_title('Distribución de Notas por Tipo de Examen')
-            ax.grid(True, alpha=0.3)
-        else:
-            ax.text(0.5, 0.5, 'No hay datos cargados',
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=ax.transAxes, fontsize=14)
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, parent_frame)
-        return canvas
+from profiling import profiler
+from task_runner import BackgroundTask, TaskScheduler
 
-    def create_questions_difficulty(self, parent_frame) -> FigureCanvasTkAgg:
-        """Crea gráfico de barras con porcentaje de acierto por pregunta"""
-        fig = Figure(figsize=(12, 6), dpi=100)
-        ax = fig.add_subplot(111)
+if TYPE_CHECKING:
+    from chart_view import ChartView
+    from data_manager import AppendResult, DataManager, LoadProgress, LoadResult
+    from similarity import SimilarityReport
+    from visualization import VisualizationEngine
 
-        if self.data_manager.is_loaded:
-            questions_df = self.data_manager.get_questions_analysis()
+# Dependencias que se verifican antes de abrir la ventana
+REQUIRED_MODULES = ('ttkbootstrap', 'pandas', 'numpy', 'matplotlib')
 
-            colors = ['green' if x > 70 else 'red' if x < 30 else 'orange'
-                      for x in questions_df['porcentaje_acierto']]
 
-            bars = ax.bar(questions_df['pregunta'], questions_df['porcentaje_acierto'],
-                          color=colors, alpha=0.7)
-
-            ax.set_xlabel('Pregunta')
-            ax.set_ylabel('Porcentaje de Acierto (%)')
-            ax.set_title('Dificultad por Pregunta')
-            ax.set_ylim(0, 100)
-            ax.grid(True, alpha=0.3)
-
-            # Añadir líneas de referencia
-            ax.axhline(70, color='green', linestyle='--', alpha=0.5, label='Fácil (>70%)')
-            ax.axhline(30, color='red', linestyle='--', alpha=0.5, label='Difícil (<30%)')
-            ax.legend()
-
-            # Rotar etiquetas del eje x
-            plt.setp(ax.get_xticklabels(), rotation=45)
-        else:
-            ax.text(0.5, 0.5, 'No hay datos cargados',
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=ax.transAxes, fontsize=14)
-
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, parent_frame)
-        return canvas
-
-    def create_performance_by_cohort(self, parent_frame) -> FigureCanvasTkAgg:
-        """Crea gráfico de rendimiento por cohorte (año de ingreso)"""
-        fig = Figure(figsize=(10, 6), dpi=100)
-        ax = fig.add_subplot(111)
-
-        if self.data_manager.is_loaded:
-            df = self.data_manager.df.copy()
-            # Extraer año de ingreso del código (primeros 4 dígitos)
-            df['año_ingreso'] = df['codigo'].astype(str).str[:4]
-
-            cohort_stats = df.groupby('año_ingreso')['nota'].agg(['mean', 'count']).reset_index()
-            cohort_stats = cohort_stats[cohort_stats['count'] >= 5]  # Solo cohortes con al menos 5 estudiantes
-
-            if not cohort_stats.empty:
-                bars = ax.bar(cohort_stats['año_ingreso'], cohort_stats['mean'],
-                              alpha=0.7, color='lightcoral')
-                ax.set_xlabel('Año de Ingreso')
-                ax.set_ylabel('Nota Promedio')
-                ax.set_title('Rendimiento Promedio por Cohorte')
-                ax.grid(True, alpha=0.3)
-
-                # Añadir valores en las barras
-                for bar, value in zip(bars, cohort_stats['mean']):
-                    ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
-                            f'{value:.1f}', ha='center', va='bottom')
-            else:
-                ax.text(0.5, 0.5, 'Datos insuficientes para análisis por cohorte',
-                        horizontalalignment='center', verticalalignment='center',
-                        transform=ax.transAxes, fontsize=12)
-        else:
-            ax.text(0.5, 0.5, 'No hay datos cargados',
-                    horizontalalignment='center', verticalalignment='center',
-                    transform=ax.transAxes, fontsize=14)
-
-        fig.tight_layout()
-        canvas = FigureCanvasTkAgg(fig, parent_frame)
-        return canvas
+def import_backend():
+    """Importa los módulos pesados (pandas, numpy, matplotlib)"""
+    import chart_view  # noqa: F401
+    import data_manager  # noqa: F401
 
 
 class StatsPanel:
     """Panel de estadísticas descriptivas"""
 
-    def __init__(self, parent_frame, data_manager: DataManager):
+    def __init__(self, parent_frame, data_manager: Optional['DataManager'] = None):
         self.parent_frame = parent_frame
         self.data_manager = data_manager
         self.create_widgets()
@@ -271,35 +74,33 @@ class StatsPanel:
 
         self.update_stats()
 
-    def update_stats(self):
+    def compute_stats(self, data_manager: Optional['DataManager'] = None) -> Optional[List[Tuple[str, str]]]:
+        """Calcula las estadísticas a mostrar (puede ejecutarse en un hilo de trabajo)
+
+        data_manager permite calcularlas sobre una vista fija de los datos
+        (DataManager.with_filter) en lugar del gestor compartido.
+        """
+        data_manager = data_manager or self.data_manager
+        if data_manager is None:
+            return None
+        from report import summary_cards
+        return summary_cards(data_manager)
+
+    def update_stats(self, stats_data: Optional[List[Tuple[str, str]]] = None):
         # Limpiar frame
         for widget in self.stats_frame.winfo_children():
             widget.destroy()
 
-        if not self.data_manager.is_loaded:
+        if stats_data is None:
+            stats_data = self.compute_stats()
+
+        if stats_data is None:
             no_data_label = ttk_bs.Label(self.stats_frame,
                                          text="No hay datos cargados",
                                          font=("Arial", 12))
             no_data_label.pack(pady=20)
             return
 
-        summary = self.data_manager.get_summary()
-        df = self.data_manager.df
-
-        # Crear grid de estadísticas
-        stats_data = [
-            ("Total de Estudiantes", summary['total_estudiantes']),
-            ("Tipos de Examen", summary['tipos_examen']),
-            ("Nota Promedio", f"{summary['nota_promedio']:.2f}"),
-            ("Nota Máxima", summary['nota_max']),
-            ("Nota Mínima", summary['nota_min']),
-            ("Desviación Estándar", f"{summary['std_nota']:.2f}"),
-            ("Percentil 25", f"{df['nota'].quantile(0.25):.2f}"),
-            ("Percentil 50 (Mediana)", f"{df['nota'].quantile(0.50):.2f}"),
-            ("Percentil 75", f"{df['nota'].quantile(0.75):.2f}"),
-            ("Percentil 90", f"{df['nota'].quantile(0.90):.2f}")
-        ]
-
         # Crear cards de estadísticas
         row = 0
         col = 0
@@ -322,25 +123,330 @@ class StatsPanel:
             self.stats_frame.columnconfigure(i, weight=1)
 
 
+class DiagnosticsWindow:
+    """Ventana de diagnóstico: activa el perfil y muestra dónde se va el tiempo"""
+
+    # Actualización de la tabla mientras la ventana está abierta (ms)
+    REFRESH_MS = 1000
+
+    def __init__(self, root):
+        self.window = ttk_bs.Toplevel(root)
+        self.window.title("Diagnóstico de rendimiento")
+        self.window.geometry("760x480")
+        self.profile_enabled = tk.BooleanVar(value=profiler.enabled)
+        self.memory_enabled = tk.BooleanVar(value=profiler.memory_enabled)
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        controls = ttk_bs.Frame(self.window)
+        controls.pack(fill=X, padx=10, pady=5)
+
+        ttk_bs.Checkbutton(controls, text="Registrar perfil", variable=self.profile_enabled,
+                           command=self.toggle_profile, bootstyle="round-toggle").pack(side=LEFT, padx=5)
+        ttk_bs.Checkbutton(controls, text="Medir memoria", variable=self.memory_enabled,
+                           command=self.toggle_memory, bootstyle="round-toggle").pack(side=LEFT, padx=5)
+        ttk_bs.Button(controls, text="Exportar traza...", command=self.export_trace,
+                      bootstyle=SUCCESS).pack(side=RIGHT, padx=5)
+        ttk_bs.Button(controls, text="Limpiar", command=self.clear,
+                      bootstyle=(SECONDARY, OUTLINE)).pack(side=RIGHT, padx=5)
+
+        self.memory_label = ttk_bs.Label(self.window, text="Memoria: -")
+        self.memory_label.pack(anchor=W, padx=15)
+
+        columns = ('paso', 'categoria', 'llamadas', 'total', 'promedio', 'maximo')
+        headings = ('Paso', 'Categoría', 'Llamadas', 'Total (ms)', 'Promedio (ms)', 'Máximo (ms)')
+        self.table = ttk_bs.Treeview(self.window, columns=columns, show='headings')
+        for column, heading in zip(columns, headings):
+            self.table.heading(column, text=heading)
+            self.table.column(column, width=220 if column == 'paso' else 90,
+                              anchor=W if column in ('paso', 'categoria') else E)
+        self.table.pack(fill=BOTH, expand=True, padx=10, pady=5)
+
+    def toggle_profile(self):
+        if self.profile_enabled.get():
+            profiler.enable(memory=self.memory_enabled.get())
+        else:
+            profiler.disable()
+            self.memory_enabled.set(False)
+
+    def toggle_memory(self):
+        if self.memory_enabled.get():
+            # Medir memoria implica registrar el perfil
+            self.profile_enabled.set(True)
+            profiler.enable(memory=True)
+        else:
+            profiler.stop_memory_sampling()
+
+    def clear(self):
+        profiler.clear()
+        self.refresh(reschedule=False)
+
+    def refresh(self, reschedule: bool = True):
+        """Actualiza la tabla de pasos y la memoria"""
+        if not self.window.winfo_exists():
+            return
+        self.table.delete(*self.table.get_children())
+        for stats in profiler.summary():
+            self.table.insert('', END, values=(
+                stats.name, stats.category, stats.count, f"{stats.total * 1e3:.1f}",
+                f"{stats.mean * 1e3:.1f}", f"{stats.maximum * 1e3:.1f}"))
+
+        samples = profiler.memory_samples()
+        if samples:
+            self.memory_label.config(text=f"Memoria: {samples[-1].current / 1024 ** 2:.1f} MB actual, "
+                                          f"{profiler.peak_memory() / 1024 ** 2:.1f} MB pico")
+        else:
+            self.memory_label.config(text="Memoria: sin muestras (active \"Medir memoria\")")
+        if reschedule:
+            self.window.after(self.REFRESH_MS, self.refresh)
+
+    def export_trace(self):
+        """Guarda la traza en formato Trace Event de Chrome"""
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window,
+            title="Exportar traza",
+            defaultextension=".json",
+            filetypes=[("Chrome trace (JSON)", "*.json"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                profiler.export_chrome_trace(file_path)
+                messagebox.showinfo("Éxito", f"Traza guardada en: {file_path}\n"
+                                    "Ábrala en chrome://tracing o ui.perfetto.dev", parent=self.window)
+            except Exception as e:
+                messagebox.showerror("Error", f"Error al guardar: {str(e)}", parent=self.window)
+
+
+class ValidationWindow:
+    """Ventana con el reporte de validación de los datos cargados"""
+
+    # Observaciones que se listan (el reporte completo se exporta a CSV)
+    MAX_ISSUES = 1000
+
+    def __init__(self, root, data_manager: 'DataManager'):
+        self.data_manager = data_manager
+        self.window = ttk_bs.Toplevel(root)
+        self.window.title("Validación de datos")
+        self.window.geometry("860x560")
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        controls = ttk_bs.Frame(self.window)
+        controls.pack(fill=X, padx=10, pady=5)
+
+        self.message_label = ttk_bs.Label(controls, text="", font=("Arial", 10, "bold"))
+        self.message_label.pack(side=LEFT, padx=5)
+        ttk_bs.Button(controls, text="Exportar CSV...", command=self.export_issues,
+                      bootstyle=SUCCESS).pack(side=RIGHT, padx=5)
+
+        columns = ('regla', 'severidad', 'descripcion', 'observaciones', 'registros')
+        headings = ('Regla', 'Severidad', 'Descripción', 'Observaciones', 'Registros')
+        self.summary_table = ttk_bs.Treeview(self.window, columns=columns, show='headings', height=6)
+        for column, heading in zip(columns, headings):
+            self.summary_table.heading(column, text=heading)
+            self.summary_table.column(column, width=360 if column == 'descripcion' else 110,
+                                      anchor=E if column in ('observaciones', 'registros') else W)
+        self.summary_table.pack(fill=X, padx=10, pady=5)
+
+        self.issues_label = ttk_bs.Label(self.window, text="")
+        self.issues_label.pack(anchor=W, padx=15)
+
+        columns = ('fila', 'codigo', 'regla', 'severidad', 'pregunta', 'detalle')
+        headings = ('Fila', 'Código', 'Regla', 'Severidad', 'Pregunta', 'Detalle')
+        self.issues_table = ttk_bs.Treeview(self.window, columns=columns, show='headings')
+        for column, heading in zip(columns, headings):
+            self.issues_table.heading(column, text=heading)
+            self.issues_table.column(column, width=220 if column == 'detalle' else 110,
+                                     anchor=E if column == 'fila' else W)
+        self.issues_table.pack(fill=BOTH, expand=True, padx=10, pady=5)
+
+    def refresh(self):
+        """Muestra el reporte de los datos cargados actualmente"""
+        if not self.window.winfo_exists():
+            return
+        self.summary_table.delete(*self.summary_table.get_children())
+        self.issues_table.delete(*self.issues_table.get_children())
+        report = self.data_manager.validation
+        if report is None:
+            self.message_label.config(text="No hay datos cargados")
+            self.issues_label.config(text="")
+            return
+
+        self.message_label.config(text=report.message())
+        for row in report.summary().itertuples(index=False):
+            self.summary_table.insert('', END, values=(row.regla, row.severidad, row.descripcion,
+                                                       f"{row.observaciones:,}", f"{row.registros:,}"))
+        issues = report.issues(self.data_manager.df, limit=self.MAX_ISSUES)
+        for row in issues.itertuples(index=False):
+            self.issues_table.insert('', END, values=(row.fila, row.codigo, row.regla, row.severidad,
+                                                      row.pregunta, row.detalle))
+        total = len(report.rows)
+        text = f"Observaciones por registro: {total:,}"
+        if total > len(issues):
+            text += f" (se muestran las primeras {len(issues):,}; exporte el reporte para verlas todas)"
+        self.issues_label.config(text=text)
+
+    def export_issues(self):
+        """Guarda todas las observaciones en CSV"""
+        report = self.data_manager.validation
+        if report is None:
+            return
+        file_path = filedialog.asksaveasfilename(
+            parent=self.window,
+            title="Exportar validación",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                report.issues(self.data_manager.df).to_csv(file_path, index=False, encoding='utf-8')
+                messagebox.showinfo("Éxito", f"Reporte guardado en: {file_path}", parent=self.window)
+            except Exception as e:
+                messagebox.showerror("Error", f"Error al guardar: {str(e)}", parent=self.window)
+
+
 class ExamAnalyticsApp:
     """Aplicación principal de análisis de exámenes"""
 
-    def __init__(self):
+    # Vistas de cada pestaña, en el orden del notebook
+    TAB_VIEWS = [
+        ['stats'],                  # Resumen
+        ['histogram', 'icc'],       # Distribuciones
+        ['questions', 'distractors', 'items'],  # Por Pregunta
+        [],                         # Por Estudiante (se actualiza al buscar)
+        ['boxplot', 'cohort', 'mean_tests'],  # Comparaciones
+        ['similarity']              # Similitud
+    ]
+
+    # Pausa de escritura antes de buscar (ms)
+    SEARCH_DELAY_MS = 150
+
+    # Opción de la barra de filtros que no filtra
+    ALL_GROUPS = "Todos"
+
+    # Máximo de pares similares mostrados en la tabla
+    MAX_SIMILAR_PAIRS = 500
+
+    # Columnas cuyos grupos se comparan (etiqueta en la tabla de pruebas)
+    COMPARISON_COLUMNS = {'examen': "Examen", 'año_ingreso': "Cohorte"}
+
+    def __init__(self, server_url: Optional[str] = None, dataset: Optional[str] = None):
         self.root = ttk_bs.Window(themename="flatly")
         self.root.title("ExamAnalytics Desktop - v1.0")
         self.root.geometry("1200x800")
         self.root.minsize(1000, 600)
 
-        # Managers
-        self.data_manager = DataManager()
-        self.viz_engine = VisualizationEngine(self.data_manager)
+        # Servicio local del que la aplicación es cliente (None: datos locales)
+        self.server_url = server_url
+        self.dataset = dataset
+        # Managers (se crean al terminar de importar los módulos pesados)
+        self._data_manager: Optional['DataManager'] = None
+        self._viz_engine: Optional['VisualizationEngine'] = None
+        self._backend_lock = threading.Lock()
+        self.scheduler = TaskScheduler(self.root)
 
         # Variables
         self.current_file = tk.StringVar(value="Ningún archivo cargado")
+        self.loaded_path: Optional[str] = None
+        # Tareas en curso (carga de archivo y cálculo de vistas)
+        self.load_task: Optional[BackgroundTask] = None
+        self.report_task: Optional[BackgroundTask] = None
+        self.render_tasks: Dict[int, BackgroundTask] = {}
+        # Gráficas persistentes, creadas al dibujarse por primera vez
+        self.chart_views: Dict[str, 'ChartView'] = {}
+        # Estado de datos (DataManager.state_key) con el que se dibujó cada pestaña
+        self.rendered_state: Dict[int, Tuple] = {}
+        # Ventana de diagnóstico (perfil de ejecución)
+        self.diagnostics: Optional[DiagnosticsWindow] = None
+        self.validation_window: Optional[ValidationWindow] = None
 
         self.setup_ui()
         self.center_window()
 
+        # Importar pandas, numpy y matplotlib después de mostrar la ventana
+        self.status_bar.config(text="Iniciando...")
+        self.root.after_idle(self.preload_backend)
+
+    def preload_backend(self):
+        """Importa los módulos pesados en un hilo de trabajo"""
+        self.scheduler.submit('modulos', lambda task: import_backend(),
+                              on_done=lambda result: self.on_backend_loaded(),
+                              on_error=self.on_backend_error)
+
+    def on_backend_loaded(self):
+        self.create_backend()
+        if self.remote_mode:
+            self.connect_server()
+        elif self.status_bar.cget('text') == "Iniciando...":
+            self.status_bar.config(text="Listo")
+
+    def connect_server(self):
+        """Se conecta al servicio local en un hilo de trabajo"""
+        self.status_bar.config(text=f"Conectando con {self.server_url}...")
+        self.scheduler.submit('conectar', lambda task: self.data_manager.connect(),
+                              on_done=self.on_server_connected,
+                              on_error=self.on_server_error)
+
+    def on_server_connected(self, message: str):
+        self.current_file.set(f"Servidor: {self.data_manager.dataset}")
+        self.status_bar.config(text=message)
+        self.update_filter_options()
+        self.refresh_all()
+
+    def on_server_error(self, error: BaseException):
+        self.status_bar.config(text="Sin conexión con el servicio")
+        messagebox.showerror("Error", f"No se pudo conectar con el servicio: {error}")
+
+    def on_backend_error(self, error: BaseException):
+        self.status_bar.config(text="Error al iniciar")
+        messagebox.showerror("Error", f"No se pudieron cargar los módulos de análisis: {error}")
+
+    def create_backend(self):
+        """Crea el gestor de datos y el motor de gráficas (una sola vez)"""
+        with self._backend_lock:
+            if self._data_manager is None:
+                if self.remote_mode:
+                    from client import AnalyticsClient, RemoteDataManager, RemoteVisualizationEngine
+                    data_manager = RemoteDataManager(AnalyticsClient(self.server_url), self.dataset)
+                    self._viz_engine = RemoteVisualizationEngine(data_manager)
+                else:
+                    from data_manager import DataManager
+                    from visualization import VisualizationEngine
+                    data_manager = DataManager()
+                    self._viz_engine = VisualizationEngine(data_manager)
+                self.stats_panel.data_manager = data_manager
+                self._data_manager = data_manager
+
+    @property
+    def remote_mode(self) -> bool:
+        """Indica si la aplicación es cliente de un servicio local"""
+        return self.server_url is not None
+
+    def local_only(self, action: str) -> bool:
+        """Avisa si una acción requiere los datos locales; retorna True si no está disponible"""
+        if self.remote_mode:
+            messagebox.showinfo("Modo cliente", f"{action} no está disponible como cliente del servicio "
+                                f"{self.server_url}.")
+        return self.remote_mode
+
+    @property
+    def backend_ready(self) -> bool:
+        return self._data_manager is not None
+
+    @property
+    def data_manager(self) -> 'DataManager':
+        if self._data_manager is None:
+            self.create_backend()
+        return self._data_manager
+
+    @property
+    def viz_engine(self) -> 'VisualizationEngine':
+        if self._viz_engine is None:
+            self.create_backend()
+        return self._viz_engine
+
     def center_window(self):
         """Centra la ventana en la pantalla"""
         self.root.update_idletasks()
@@ -361,6 +467,9 @@ class ExamAnalyticsApp:
         # Status bar
         self.create_status_bar()
 
+        # Filtros (sobre la barra de estado)
+        self.create_filter_bar()
+
     def create_header(self):
         """Crea la barra de herramientas superior"""
         header_frame = ttk_bs.Frame(self.root)
@@ -370,12 +479,24 @@ class ExamAnalyticsApp:
         ttk_bs.Button(header_frame, text="📁 Cargar Datos",
                       command=self.load_data, bootstyle=PRIMARY).pack(side=LEFT, padx=5)
 
+        ttk_bs.Button(header_frame, text="➕ Agregar Lote",
+                      command=self.append_data, bootstyle=(PRIMARY, OUTLINE)).pack(side=LEFT, padx=5)
+
         ttk_bs.Button(header_frame, text="💾 Exportar Gráfica",
                       command=self.export_current_chart, bootstyle=SUCCESS).pack(side=LEFT, padx=5)
 
+        ttk_bs.Button(header_frame, text="📄 Reporte PDF",
+                      command=self.export_report, bootstyle=(SUCCESS, OUTLINE)).pack(side=LEFT, padx=5)
+
         ttk_bs.Button(header_frame, text="🔄 Actualizar",
                       command=self.refresh_all, bootstyle=INFO).pack(side=LEFT, padx=5)
 
+        ttk_bs.Button(header_frame, text="✔ Validación",
+                      command=self.show_validation, bootstyle=(WARNING, OUTLINE)).pack(side=LEFT, padx=5)
+
+        ttk_bs.Button(header_frame, text="🩺 Diagnóstico",
+                      command=self.show_diagnostics, bootstyle=(SECONDARY, OUTLINE)).pack(side=LEFT, padx=5)
+
         # Archivo actual
         file_label = ttk_bs.Label(header_frame, textvariable=self.current_file,
                                   font=("Arial", 10))
@@ -411,9 +532,17 @@ class ExamAnalyticsApp:
         self.notebook.add(self.tab_comparisons, text="⚖️ Comparaciones")
         self.setup_comparisons_tab()
 
+        # Pestaña 6: Similitud de respuestas
+        self.tab_similarity = ttk_bs.Frame(self.notebook)
+        self.notebook.add(self.tab_similarity, text="🔍 Similitud")
+        self.setup_similarity_tab()
+
+        # Las pestañas se dibujan al seleccionarlas por primera vez
+        self.notebook.bind("<<NotebookTabChanged>>", lambda event: self.render_current_tab())
+
     def setup_summary_tab(self):
         """Configura la pestaña de resumen"""
-        self.stats_panel = StatsPanel(self.tab_summary, self.data_manager)
+        self.stats_panel = StatsPanel(self.tab_summary)
 
     def setup_distributions_tab(self):
         """Configura la pestaña de distribuciones"""
@@ -425,7 +554,9 @@ class ExamAnalyticsApp:
         self.hist_frame = ttk_bs.LabelFrame(charts_frame, text="Distribución de Notas")
         self.hist_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
 
-        self.refresh_histogram()
+        # Curvas características de la calibración TRI
+        self.icc_frame = ttk_bs.LabelFrame(charts_frame, text="Curvas Características (TRI)")
+        self.icc_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
 
     def setup_questions_tab(self):
         """Configura la pestaña de análisis por pregunta"""
@@ -433,7 +564,25 @@ class ExamAnalyticsApp:
         self.questions_frame = ttk_bs.LabelFrame(self.tab_questions, text="Dificultad por Pregunta")
         self.questions_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
 
-        self.refresh_questions_chart()
+        # Frame para gráfica de distractores
+        self.distractors_frame = ttk_bs.LabelFrame(self.tab_questions, text="Respuestas por Opción")
+        self.distractors_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
+
+        # Tabla de preguntas problemáticas
+        items_frame = ttk_bs.LabelFrame(self.tab_questions, text="Preguntas Problemáticas")
+        items_frame.pack(fill=X, padx=5, pady=5)
+
+        self.reliability_label = ttk_bs.Label(items_frame, text="Confiabilidad (KR-20): -")
+        self.reliability_label.pack(anchor=W, padx=5, pady=(5, 0))
+
+        columns = ('pregunta', 'dificultad_p', 'discriminacion', 'punto_biserial', 'alfa_sin_item', 'motivo')
+        headings = ('Pregunta', 'Dificultad (p)', 'Discriminación (D)', 'Punto-biserial', 'Alfa sin ítem', 'Motivo')
+        self.items_table = ttk_bs.Treeview(items_frame, columns=columns, show='headings', height=6)
+        for column, heading in zip(columns, headings):
+            self.items_table.heading(column, text=heading)
+            self.items_table.column(column, width=300 if column == 'motivo' else 110,
+                                    anchor=W if column == 'motivo' else CENTER)
+        self.items_table.pack(fill=X, padx=5, pady=5)
 
     def setup_students_tab(self):
         """Configura la pestaña de análisis por estudiante"""
@@ -451,6 +600,11 @@ class ExamAnalyticsApp:
         ttk_bs.Button(search_frame, text="Buscar",
                       command=self.search_student, bootstyle=PRIMARY).pack(side=LEFT, padx=5)
 
+        # Búsqueda mientras se escribe
+        self.search_after_id: Optional[str] = None
+        self.student_search.bind("<KeyRelease>", self.schedule_search)
+        self.student_search.bind("<Return>", lambda event: self.search_student())
+
         # Frame de resultados
         self.student_results_frame = ttk_bs.Frame(main_frame)
         self.student_results_frame.pack(fill=BOTH, expand=True)
@@ -470,106 +624,507 @@ class ExamAnalyticsApp:
         self.boxplot_frame = ttk_bs.LabelFrame(comp_frame, text="Comparación por Tipo de Examen")
         self.boxplot_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
 
-        self.refresh_boxplot()
-
         # Análisis por cohorte
         self.cohort_frame = ttk_bs.LabelFrame(comp_frame, text="Rendimiento por Cohorte")
         self.cohort_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
 
-        self.refresh_cohort_analysis()
+        # Pruebas de permutación entre pares de grupos
+        tests_frame = ttk_bs.LabelFrame(comp_frame, text="Comparación de Medias (prueba de permutación)")
+        tests_frame.pack(fill=X, padx=5, pady=5)
+
+        columns = ('variable', 'grupo_a', 'grupo_b', 'diferencia_medias', 'd_cohen', 'efecto',
+                   'p_valor', 'p_ajustado', 'significativa')
+        headings = ('Variable', 'Grupo A', 'Grupo B', 'Diferencia de medias', 'd de Cohen', 'Efecto',
+                    'p-valor', 'p ajustado (Holm)', 'Significativa')
+        self.tests_table = ttk_bs.Treeview(tests_frame, columns=columns, show='headings', height=5)
+        for column, heading in zip(columns, headings):
+            self.tests_table.heading(column, text=heading)
+            self.tests_table.column(column, width=110, anchor=CENTER)
+        self.tests_table.pack(fill=X, padx=5, pady=5)
+
+    def setup_similarity_tab(self):
+        """Configura la pestaña de pares con respuestas similares"""
+        pairs_frame = ttk_bs.LabelFrame(self.tab_similarity, text="Pares con Respuestas Incorrectas Idénticas")
+        pairs_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
+
+        controls = ttk_bs.Frame(pairs_frame)
+        controls.pack(fill=X, padx=5, pady=5)
+        self.similarity_label = ttk_bs.Label(controls, text="Pares marcados: -")
+        self.similarity_label.pack(side=LEFT, padx=5)
+        ttk_bs.Button(controls, text="Exportar CSV...", command=self.export_similarity,
+                      bootstyle=SUCCESS).pack(side=RIGHT, padx=5)
+
+        columns = ('examen', 'codigo_a', 'nombre_a', 'codigo_b', 'nombre_b', 'incorrectas_identicas',
+                   'esperadas', 'respuestas_identicas', 'z', 'p_valor', 'p_ajustado', 'marcado')
+        headings = ('Examen', 'Código A', 'Estudiante A', 'Código B', 'Estudiante B', 'Incorrectas idénticas',
+                    'Esperadas', 'Respuestas idénticas', 'z', 'p-valor', 'p ajustado', 'Marcado')
+        self.similarity_table = ttk_bs.Treeview(pairs_frame, columns=columns, show='headings')
+        for column, heading in zip(columns, headings):
+            self.similarity_table.heading(column, text=heading)
+            self.similarity_table.column(column, width=220 if column.startswith('nombre') else 110,
+                                         anchor=W if column.startswith(('nombre', 'codigo')) else CENTER)
+        self.similarity_table.pack(fill=BOTH, expand=True, padx=5, pady=5)
 
     def create_status_bar(self):
-        """Crea la barra de estado"""
-        self.status_bar = ttk_bs.Label(self.root, text="Listo", relief=SUNKEN, anchor=W)
-        self.status_bar.pack(side=BOTTOM, fill=X)
+        """Crea la barra de estado con progreso y cancelación de la carga"""
+        status_frame = ttk_bs.Frame(self.root)
+        status_frame.pack(side=BOTTOM, fill=X)
+
+        self.status_bar = ttk_bs.Label(status_frame, text="Listo", relief=SUNKEN, anchor=W)
+        self.status_bar.pack(side=LEFT, fill=X, expand=True)
+
+        self.cancel_button = ttk_bs.Button(status_frame, text="Cancelar",
+                                           command=self.cancel_load, bootstyle=(DANGER, OUTLINE))
+        self.progress_bar = ttk_bs.Progressbar(status_frame, length=200, maximum=100,
+                                               mode='determinate', bootstyle=INFO)
+
+    def create_filter_bar(self):
+        """Crea la barra de filtros por tipo de examen y año de ingreso (RF-023)"""
+        filter_frame = ttk_bs.Frame(self.root)
+        filter_frame.pack(side=BOTTOM, fill=X, padx=10, pady=(0, 5))
+
+        ttk_bs.Label(filter_frame, text="Filtros:", font=("Arial", 10, "bold")).pack(side=LEFT, padx=5)
+        self.filter_boxes = {}
+        for column, text in (('examen', "Examen:"), ('año_ingreso', "Cohorte:")):
+            ttk_bs.Label(filter_frame, text=text).pack(side=LEFT, padx=(10, 2))
+            box = ttk_bs.Combobox(filter_frame, values=[self.ALL_GROUPS], state='readonly', width=12)
+            box.set(self.ALL_GROUPS)
+            box.bind('<<ComboboxSelected>>', self.apply_filter)
+            box.pack(side=LEFT)
+            self.filter_boxes[column] = box
+
+        self.filter_label = ttk_bs.Label(filter_frame, text="")
+        self.filter_label.pack(side=LEFT, padx=15)
+
+    def update_filter_options(self):
+        """Actualiza los grupos disponibles en la barra de filtros con los datos cargados"""
+        groups = self.data_manager.groups
+        selected = self.data_manager.filter.selections()
+        for column, box in self.filter_boxes.items():
+            box.config(values=[self.ALL_GROUPS] + groups.labels(column))
+            box.set(selected[column][0] if column in selected else self.ALL_GROUPS)
+        self.update_filter_label()
+
+    def update_filter_label(self):
+        count = self.data_manager.filtered_count()
+        total = self.data_manager.total_count()
+        self.filter_label.config(text=f"{count:,} estudiantes" if count == total
+                                 else f"{count:,} de {total:,} estudiantes")
+
+    def apply_filter(self, event=None):
+        """Aplica los grupos elegidos a todas las estadísticas y gráficas"""
+        if not self.backend_ready or not self.data_manager.is_loaded:
+            for box in self.filter_boxes.values():
+                box.set(self.ALL_GROUPS)
+            return
+
+        from group_index import DataFilter
+        choices = {column: box.get() for column, box in self.filter_boxes.items()}
+        data_filter = DataFilter(*(None if choices[column] == self.ALL_GROUPS else (choices[column],)
+                                   for column in ('examen', 'año_ingreso')))
+        # Se comprueba sobre una vista para no cambiar el filtro compartido en vano
+        if not self.data_manager.with_filter(data_filter).filtered_count():
+            self.update_filter_options()
+            messagebox.showwarning("Advertencia", "Ningún estudiante cumple el filtro elegido")
+            return
+
+        self.data_manager.set_filter(data_filter)
+        self.update_filter_label()
+        self.status_bar.config(text=f"Filtro: {data_filter.describe()}")
+        # Cada pestaña se vuelve a dibujar al mostrarse (cambió state_key)
+        self.render_current_tab()
+
+    def show_progress(self, visible: bool):
+        """Muestra u oculta la barra de progreso y el botón de cancelar"""
+        if visible:
+            self.progress_bar['value'] = 0
+            self.cancel_button.pack(side=RIGHT, padx=5)
+            self.progress_bar.pack(side=RIGHT, padx=5)
+        else:
+            self.progress_bar.pack_forget()
+            self.cancel_button.pack_forget()
 
     def load_data(self):
-        """Carga los datos desde un archivo JSON"""
+        """Carga los datos desde un archivo JSON en un hilo de trabajo"""
+        if self.local_only("Cargar datos"):
+            return
         file_path = filedialog.askopenfilename(
             title="Seleccionar archivo de datos",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=[("JSON files", "*.json *.jsonl"), ("All files", "*.*")]
         )
 
         if file_path:
+            if self.load_task is not None and not self.load_task.finished:
+                self.load_task.cancel()
+
             self.status_bar.config(text="Cargando datos...")
-            self.root.update()
+            self.show_progress(True)
 
-            success, message = self.data_manager.load_data(file_path)
+            def work(task: BackgroundTask, path: str) -> 'LoadResult':
+                return self.data_manager.read_file(path, task.report_progress)
 
-            if success:
-                self.current_file.set(f"Archivo: {os.path.basename(file_path)}")
-                self.status_bar.config(text=message)
-                self.refresh_all()
-                messagebox.showinfo("Éxito", message)
+            self.load_task = self.scheduler.submit(
+                'cargar', work, file_path,
+                on_done=lambda result: self.on_load_finished(file_path, result),
+                on_error=self.on_load_error,
+                on_progress=self.on_load_progress,
+                on_cancel=self.on_load_cancelled)
+
+    def append_data(self):
+        """Agrega los registros nuevos de un archivo a los datos cargados"""
+        if self.local_only("Agregar un lote"):
+            return
+        if not self.backend_ready or not self.data_manager.is_loaded:
+            messagebox.showwarning("Advertencia", "Primero cargue un archivo de datos")
+            return
+        if self.load_task is not None and not self.load_task.finished:
+            messagebox.showwarning("Advertencia", "Espere a que termine la carga en curso")
+            return
+
+        file_path = filedialog.askopenfilename(
+            title="Seleccionar lote de resultados",
+            filetypes=[("JSON files", "*.json *.jsonl"), ("All files", "*.*")]
+        )
+
+        if file_path:
+            self.status_bar.config(text="Agregando lote...")
+            self.show_progress(True)
+
+            def work(task: BackgroundTask, path: str) -> 'AppendResult':
+                return self.data_manager.read_append(path, task.report_progress)
+
+            self.load_task = self.scheduler.submit(
+                'agregar', work, file_path,
+                on_done=lambda result: self.on_append_finished(file_path, result),
+                on_error=self.on_load_error,
+                on_progress=self.on_load_progress,
+                on_cancel=self.on_load_cancelled)
+
+    def on_append_finished(self, file_path: str, result: 'AppendResult'):
+        """Aplica el lote (en el hilo de Tk) y actualiza las vistas"""
+        self.show_progress(False)
+        if not result.success:
+            self.status_bar.config(text="No se agregó el lote")
+            messagebox.showwarning("Advertencia", result.message)
+        elif not self.data_manager.apply_append(result):
+            self.status_bar.config(text="No se agregó el lote")
+            messagebox.showwarning("Advertencia", "Los datos cambiaron mientras se leía el lote; intente de nuevo")
+        else:
+            self.status_bar.config(text=f"{result.message} desde {os.path.basename(file_path)} - "
+                                        f"{len(self.data_manager.df):,} registros en total")
+            self.update_filter_options()
+            self.refresh_all()
+            self.refresh_validation()
+            self.scheduler.submit('indice', lambda task: self.data_manager.get_search_index())
+
+    def cancel_load(self):
+        """Cancela la carga en curso"""
+        if self.load_task is not None and not self.load_task.finished:
+            self.load_task.cancel()
+            self.status_bar.config(text="Cancelando carga...")
+
+    def on_load_progress(self, progress: 'LoadProgress'):
+        """Muestra el avance de la carga y el resumen parcial"""
+        self.progress_bar['value'] = progress.fraction * 100
+        text = (f"Cargando datos... {progress.fraction:.0%} - "
+                f"{progress.records:,} registros")
+        if progress.records:
+            text += f" - promedio parcial {progress.summary['nota_promedio']:.2f}"
+        if progress.errors:
+            text += f" - {progress.errors:,} con errores"
+        self.status_bar.config(text=text)
+
+    def on_load_finished(self, file_path: str, result: 'LoadResult'):
+        """Aplica los datos leídos (en el hilo de Tk) y actualiza las vistas"""
+        self.show_progress(False)
+        if result.success:
+            self.data_manager.apply_load(result)
+            self.current_file.set(f"Archivo: {os.path.basename(file_path)}")
+            self.loaded_path = file_path
+            self.status_bar.config(text=result.message)
+            self.update_filter_options()
+            self.refresh_all()
+            self.refresh_validation()
+            # Construir el índice de búsqueda en segundo plano
+            self.scheduler.submit('indice', lambda task: self.data_manager.get_search_index())
+            validation = result.validation
+            if validation is not None and len(validation):
+                messagebox.showwarning("Datos cargados", f"{result.message}\n{validation.message()}\n"
+                                       "Use \"Validación\" para ver el detalle.")
             else:
-                self.status_bar.config(text="Error al cargar datos")
-                messagebox.showerror("Error", message)
+                messagebox.showinfo("Éxito", result.message)
+        else:
+            self.status_bar.config(text="Error al cargar datos")
+            messagebox.showerror("Error", result.message)
+
+    def on_load_error(self, error: BaseException):
+        self.show_progress(False)
+        self.status_bar.config(text="Error al cargar datos")
+        messagebox.showerror("Error", f"Error inesperado: {str(error)}")
+
+    def on_load_cancelled(self):
+        self.show_progress(False)
+        self.status_bar.config(text="Carga cancelada")
 
     def refresh_all(self):
-        """Actualiza todas las visualizaciones"""
-        self.refresh_summary()
-        self.refresh_histogram()
-        self.refresh_boxplot()
-        self.refresh_questions_chart()
-        self.refresh_cohort_analysis()
+        """Actualiza las visualizaciones
+
+        Todas las pestañas quedan marcadas para volver a dibujarse; solo la
+        pestaña visible se dibuja ahora, las demás al seleccionarlas.
+        """
+        self.rendered_state.clear()
+        self.render_current_tab()
+
+    def render_current_tab(self):
+        """Dibuja la pestaña visible si los datos cambiaron desde su último dibujo
+
+        Los datos de sus vistas se calculan en un hilo de trabajo sobre una
+        vista fija del gestor (with_filter), de modo que corresponden al
+        estado registrado aunque el filtro cambie durante el cálculo; las
+        vistas se dibujan al recibir el resultado.
+        """
+        if not self.backend_ready:
+            return
+        tab = self.notebook.index(self.notebook.select())
+        views = self.TAB_VIEWS[tab]
+        snapshot = self.data_manager.with_filter(self.data_manager.filter)
+        state = snapshot.state_key()
+        if not views or self.rendered_state.get(tab) == state:
+            return
+
+        pending = self.render_tasks.get(tab)
+        if pending is not None and not pending.finished:
+            pending.cancel()
+
+        def work(task: BackgroundTask) -> Dict:
+            results = {}
+            for name in views:
+                task.check_cancelled()
+                with profiler.span(f'preparar:{name}', 'vista'):
+                    results[name] = self.compute_view(name, snapshot)
+            return results
+
+        def done(results: Dict):
+            if self.data_manager.state_key() != state:
+                # Resultado de un estado anterior: ya hay otro cálculo en curso
+                return
+            for name, data in results.items():
+                with profiler.span(f'vista:{name}', 'vista'):
+                    self.draw_view(name, data)
+            self.rendered_state[tab] = state
+
+        self.render_tasks[tab] = self.scheduler.submit(f'pestaña {tab}', work, on_done=done,
+                                                       on_error=self.on_refresh_error)
+
+    def compute_view(self, name: str, data_manager: Optional['DataManager'] = None) -> Optional[object]:
+        """Calcula los datos de una vista (se ejecuta en un hilo de trabajo)
+
+        data_manager es la vista fija de los datos sobre la que se calcula
+        (por defecto, el gestor compartido).
+        """
+        data_manager = data_manager or self.data_manager
+        if name == 'stats':
+            return self.stats_panel.compute_stats(data_manager)
+        if name == 'items':
+            return self.compute_items_table(data_manager)
+        if name == 'similarity':
+            return data_manager.get_similarity()
+        if name == 'mean_tests':
+            return {column: data_manager.get_comparisons(column).tests
+                    for column in self.COMPARISON_COLUMNS}
+        return getattr(self.viz_engine.for_view(data_manager), f'prepare_{name}')()
+
+    def draw_view(self, name: str, data):
+        """Dibuja una vista con sus datos precalculados (hilo de Tk)"""
+        if name == 'stats':
+            self.stats_panel.update_stats(data)
+        elif name == 'histogram':
+            self.refresh_histogram(data)
+        elif name == 'boxplot':
+            self.refresh_boxplot(data)
+        elif name == 'questions':
+            self.refresh_questions_chart(data)
+        elif name == 'distractors':
+            self.refresh_distractors_chart(data)
+        elif name == 'items':
+            self.refresh_items_table(data)
+        elif name == 'cohort':
+            self.refresh_cohort_analysis(data)
+        elif name == 'similarity':
+            self.refresh_similarity_table(data)
+        elif name == 'icc':
+            self.refresh_icc(data)
+        elif name == 'mean_tests':
+            self.refresh_tests_table(data)
+
+    def on_refresh_error(self, error: BaseException):
+        self.status_bar.config(text="Error al actualizar las vistas")
+        messagebox.showerror("Error", f"Error al calcular estadísticas: {str(error)}")
 
     def refresh_summary(self):
         """Actualiza el panel de resumen"""
         self.stats_panel.update_stats()
 
-    def refresh_histogram(self):
+    def refresh_histogram(self, data: Optional[Dict] = None):
         """Actualiza el histograma de notas"""
-        for widget in self.hist_frame.winfo_children():
-            widget.destroy()
+        self.update_chart_view('histogram', self.hist_frame, data)
 
-        canvas = self.viz_engine.create_histogram_notas(self.hist_frame)
-        canvas.get_tk_widget().pack(fill=BOTH, expand=True)
-        canvas.draw()
+    def refresh_icc(self, data: Optional[Dict] = None):
+        """Actualiza las curvas características de las preguntas"""
+        self.update_chart_view('icc', self.icc_frame, data)
 
-    def refresh_boxplot(self):
+    def refresh_boxplot(self, data: Optional[Dict] = None):
         """Actualiza el boxplot de comparación"""
-        for widget in self.boxplot_frame.winfo_children():
-            widget.destroy()
+        self.update_chart_view('boxplot', self.boxplot_frame, data)
 
-        canvas = self.viz_engine.create_boxplot_exams(self.boxplot_frame)
-        canvas.get_tk_widget().pack(fill=BOTH, expand=True)
-        canvas.draw()
-
-    def refresh_questions_chart(self):
+    def refresh_questions_chart(self, data: Optional[Dict] = None):
         """Actualiza el gráfico de análisis por pregunta"""
-        for widget in self.questions_frame.winfo_children():
-            widget.destroy()
-
-        canvas = self.viz_engine.create_questions_difficulty(self.questions_frame)
-        canvas.get_tk_widget().pack(fill=BOTH, expand=True)
-        canvas.draw()
+        self.update_chart_view('questions', self.questions_frame, data)
+
+    def refresh_distractors_chart(self, data: Optional[Dict] = None):
+        """Actualiza el gráfico de respuestas por opción"""
+        self.update_chart_view('distractors', self.distractors_frame, data)
+
+    def compute_items_table(self, data_manager: Optional['DataManager'] = None) -> Optional[Dict]:
+        """Reúne los indicadores por pregunta y los distractores no funcionales"""
+        data_manager = data_manager or self.data_manager
+        report = data_manager.get_item_report()
+        if report is None:
+            return None
+
+        reasons = {row.pregunta: [row.motivo] for row in report.items.itertuples(index=False)
+                   if row.problematica}
+        options = data_manager.get_distractor_analysis().options
+        for row in options[options['no_funcional']].itertuples(index=False):
+            reasons.setdefault(row.pregunta, []).append(f"Distractor {row.opcion}: {row.motivo}")
+
+        items = report.items.set_index('pregunta')
+        rows = [(question, items.loc[question], '; '.join(texts))
+                for question, texts in reasons.items()]
+        # Mantener el orden de las preguntas del examen
+        order = {question: i for i, question in enumerate(report.items['pregunta'])}
+        rows.sort(key=lambda row: order[row[0]])
+        return {'report': report, 'rows': rows}
+
+    def refresh_items_table(self, data: Optional[Dict] = None):
+        """Actualiza la tabla de preguntas problemáticas"""
+        if data is None:
+            data = self.compute_items_table()
+
+        self.items_table.delete(*self.items_table.get_children())
+        if data is None:
+            self.reliability_label.config(text="Confiabilidad (KR-20): -")
+            return
 
-    def refresh_cohort_analysis(self):
-        """Actualiza el análisis por cohorte"""
-        for widget in self.cohort_frame.winfo_children():
-            widget.destroy()
+        report = data['report']
+        self.reliability_label.config(
+            text=f"Confiabilidad (KR-20): {report.reliability:.3f}   |   Estudiantes: {report.students:,}")
+        for question, item, reason in data['rows']:
+            self.items_table.insert('', END, values=(
+                question, f"{item['dificultad_p']:.2f}", f"{item['discriminacion']:.2f}",
+                f"{item['punto_biserial']:.2f}", f"{item['alfa_sin_item']:.3f}", reason))
+
+    def refresh_tests_table(self, data: Optional[Dict] = None):
+        """Actualiza la tabla de pruebas de diferencia de medias"""
+        self.tests_table.delete(*self.tests_table.get_children())
+        for column, tests in (data or {}).items():
+            for row in tests.itertuples(index=False):
+                self.tests_table.insert('', END, values=(
+                    self.COMPARISON_COLUMNS[column], row.grupo_a, row.grupo_b,
+                    f"{row.diferencia_medias:+.2f}", f"{row.d_cohen:.2f}", row.efecto,
+                    f"{row.p_valor:.4f}", f"{row.p_ajustado:.4f}", "Sí" if row.significativa else "No"))
+
+    def refresh_similarity_table(self, report: Optional['SimilarityReport'] = None):
+        """Actualiza la tabla de pares con respuestas similares"""
+        self.similarity_table.delete(*self.similarity_table.get_children())
+        if report is None:
+            self.similarity_label.config(text="Pares marcados: -")
+            return
 
-        canvas = self.viz_engine.create_performance_by_cohort(self.cohort_frame)
-        canvas.get_tk_widget().pack(fill=BOTH, expand=True)
-        canvas.draw()
+        text = (f"Pares marcados: {report.flagged_pairs:,} de {report.compared_pairs:,} comparados "
+                f"(Benjamini-Hochberg, tasa de falsos descubrimientos α = {report.alpha:g})")
+        if len(report.pairs) > self.MAX_SIMILAR_PAIRS:
+            text += f"; se muestran los {self.MAX_SIMILAR_PAIRS:,} de mayor z"
+        self.similarity_label.config(text=text)
+        for row in report.pairs.head(self.MAX_SIMILAR_PAIRS).itertuples(index=False):
+            self.similarity_table.insert('', END, values=(
+                row.examen, row.codigo_a, row.nombre_a, row.codigo_b, row.nombre_b,
+                row.incorrectas_identicas, f"{row.esperadas:.1f}",
+                f"{row.respuestas_identicas}/{row.preguntas}", f"{row.z:.2f}", f"{row.p_valor:.1e}",
+                f"{row.p_ajustado:.1e}", "Sí" if row.marcado else "No"))
+
+    def export_similarity(self):
+        """Guarda en CSV los pares del reporte (marcados y de mayor z)"""
+        if not self.backend_ready or not self.data_manager.is_loaded:
+            messagebox.showwarning("Advertencia", "No hay datos cargados")
+            return
+        file_path = filedialog.asksaveasfilename(
+            title="Exportar pares similares",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                # Resultado ya calculado al mostrar la pestaña (caché)
+                self.data_manager.get_similarity().pairs.to_csv(file_path, index=False, encoding='utf-8')
+                messagebox.showinfo("Éxito", f"Reporte guardado en: {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Error al guardar: {str(e)}")
 
-    def search_student(self):
-        """Busca y muestra información de un estudiante específico"""
-        if not self.data_manager.is_loaded:
-            messagebox.showwarning("Advertencia", "Debe cargar datos primero")
+    def refresh_cohort_analysis(self, data: Optional[Dict] = None):
+        """Actualiza el análisis por cohorte"""
+        self.update_chart_view('cohort', self.cohort_frame, data)
+
+    def update_chart_view(self, name: str, parent_frame, data: Optional[Dict] = None):
+        """Actualiza en el lugar la gráfica persistente (la crea la primera vez)"""
+        if data is None:
+            data = getattr(self.viz_engine, f'prepare_{name}')()
+
+        view = self.chart_views.get(name)
+        if view is None:
+            from chart_view import ChartView
+            view = ChartView(parent_frame, self.viz_engine.new_chart(name), name)
+            self.chart_views[name] = view
+        view.refresh(self.viz_engine.update_chart(view.chart, name, data))
+
+    def schedule_search(self, event=None):
+        """Programa la búsqueda tras una breve pausa en la escritura"""
+        if event is not None and event.keysym == 'Return':
+            return
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(
+            self.SEARCH_DELAY_MS, lambda: self.search_student(interactive=False))
+
+    def search_student(self, offset: int = 0, interactive: bool = True):
+        """Busca y muestra información de un estudiante específico
+
+        Usa el índice de búsqueda del DataManager y muestra los resultados
+        por páginas. Si el índice aún no existe, se construye en un hilo de
+        trabajo y la búsqueda se repite al terminar.
+        """
+        self.search_after_id = None
+        if not self.backend_ready or not self.data_manager.is_loaded:
+            if interactive:
+                messagebox.showwarning("Advertencia", "Debe cargar datos primero")
             return
 
         search_term = self.student_search.get().strip()
         if not search_term:
-            messagebox.showwarning("Advertencia", "Ingrese un término de búsqueda")
+            if interactive:
+                messagebox.showwarning("Advertencia", "Ingrese un término de búsqueda")
             return
 
-        # Buscar estudiante
-        df = self.data_manager.df
-        mask = (df['codigo'].astype(str).str.contains(search_term, case=False) |
-                df['apellidos_nombres'].str.contains(search_term, case=False))
+        if not self.data_manager.has_search_index():
+            self.show_student_message("Preparando índice de búsqueda...")
+            self.scheduler.submit('indice', lambda task: self.data_manager.get_search_index(),
+                                  on_done=lambda index: self.search_student(offset, interactive=False),
+                                  on_error=self.on_refresh_error)
+            return
 
-        results = df[mask]
+        # Buscar estudiante
+        from search_index import DEFAULT_PAGE_SIZE
+        results, result = self.data_manager.search_students(search_term, offset, DEFAULT_PAGE_SIZE)
 
         # Limpiar frame de resultados
         for widget in self.student_results_frame.winfo_children():
@@ -579,10 +1134,32 @@ class ExamAnalyticsApp:
             ttk_bs.Label(self.student_results_frame,
                          text="No se encontraron estudiantes",
                          font=("Arial", 12)).pack(pady=20)
-        else:
-            # Mostrar resultados
-            for _, student in results.iterrows():
-                self.create_student_card(student)
+            return
+
+        # Mostrar resultados
+        for _, student in results.iterrows():
+            self.create_student_card(student)
+
+        # Paginación
+        pager = ttk_bs.Frame(self.student_results_frame)
+        pager.pack(fill=X, padx=5, pady=5)
+        ttk_bs.Label(pager, text=f"Mostrando {offset + 1}-{offset + len(results)} de {result.total:,}"
+                     ).pack(side=LEFT, padx=5)
+        if result.has_more:
+            ttk_bs.Button(pager, text="Siguiente ▶", bootstyle=(SECONDARY, OUTLINE),
+                          command=lambda: self.search_student(offset + DEFAULT_PAGE_SIZE)
+                          ).pack(side=RIGHT, padx=5)
+        if offset > 0:
+            ttk_bs.Button(pager, text="◀ Anterior", bootstyle=(SECONDARY, OUTLINE),
+                          command=lambda: self.search_student(max(offset - DEFAULT_PAGE_SIZE, 0))
+                          ).pack(side=RIGHT, padx=5)
+
+    def show_student_message(self, text: str):
+        """Reemplaza los resultados de búsqueda por un mensaje"""
+        for widget in self.student_results_frame.winfo_children():
+            widget.destroy()
+        ttk_bs.Label(self.student_results_frame, text=text,
+                     font=("Arial", 12)).pack(pady=20)
 
     def create_student_card(self, student_data):
         """Crea una tarjeta con información del estudiante"""
@@ -602,7 +1179,7 @@ class ExamAnalyticsApp:
                                       f"Incorrectas: {student_data['incorrectas']}").pack(anchor=W)
 
         # Comparación con promedio
-        avg_score = self.data_manager.df['nota'].mean()
+        avg_score = self.data_manager.get_summary()['nota_promedio']
         diff = student_data['nota'] - avg_score
         comparison_text = f"Diferencia con promedio: {diff:+.2f}"
         color = "success" if diff >= 0 else "danger"
@@ -610,14 +1187,47 @@ class ExamAnalyticsApp:
         ttk_bs.Label(info_frame, text=comparison_text,
                      bootstyle=color).pack(anchor=W)
 
+    def show_validation(self):
+        """Abre la ventana con el reporte de validación (o la trae al frente)"""
+        if self.local_only("La validación"):
+            return
+        if not self.backend_ready or not self.data_manager.is_loaded:
+            messagebox.showwarning("Advertencia", "No hay datos cargados")
+            return
+        if self.validation_window is not None and self.validation_window.window.winfo_exists():
+            self.validation_window.window.lift()
+            return
+        self.validation_window = ValidationWindow(self.root, self.data_manager)
+
+    def refresh_validation(self):
+        """Actualiza la ventana de validación si está abierta"""
+        if self.validation_window is not None and self.validation_window.window.winfo_exists():
+            self.validation_window.refresh()
+
+    def show_diagnostics(self):
+        """Abre la ventana de diagnóstico (o la trae al frente)"""
+        if self.diagnostics is not None and self.diagnostics.window.winfo_exists():
+            self.diagnostics.window.lift()
+            return
+        self.diagnostics = DiagnosticsWindow(self.root)
+
     def export_current_chart(self):
-        """Exporta la gráfica actual"""
-        if not self.data_manager.is_loaded:
+        """Exporta las gráficas de la pestaña actual
+
+        En PDF, una página por gráfica; en PNG, un archivo por gráfica (con el
+        nombre de la gráfica como sufijo si la pestaña tiene varias).
+        """
+        if not self.backend_ready or not self.data_manager.is_loaded:
             messagebox.showwarning("Advertencia", "No hay datos cargados")
             return
 
         current_tab = self.notebook.index(self.notebook.select())
-        tab_names = ["resumen", "distribuciones", "preguntas", "estudiantes", "comparaciones"]
+        views = [(name, self.chart_views[name]) for name in self.TAB_VIEWS[current_tab]
+                 if name in self.chart_views]
+        if not views:
+            messagebox.showinfo("Info", "La pestaña actual no tiene gráficas exportables.\n"
+                                "Use \"Reporte PDF\" para exportar el análisis completo.")
+            return
 
         file_path = filedialog.asksaveasfilename(
             title="Guardar gráfica",
@@ -627,44 +1237,98 @@ class ExamAnalyticsApp:
 
         if file_path:
             try:
-                # Obtener la figura actual basada en la pestaña
-                if current_tab == 1:  # Distribuciones
-                    canvas = list(self.hist_frame.winfo_children())[0]
-                elif current_tab == 2:  # Preguntas
-                    canvas = list(self.questions_frame.winfo_children())[0]
-                elif current_tab == 4:  # Comparaciones
-                    canvas = list(self.boxplot_frame.winfo_children())[0]
+                root, extension = os.path.splitext(file_path)
+                if extension.lower() == '.pdf':
+                    from matplotlib.backends.backend_pdf import PdfPages
+                    with PdfPages(file_path) as pdf:
+                        for _, view in views:
+                            pdf.savefig(view.chart.figure, bbox_inches='tight')
+                    paths = [file_path]
                 else:
-                    messagebox.showinfo("Info", "La pestaña actual no tiene gráficas exportables")
-                    return
-
-                canvas.figure.savefig(file_path, dpi=300, bbox_inches='tight')
-                messagebox.showinfo("Éxito", f"Gráfica guardada en: {file_path}")
+                    paths = [file_path if len(views) == 1 else f"{root}_{name}{extension}" for name, _ in views]
+                    for path, (_, view) in zip(paths, views):
+                        view.chart.figure.savefig(path, dpi=300, bbox_inches='tight')
+                messagebox.showinfo("Éxito", "Gráficas guardadas en:\n" + "\n".join(paths))
 
             except Exception as e:
                 messagebox.showerror("Error", f"Error al guardar: {str(e)}")
 
+    def export_report(self):
+        """Genera el reporte PDF completo del filtro activo en segundo plano"""
+        if self.local_only("El reporte PDF"):
+            return
+        if not self.backend_ready or not self.data_manager.is_loaded:
+            messagebox.showwarning("Advertencia", "No hay datos cargados")
+            return
+        if self.report_task is not None and not self.report_task.finished:
+            messagebox.showinfo("Info", "Ya se está generando un reporte")
+            return
+
+        file_path = filedialog.asksaveasfilename(
+            title="Guardar reporte PDF",
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")]
+        )
+
+        if file_path:
+            from report import ReportSection, generate_reports
+            # El filtro se fija al pedir el reporte
+            data_filter = self.data_manager.filter
+            sections = [ReportSection(data_filter.describe(), data_filter, file_path)]
+
+            def work(task: BackgroundTask) -> List[str]:
+                return generate_reports(self.data_manager, sections, self.loaded_path or '',
+                                        progress=task.report_progress)
+
+            self.status_bar.config(text="Generando reporte PDF...")
+            self.report_task = self.scheduler.submit(
+                'reporte', work,
+                on_done=self.on_report_finished,
+                on_error=self.on_report_error,
+                on_progress=lambda text: self.status_bar.config(text=f"Reporte PDF: {text}"))
+
+    def on_report_finished(self, paths: List[str]):
+        self.status_bar.config(text="Reporte PDF generado")
+        messagebox.showinfo("Éxito", f"Reporte guardado en: {paths[0]}")
+
+    def on_report_error(self, error: BaseException):
+        self.status_bar.config(text="Error al generar el reporte")
+        messagebox.showerror("Error", f"Error al generar el reporte: {error}")
+
     def run(self):
         """Ejecuta la aplicación"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.scheduler.shutdown()
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='main.py', description="ExamAnalytics Desktop")
+    parser.add_argument('--servidor', metavar='URL',
+                        help="Usa la aplicación como cliente del servicio local (server.py), "
+                             "por ejemplo http://127.0.0.1:8765")
+    parser.add_argument('--conjunto', metavar='NOMBRE',
+                        help="Conjunto de datos del servicio (por defecto, el único cargado)")
+    return parser.parse_args(argv)
 
 
 def main():
     """Función principal"""
+    args = parse_args()
     try:
-        # Verificar dependencias
-        import ttkbootstrap
-        import pandas
-        import numpy
-        import matplotlib.pyplot
-        import seaborn
+        # Verificar dependencias sin importarlas (se importan en segundo plano)
+        missing = [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+        if missing:
+            raise ImportError(f"No se encontraron los módulos: {', '.join(missing)}")
         # Crear y ejecutar aplicacion
-        app = ExamAnalyticsApp()
+        app = ExamAnalyticsApp(args.servidor, args.conjunto)
         app.run()
     except ImportError as e:
         print("Error: Faltan dependencias requeridas.")
         print("Por favor instale las siguientes librerías:")
-        print("pip install ttkbootstrap pandas matplotlib seaborn numpy")
+        print("pip install ttkbootstrap pandas matplotlib numpy")
         print(f"\nError específico: {e}")
         input("Presione Enter para salir...")
     except Exception as e:
@@ -0,0 +1,281 @@
+"""
+Instrumentación de los pasos costosos (perfil de ejecución)
+
+El perfilador registra intervalos de tiempo (spans) con nombre y categoría
+alrededor de la carga, lectura, validación, cálculos, construcción de
+figuras y dibujo del canvas. Se activa y desactiva en tiempo de ejecución;
+desactivado, span() retorna un contexto vacío compartido y el costo es una
+comparación por llamada.
+
+Opcionalmente mide memoria con tracemalloc: un hilo toma muestras
+periódicas de la memoria asignada y del pico desde la muestra anterior.
+
+La traza se exporta en el formato Trace Event de Chrome (JSON), que se
+abre en chrome://tracing o https://ui.perfetto.dev, para adjuntarla a un
+reporte de problema. Activación:
+    - en la interfaz: ventana Diagnóstico
+    - desde la línea de comandos: cli.py --perfil traza.json
+    - con la variable de entorno EXAMANALYTICS_PROFILE=1
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# Intervalo de muestreo de memoria (s)
+MEMORY_SAMPLE_INTERVAL = 0.05
+
+# Máximo de eventos conservados (los más antiguos se descartan)
+MAX_EVENTS = 200_000
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class SpanEvent(NamedTuple):
+    """Intervalo registrado (tiempos en ns desde el inicio del perfilador)"""
+    name: str
+    category: str
+    start: int
+    duration: int
+    thread: int
+    args: Optional[Dict]
+
+
+class MemorySample(NamedTuple):
+    """Muestra de memoria asignada (bytes) según tracemalloc"""
+    time: int
+    current: int
+    peak: int
+
+
+class SpanStats(NamedTuple):
+    """Resumen de los intervalos con un mismo nombre (tiempos en s)"""
+    name: str
+    category: str
+    count: int
+    total: float
+    mean: float
+    maximum: float
+
+
+class Profiler:
+    """Registro de intervalos de tiempo y muestras de memoria"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._events: List[SpanEvent] = []
+        self._samples: List[MemorySample] = []
+        self._thread_names: Dict[int, str] = {}
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampler = threading.Event()
+
+    # Activación
+
+    def enable(self, memory: bool = False):
+        """Activa el registro; con memory=True también muestrea la memoria"""
+        self.enabled = True
+        if memory:
+            self.start_memory_sampling()
+
+    def disable(self):
+        self.enabled = False
+        self.stop_memory_sampling()
+
+    @property
+    def memory_enabled(self) -> bool:
+        return self._sampler is not None
+
+    def start_memory_sampling(self, interval: float = MEMORY_SAMPLE_INTERVAL):
+        """Inicia tracemalloc y el hilo de muestreo"""
+        if self._sampler is not None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._stop_sampler.clear()
+        self._sampler = threading.Thread(target=self._sample_memory, args=(interval,),
+                                         name='perfil-memoria', daemon=True)
+        self._sampler.start()
+
+    def stop_memory_sampling(self):
+        if self._sampler is None:
+            return
+        self._stop_sampler.set()
+        self._sampler.join()
+        self._sampler = None
+        tracemalloc.stop()
+
+    def _sample_memory(self, interval: float):
+        while not self._stop_sampler.wait(interval):
+            current, peak = tracemalloc.get_traced_memory()
+            # El pico se reinicia para que cada muestra cubra solo su intervalo
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            with self._lock:
+                self._samples.append(MemorySample(self._now(), current, peak))
+
+    # Registro
+
+    def _now(self) -> int:
+        return time.perf_counter_ns() - self._origin
+
+    def span(self, name: str, category: str = 'general', **args):
+        """Contexto que registra la duración de un bloque (vacío si está desactivado)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, category, args or None)
+
+    @contextlib.contextmanager
+    def _span(self, name: str, category: str, args: Optional[Dict]):
+        start = self._now()
+        try:
+            yield args
+        finally:
+            self.add_event(name, category, start, self._now() - start, args)
+
+    def add_event(self, name: str, category: str, start: int, duration: int,
+                  args: Optional[Dict] = None):
+        """Registra un intervalo ya medido"""
+        thread = threading.current_thread()
+        with self._lock:
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self._events.append(SpanEvent(name, category, start, duration, thread.ident, args))
+            if len(self._events) > MAX_EVENTS:
+                del self._events[:len(self._events) - MAX_EVENTS]
+
+    def phases(self, category: str) -> 'PhaseTimer':
+        """Acumulador de fases intercaladas (ver PhaseTimer)"""
+        return PhaseTimer(self, category)
+
+    def clear(self):
+        """Descarta los eventos y muestras registrados"""
+        with self._lock:
+            self._events = []
+            self._samples = []
+
+    # Consulta y exportación
+
+    def events(self) -> List[SpanEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def memory_samples(self) -> List[MemorySample]:
+        with self._lock:
+            return list(self._samples)
+
+    def summary(self) -> List[SpanStats]:
+        """Intervalos agrupados por nombre, ordenados por tiempo total"""
+        groups: Dict[str, List] = {}
+        for event in self.events():
+            group = groups.setdefault(event.name, [event.category, 0, 0, 0])
+            group[1] += 1
+            group[2] += event.duration
+            group[3] = max(group[3], event.duration)
+        stats = [SpanStats(name, category, count, total / 1e9, total / count / 1e9, maximum / 1e9)
+                 for name, (category, count, total, maximum) in groups.items()]
+        return sorted(stats, key=lambda s: s.total, reverse=True)
+
+    def peak_memory(self) -> Optional[int]:
+        """Mayor pico de memoria muestreado (bytes)"""
+        samples = self.memory_samples()
+        return max(sample.peak for sample in samples) if samples else None
+
+    def chrome_trace(self) -> Dict:
+        """Traza en formato Trace Event de Chrome"""
+        pid = os.getpid()
+        trace = []
+        with self._lock:
+            thread_names = dict(self._thread_names)
+        for ident, name in thread_names.items():
+            trace.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': ident,
+                          'args': {'name': name}})
+        for event in self.events():
+            entry = {'name': event.name, 'cat': event.category, 'ph': 'X', 'pid': pid, 'tid': event.thread,
+                     'ts': event.start / 1000, 'dur': event.duration / 1000}
+            if event.args:
+                entry['args'] = {key: value if isinstance(value, (int, float, str, bool)) else str(value)
+                                 for key, value in event.args.items()}
+            trace.append(entry)
+        for sample in self.memory_samples():
+            trace.append({'name': 'memoria (MB)', 'ph': 'C', 'pid': pid, 'ts': sample.time / 1000,
+                          'args': {'actual': sample.current / 1024 ** 2, 'pico': sample.peak / 1024 ** 2}})
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str):
+        """Escribe la traza en un archivo JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+
+class PhaseTimer:
+    """Mide fases que se alternan registro por registro (p. ej. leer y validar)
+
+    Un intervalo por registro sería demasiado costoso: las duraciones se
+    acumulan por fase y emit() las registra una a continuación de otra desde
+    el inicio del bloque. Con el perfilador desactivado, iterate() y wrap()
+    retornan los objetos originales y no hay sobrecosto.
+    """
+
+    def __init__(self, profiler: Profiler, category: str):
+        self.profiler = profiler
+        self.category = category
+        self.active = profiler.enabled
+        self._totals: Dict[str, int] = {}
+        self._start = profiler._now()
+
+    def _add(self, name: str, duration: int):
+        self._totals[name] = self._totals.get(name, 0) + duration
+
+    def iterate(self, iterable, name: str):
+        """Iterador que acumula el tiempo de obtener cada elemento"""
+        if not self.active:
+            return iterable
+
+        def timed():
+            iterator = iter(iterable)
+            clock = time.perf_counter_ns
+            while True:
+                start = clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    self._add(name, clock() - start)
+                    return
+                self._add(name, clock() - start)
+                yield item
+        return timed()
+
+    def wrap(self, func: Callable, name: str) -> Callable:
+        """Función que acumula el tiempo de cada llamada"""
+        if not self.active:
+            return func
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._add(name, clock() - start)
+        return timed
+
+    def emit(self, **args):
+        """Registra las fases acumuladas del bloque y comienza otro"""
+        if not self.active:
+            return
+        start = self._start
+        for name, duration in self._totals.items():
+            self.profiler.add_event(name, self.category, start, duration, args or None)
+            start += duration
+        self._totals = {}
+        self._start = self.profiler._now()
+
+
+# Perfilador global de la aplicación
+profiler = Profiler(enabled=os.environ.get('EXAMANALYTICS_PROFILE', '') not in ('', '0'))
+
@@ -0,0 +1,216 @@
+"""
+Indicadores psicométricos por pregunta (RF-018, RF-019)
+
+Todas las métricas se calculan para todas las preguntas a la vez a partir
+de la matriz de aciertos estudiante×pregunta (ver item_analysis.score_matrix):
+    - Índice de discriminación D: proporción de acierto del 27% superior
+      menos la del 27% inferior, según el puntaje total.
+    - Correlación punto-biserial corregida: correlación entre el acierto en
+      la pregunta y el puntaje total sin esa pregunta.
+    - Confiabilidad KR-20 (alfa de Cronbach para ítems dicotómicos) y alfa
+      si se elimina cada pregunta.
+
+Las correlaciones corregidas se obtienen de las covarianzas con el puntaje
+total (un único producto matriz-vector), sin recorrer las preguntas. Si las
+versiones de examen tienen distintas preguntas, una máscara restringe cada
+métrica a los estudiantes que respondieron la pregunta.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Fracción de estudiantes en los grupos superior e inferior
+GROUP_FRACTION = 0.27
+
+# Umbrales para marcar preguntas problemáticas
+MIN_DISCRIMINATION = 0.2
+MIN_POINT_BISERIAL = 0.2
+MIN_DIFFICULTY = 0.1
+MAX_DIFFICULTY = 0.9
+
+
+class ItemReport(NamedTuple):
+    """Resultado del análisis psicométrico"""
+    items: pd.DataFrame     # una fila por pregunta
+    reliability: float      # KR-20 (promedio ponderado si hay varias formas)
+    students: int
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """División elemento a elemento que retorna NaN cuando el divisor es 0"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    result = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def discrimination_index(scores: np.ndarray, totals: np.ndarray, mask: Optional[np.ndarray] = None,
+                         fraction: float = GROUP_FRACTION) -> np.ndarray:
+    """Índice D de cada pregunta (grupo superior menos grupo inferior)
+
+    Con máscara, los grupos de cada pregunta se forman solo con los
+    estudiantes a quienes se les aplicó, ordenados por proporción de acierto.
+    """
+    n_students = scores.shape[0]
+    if mask is None:
+        group_size = int(np.ceil(n_students * fraction))
+        if n_students < 2 or group_size == 0:
+            return np.full(scores.shape[1], np.nan)
+        order = np.argsort(totals, kind='stable')
+        lower = scores[order[:group_size]].mean(axis=0)
+        upper = scores[order[-group_size:]].mean(axis=0)
+        return upper - lower
+
+    asked = mask.sum(axis=0)
+    group_size = np.ceil(asked * fraction).astype(np.int64)
+    order = np.argsort(_safe_divide(totals, mask.sum(axis=1)), kind='stable')
+    sorted_scores = scores[order]
+    # Posición de cada estudiante dentro de los que respondieron cada pregunta
+    position = np.cumsum(mask[order], axis=0, dtype=np.int32)
+    lower = (sorted_scores & (position <= group_size)).sum(axis=0)
+    upper = (sorted_scores & (position > asked - group_size)).sum(axis=0)
+    result = _safe_divide(upper - lower, group_size)
+    result[asked < 2] = np.nan
+    return result
+
+
+def kr20(scores: np.ndarray) -> float:
+    """Confiabilidad KR-20 de una matriz de aciertos (todas las preguntas aplicadas)"""
+    n_students, n_items = scores.shape
+    if n_items < 2 or n_students < 2:
+        return float('nan')
+    p = scores.mean(axis=0)
+    total_var = scores.sum(axis=1, dtype=np.int64).var()
+    if total_var <= 0:
+        return float('nan')
+    return float(n_items / (n_items - 1) * (1 - np.sum(p * (1 - p)) / total_var))
+
+
+def form_groups(mask: Optional[np.ndarray], n_students: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Formas de examen (conjuntos de preguntas) y la forma de cada estudiante"""
+    if mask is None:
+        return np.ones((1, 0), dtype=bool), np.zeros(n_students, dtype=np.int64)
+    # Cada fila se empaqueta en bytes para comparar formas como valores únicos
+    packed = np.ascontiguousarray(np.packbits(mask, axis=1))
+    rows = packed.view(np.dtype((np.void, packed.shape[1]))).reshape(-1)
+    _, first, form_index = np.unique(rows, return_index=True, return_inverse=True)
+    return mask[first], form_index.reshape(-1)
+
+
+def item_statistics(scores: np.ndarray, mask: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Dificultad, discriminación, punto-biserial corregida y alfa sin cada pregunta
+
+    mask indica qué preguntas se aplicaron a cada estudiante (None = todas).
+    Con varias formas de examen, el puntaje total se centra en la media de
+    la forma de cada estudiante y los momentos de cada pregunta se calculan
+    solo sobre quienes la respondieron (varianzas y covarianzas dentro de
+    cada forma). La confiabilidad es el KR-20 de cada forma ponderado por su
+    número de estudiantes. Sin máscara las fórmulas son las habituales.
+    """
+    n_students, n_items = scores.shape
+    totals = scores.sum(axis=1, dtype=np.int64)
+    if n_students == 0:
+        empty = np.full(n_items, np.nan)
+        return {'p': empty, 'discrimination': empty, 'point_biserial': empty,
+                'alpha_if_deleted': empty, 'alpha': float('nan')}
+
+    forms, form_index = form_groups(mask, n_students)
+    form_sizes = np.bincount(form_index, minlength=len(forms))
+    if mask is None:
+        asked = np.full(n_items, n_students)
+        lengths = np.full(n_students, n_items)
+    else:
+        asked = mask.sum(axis=0)
+        lengths = mask.sum(axis=1)
+        mask_values = mask.astype(np.float32)
+
+    p = _safe_divide(scores.sum(axis=0), asked)
+    item_var = p * (1 - p)
+
+    # Por estudiante: total centrado en su forma, su cuadrado, suma de
+    # varianzas de sus preguntas y número de preguntas; luego promedios por pregunta
+    form_means = np.bincount(form_index, weights=totals, minlength=len(forms)) / np.maximum(form_sizes, 1)
+    centered = totals - form_means[form_index]
+    if mask is None:
+        form_var = np.full(n_students, np.nansum(item_var))
+    else:
+        form_var = mask_values @ np.nan_to_num(item_var).astype(np.float32)
+    student_terms = np.column_stack([centered, centered ** 2, form_var, lengths])
+    if mask is None:
+        sums = np.broadcast_to(student_terms.sum(axis=0), (n_items, 4))
+    else:
+        sums = mask_values.T @ student_terms.astype(np.float32)
+    means = _safe_divide(sums, asked[:, None])
+    total_mean, total_var = means[:, 0], means[:, 1] - means[:, 0] ** 2
+    form_item_var, form_length = means[:, 2], means[:, 3]
+
+    # Covarianza de cada pregunta con el total: E[X·T] - p·E[T]
+    cross = scores.T.astype(np.float32) @ centered.astype(np.float32)
+    cov_total = _safe_divide(cross, asked) - p * total_mean
+
+    # Puntaje sin la pregunta j: T - X_j
+    rest_var = total_var + item_var - 2 * cov_total
+    cov_rest = cov_total - item_var
+    point_biserial = _safe_divide(cov_rest, np.sqrt(item_var * np.clip(rest_var, 0, None)))
+
+    alpha_if_deleted = np.where(
+        form_length > 2,
+        _safe_divide(form_length - 1, form_length - 2) * (1 - _safe_divide(form_item_var - item_var, rest_var)),
+        np.nan)
+
+    # KR-20 de cada forma, ponderado por su número de estudiantes
+    if mask is None:
+        alpha = kr20(scores)
+    else:
+        alphas = np.array([kr20(scores[form_index == f][:, forms[f]]) for f in range(len(forms))])
+        valid = ~np.isnan(alphas)
+        alpha = float(np.average(alphas[valid], weights=form_sizes[valid])) if valid.any() else float('nan')
+
+    return {
+        'p': p,
+        'discrimination': discrimination_index(scores, totals, mask),
+        'point_biserial': point_biserial,
+        'alpha_if_deleted': alpha_if_deleted,
+        'alpha': alpha
+    }
+
+
+def problem_reasons(stats: Dict[str, np.ndarray], alpha: float) -> List[str]:
+    """Motivos por los que cada pregunta se considera problemática ('' si ninguno)"""
+    checks = [
+        (stats['discrimination'] < 0, 'Discriminación negativa'),
+        ((stats['discrimination'] >= 0) & (stats['discrimination'] < MIN_DISCRIMINATION),
+         'Discriminación baja'),
+        (stats['point_biserial'] < MIN_POINT_BISERIAL, 'Correlación ítem-total baja'),
+        (stats['p'] > MAX_DIFFICULTY, 'Muy fácil'),
+        (stats['p'] < MIN_DIFFICULTY, 'Muy difícil'),
+        (stats['alpha_if_deleted'] > alpha, 'Reduce la confiabilidad')
+    ]
+    # Las comparaciones con NaN son falsas: sin datos no se marca la pregunta
+    return ['; '.join(text for mask, text in checks if mask[j]) for j in range(len(stats['p']))]
+
+
+def item_report(scores: np.ndarray, questions: Sequence[str],
+                mask: Optional[np.ndarray] = None) -> ItemReport:
+    """Tabla psicométrica de todas las preguntas
+
+    scores es la matriz booleana de aciertos estudiante×pregunta y mask la de
+    preguntas aplicadas (AnswerStore.asked_mask), o None si todas lo fueron.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats = item_statistics(scores, mask)
+        reasons = problem_reasons(stats, stats['alpha'])
+
+    items = pd.DataFrame({
+        'pregunta': list(questions),
+        'dificultad_p': stats['p'],
+        'discriminacion': stats['discrimination'],
+        'punto_biserial': stats['point_biserial'],
+        'alfa_sin_item': stats['alpha_if_deleted'],
+        'problematica': [bool(reason) for reason in reasons],
+        'motivo': reasons
+    })
+    return ItemReport(items, stats['alpha'], scores.shape[0])
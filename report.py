@@ -0,0 +1,414 @@
+"""
+Reporte PDF de varias páginas
+
+Un reporte por sección (todos los estudiantes del filtro, o uno por tipo de
+examen o por cohorte) con:
+    - portada con las tarjetas de resumen (las mismas del panel Resumen más
+      la confiabilidad KR-20)
+    - todas las gráficas de VisualizationEngine, una por página
+    - la tabla de indicadores por pregunta (psicometría)
+    - el ranking de estudiantes por nota
+
+El proceso principal calcula los datos de las gráficas (prepare_*) sección
+por sección y envía cada gráfica a un proceso de trabajo, que la dibuja
+fuera de pantalla con Agg y retorna un PNG. Las gráficas de una sección se
+dibujan mientras se calculan las de la siguiente. Al final, el proceso
+principal arma las páginas (A4 apaisado) con PdfPages: las gráficas quedan
+como imágenes y las portadas y tablas como texto vectorial.
+
+Uso:
+    python report.py resultados.json -o reporte.pdf
+    python report.py resultados.json -o reportes/ --por examen --procesos 4
+"""
+
+import argparse
+import io
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.image import imread
+from matplotlib.lines import Line2D
+from matplotlib.patches import FancyBboxPatch
+
+from data_manager import DataManager
+from group_index import DataFilter
+from irt import MODELS
+from visualization import VisualizationEngine
+
+# Gráficas del reporte, en orden
+REPORT_CHARTS = ('histogram', 'icc', 'questions', 'distractors', 'boxplot', 'cohort')
+
+# Resolución de las gráficas rasterizadas
+CHART_DPI = 150
+
+# Hoja A4 apaisada (pulgadas)
+PAGE_SIZE = (11.69, 8.27)
+
+# Filas por página de las tablas
+TABLE_ROWS_PER_PAGE = 30
+
+# Estudiantes del ranking
+RANKING_SIZE = 50
+
+# Largo máximo del texto de una celda
+MAX_CELL_CHARS = 55
+
+# Columnas por las que se generan reportes por sección
+SECTION_COLUMNS = {'examen': 'examen', 'cohorte': 'año_ingreso'}
+
+# Columnas de las tablas: (campo, encabezado, ancho relativo)
+ITEM_COLUMNS = [('pregunta', "Pregunta", 8), ('dificultad_p', "Dificultad p", 11),
+                ('discriminacion', "Discriminación", 12), ('punto_biserial', "Punto-biserial", 12),
+                ('alfa_sin_item', "KR-20 sin ítem", 12), ('problematica', "Problemática", 11),
+                ('motivo', "Motivo", 34)]
+
+RANKING_COLUMNS = [('puesto', "Puesto", 7), ('codigo', "Código", 12),
+                   ('apellidos_nombres', "Apellidos y nombres", 37), ('examen', "Examen", 8),
+                   ('año_ingreso', "Cohorte", 8), ('correctas', "Correctas", 9),
+                   ('incorrectas', "Incorrectas", 9), ('nota', "Nota", 10)]
+
+
+class ReportSection(NamedTuple):
+    """Un reporte a generar: título, estudiantes incluidos y archivo PDF"""
+    title: str
+    data_filter: DataFilter
+    path: str
+
+
+class _SectionContent(NamedTuple):
+    """Contenido de una sección calculado en el proceso principal"""
+    section: ReportSection
+    cards: List[Tuple[str, str]]
+    items: pd.DataFrame
+    ranking: pd.DataFrame
+    charts: List[Tuple[str, Future]]
+
+
+def format_question_counts(counts: Dict[str, int]) -> str:
+    """Número de preguntas por examen, como valor único o rango"""
+    if not counts:
+        return "0"
+    low, high = min(counts.values()), max(counts.values())
+    return str(low) if low == high else f"{low}-{high}"
+
+
+def summary_cards(data_manager: DataManager) -> Optional[List[Tuple[str, str]]]:
+    """Tarjetas de resumen (etiqueta, valor) del filtro activo"""
+    if not data_manager.is_loaded:
+        return None
+
+    summary = data_manager.get_summary()
+    percentiles = data_manager.get_percentiles()
+
+    return [
+        ("Total de Estudiantes", summary['total_estudiantes']),
+        ("Tipos de Examen", summary['tipos_examen']),
+        ("Preguntas", format_question_counts(summary['preguntas_por_examen'])),
+        ("Nota Promedio", f"{summary['nota_promedio']:.2f}"),
+        ("Nota Máxima", summary['nota_max']),
+        ("Nota Mínima", summary['nota_min']),
+        ("Desviación Estándar", f"{summary['std_nota']:.2f}"),
+        ("Percentil 25", f"{percentiles[0.25]:.2f}"),
+        ("Percentil 50 (Mediana)", f"{percentiles[0.50]:.2f}"),
+        ("Percentil 75", f"{percentiles[0.75]:.2f}"),
+        ("Percentil 90", f"{percentiles[0.90]:.2f}")
+    ]
+
+
+def student_ranking(data_manager: DataManager, size: int = RANKING_SIZE) -> pd.DataFrame:
+    """Los size estudiantes del filtro con mayor nota (empates por código)"""
+    rows = data_manager.filtered_rows()
+    df = data_manager.df if rows is None else data_manager.df.iloc[rows]
+    if size < len(df):
+        # Preselección sin ordenar todo: basta con las notas >= la size-ésima
+        notas = df['nota'].to_numpy()
+        cutoff = np.partition(notas, len(notas) - size)[len(notas) - size]
+        df = df[notas >= cutoff]
+    ranking = df.sort_values(['nota', 'codigo'], ascending=[False, True], kind='stable').head(size)
+    ranking = ranking.reset_index(drop=True)
+    ranking.insert(0, 'puesto', ranking['nota'].rank(method='min', ascending=False).astype(int))
+    return ranking
+
+
+def render_chart(name: str, data: Optional[Dict], dpi: int = CHART_DPI) -> bytes:
+    """Dibuja una gráfica fuera de pantalla y retorna el PNG (se ejecuta en un proceso de trabajo)"""
+    viz_engine = VisualizationEngine(DataManager())
+    chart = viz_engine.new_chart(name)
+    viz_engine.update_chart(chart, name, data)
+    chart.figure.tight_layout()
+    buffer = io.BytesIO()
+    chart.figure.savefig(buffer, format='png', dpi=dpi)
+    return buffer.getvalue()
+
+
+def report_sections(data_manager: DataManager, path: str, by: Optional[str] = None) -> List[ReportSection]:
+    """Secciones a generar dentro del filtro activo
+
+    Sin by, un solo reporte en path. Con by ('examen' o 'cohorte'), path es
+    un directorio y se genera un reporte por grupo.
+    """
+    base = data_manager.filter
+    if by is None:
+        return [ReportSection(base.describe(), base, path)]
+
+    column = SECTION_COLUMNS[by]
+    sections = []
+    for label in data_manager.filtered_groups(column):
+        if column == 'examen':
+            data_filter = base._replace(exams=(label,))
+        else:
+            data_filter = base._replace(cohorts=(label,))
+        file_name = f"reporte_{by}_{label}.pdf"
+        sections.append(ReportSection(data_filter.describe(), data_filter, os.path.join(path, file_name)))
+    return sections
+
+
+def _collect(data_manager: DataManager, viz_engine: VisualizationEngine, section: ReportSection,
+             submit: Callable[..., Future], ranking_size: int) -> _SectionContent:
+    """Calcula el contenido de una sección y envía sus gráficas a dibujar"""
+    if data_manager.filter != section.data_filter:
+        data_manager.set_filter(section.data_filter)
+    report = data_manager.get_item_report()
+    cards = summary_cards(data_manager) + [
+        ("Confiabilidad KR-20", f"{report.reliability:.3f}"),
+        ("Preguntas Problemáticas", int(report.items['problematica'].sum()))
+    ]
+    charts = [(name, submit(render_chart, name, getattr(viz_engine, f'prepare_{name}')()))
+              for name in REPORT_CHARTS]
+    return _SectionContent(section, cards, report.items, student_ranking(data_manager, ranking_size), charts)
+
+
+def _format_cell(value) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return "Sí" if value else "No"
+    if isinstance(value, (float, np.floating)):
+        return "-" if np.isnan(value) else f"{value:.3f}"
+    text = str(value)
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
+
+
+class _PageWriter:
+    """Agrega páginas A4 con encabezado y pie a un PdfPages"""
+
+    def __init__(self, pdf: PdfPages, title: str, footer: str):
+        self.pdf = pdf
+        self.title = title
+        self.footer = footer
+        self.pages = 0
+
+    def new_page(self, heading: Optional[str] = None) -> Figure:
+        figure = Figure(figsize=PAGE_SIZE)
+        self.pages += 1
+        figure.text(0.04, 0.96, self.title, fontsize=10, color='gray', va='top')
+        if heading:
+            figure.text(0.04, 0.92, heading, fontsize=16, weight='bold', va='top')
+        figure.text(0.04, 0.03, self.footer, fontsize=8, color='gray')
+        figure.text(0.96, 0.03, f"Página {self.pages}", fontsize=8, color='gray', ha='right')
+        return figure
+
+    def save(self, figure: Figure):
+        self.pdf.savefig(figure)
+
+    def cover(self, heading: str, details: Sequence[str], cards: Sequence[Tuple[str, str]], columns: int = 3):
+        """Portada con las tarjetas de resumen en una cuadrícula"""
+        figure = self.new_page(heading)
+        for i, line in enumerate(details):
+            figure.text(0.04, 0.86 - i * 0.03, line, fontsize=10, va='top')
+        top, bottom = 0.86 - len(details) * 0.03 - 0.03, 0.08
+        rows = -(-len(cards) // columns)
+        width, height = 0.92 / columns, (top - bottom) / max(rows, 1)
+        for i, (label, value) in enumerate(cards):
+            x = 0.04 + (i % columns) * width
+            y = top - (i // columns + 1) * height
+            figure.patches.append(FancyBboxPatch(
+                (x + 0.01, y + 0.01), width - 0.02, height - 0.02, boxstyle='round,pad=0,rounding_size=0.01',
+                transform=figure.transFigure, facecolor='#f2f5f9', edgecolor='#c5cfdb', figure=figure))
+            figure.text(x + width / 2, y + height * 0.58, str(value), fontsize=18, weight='bold',
+                        ha='center', va='center')
+            figure.text(x + width / 2, y + height * 0.28, label, fontsize=10, ha='center', va='center')
+        self.save(figure)
+
+    def image(self, png: bytes):
+        """Página con una gráfica rasterizada, centrada y sin deformar"""
+        figure = self.new_page()
+        ax = figure.add_axes([0.04, 0.07, 0.92, 0.86])
+        ax.imshow(imread(io.BytesIO(png), format='png'), interpolation='antialiased')
+        ax.set_axis_off()
+        self.save(figure)
+
+    def table(self, heading: str, df: pd.DataFrame, columns: Sequence[Tuple[str, str, float]],
+              left_aligned: Sequence[str] = ()):
+        """Tabla paginada (TABLE_ROWS_PER_PAGE filas por página)
+
+        columns tiene (campo, encabezado, ancho relativo). Cada columna de una
+        página es un solo texto de varias líneas: las filas quedan alineadas
+        (mismo tamaño de letra e interlineado) y dibujar la página cuesta unos
+        pocos textos en lugar de uno por celda.
+        """
+        fields = [field for field, _, _ in columns]
+        cells = [[_format_cell(value) for value in row] for row in df[fields].itertuples(index=False)]
+        if not cells:
+            figure = self.new_page(heading)
+            figure.text(0.5, 0.5, "Sin datos", fontsize=14, ha='center', va='center')
+            self.save(figure)
+            return
+        total_width = sum(width for _, _, width in columns)
+        pages = range(0, len(cells), TABLE_ROWS_PER_PAGE)
+        for number, start in enumerate(pages, 1):
+            suffix = f" ({number}/{len(pages)})" if len(pages) > 1 else ""
+            figure = self.new_page(heading + suffix)
+            chunk = cells[start:start + TABLE_ROWS_PER_PAGE]
+            x = 0.04
+            for j, (field, label, width) in enumerate(columns):
+                width = 0.92 * width / total_width
+                if field in left_aligned:
+                    position, align = x + 0.005, 'left'
+                else:
+                    position, align = x + width / 2, 'center'
+                figure.text(position, 0.86, label, fontsize=9, weight='bold', ha=align, va='top')
+                figure.text(position, 0.82, '\n'.join(row[j] for row in chunk), fontsize=8,
+                            ha=align, va='top', multialignment=align, linespacing=1.6)
+                x += width
+            figure.add_artist(Line2D([0.04, 0.96], [0.83, 0.83], color='#8a99ab', linewidth=0.8,
+                                     transform=figure.transFigure))
+            self.save(figure)
+
+
+def _write_pdf(content: _SectionContent, source: str, generated: str, dpi: int) -> str:
+    section = content.section
+    footer = f"ExamAnalytics - {os.path.basename(source)} - {generated}" if source else \
+        f"ExamAnalytics - {generated}"
+    with PdfPages(section.path) as pdf:
+        writer = _PageWriter(pdf, f"Reporte de resultados - {section.title}", footer)
+        details = [f"Estudiantes: {section.data_filter.describe()}", f"Generado: {generated}"]
+        if source:
+            details.insert(0, f"Archivo: {os.path.abspath(source)}")
+        writer.cover(section.title, details, content.cards)
+        for _, future in content.charts:
+            writer.image(future.result())
+        writer.table("Indicadores por pregunta", content.items, ITEM_COLUMNS, left_aligned=('motivo',))
+        ranking = content.ranking.assign(nota=content.ranking['nota'].map('{:.2f}'.format))
+        writer.table(f"Ranking de estudiantes (primeros {len(ranking)})", ranking,
+                     RANKING_COLUMNS, left_aligned=('apellidos_nombres',))
+        info = pdf.infodict()
+        info['Title'] = f"Reporte de resultados - {section.title}"
+        info['Creator'] = "ExamAnalytics"
+    return section.path
+
+
+def _inline_future(function: Callable, *args) -> Future:
+    future: Future = Future()
+    future.set_result(function(*args))
+    return future
+
+
+def generate_reports(data_manager: DataManager, sections: Sequence[ReportSection], source: str = '',
+                     max_workers: Optional[int] = None, dpi: int = CHART_DPI, ranking_size: int = RANKING_SIZE,
+                     irt_model: str = VisualizationEngine.ICC_MODEL,
+                     progress: Optional[Callable[[str], None]] = None) -> List[str]:
+    """Genera un PDF por sección; retorna las rutas escritas
+
+    Las gráficas se dibujan en procesos de trabajo creados con 'spawn' (se
+    puede llamar desde la interfaz, que tiene hilos en ejecución); con
+    max_workers=1 todo se hace en el proceso actual. El filtro de
+    data_manager se restaura al terminar.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(sections) * len(REPORT_CHARTS)),
+                                       mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(function: Callable, *args) -> Future:
+        if executor is None:
+            return _inline_future(function, *args, dpi)
+        return executor.submit(function, *args, dpi)
+
+    viz_engine = VisualizationEngine(data_manager)
+    viz_engine.ICC_MODEL = irt_model
+    original_filter = data_manager.filter
+    generated = datetime.now().strftime('%Y-%m-%d %H:%M')
+    paths = []
+    try:
+        contents = []
+        for i, section in enumerate(sections, 1):
+            if progress is not None:
+                progress(f"Calculando {section.title} ({i}/{len(sections)})")
+            contents.append(_collect(data_manager, viz_engine, section, submit, ranking_size))
+        for i, content in enumerate(contents, 1):
+            if progress is not None:
+                progress(f"Escribiendo {content.section.title} ({i}/{len(contents)})")
+            directory = os.path.dirname(content.section.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            paths.append(_write_pdf(content, source, generated, dpi))
+    finally:
+        if data_manager.filter != original_filter:
+            data_manager.set_filter(original_filter)
+        if executor is not None:
+            executor.shutdown()
+    return paths
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='report.py',
+        description="Genera el reporte PDF de un archivo de resultados (o uno por examen o cohorte).")
+    parser.add_argument('entrada', help="Archivo JSON/JSON Lines")
+    parser.add_argument('-o', '--salida', default=None,
+                        help="Archivo PDF, o directorio con --por (por defecto: reporte.pdf o reportes/)")
+    parser.add_argument('--por', choices=tuple(SECTION_COLUMNS),
+                        help="Genera un reporte por tipo de examen o por cohorte")
+    parser.add_argument('--examen', nargs='+', metavar='TIPO',
+                        help="Incluye solo estos tipos de examen")
+    parser.add_argument('--cohorte', nargs='+', metavar='AÑO',
+                        help="Incluye solo estos años de ingreso")
+    parser.add_argument('--tri', choices=MODELS, default=VisualizationEngine.ICC_MODEL, metavar='MODELO',
+                        help="Modelo TRI de las curvas características (por defecto: 2PL)")
+    parser.add_argument('--ranking', type=int, default=RANKING_SIZE,
+                        help=f"Estudiantes del ranking (por defecto: {RANKING_SIZE})")
+    parser.add_argument('--dpi', type=int, default=CHART_DPI,
+                        help=f"Resolución de las gráficas (por defecto: {CHART_DPI})")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Procesos para dibujar las gráficas (por defecto: núcleos disponibles)")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="No leer ni escribir la caché binaria junto al archivo")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    start = time.perf_counter()
+    data_manager = DataManager()
+    data_manager.use_cache = not args.sin_cache
+    success, message = data_manager.load_data(args.entrada)
+    if not success:
+        print(f"[ERROR] {args.entrada}: {message}", file=sys.stderr)
+        return 1
+    data_manager.set_filter(DataFilter(tuple(args.examen) if args.examen else None,
+                                       tuple(args.cohorte) if args.cohorte else None))
+    if not data_manager.filtered_count():
+        print(f"[ERROR] Ningún estudiante cumple el filtro ({data_manager.filter.describe()})", file=sys.stderr)
+        return 1
+
+    output = args.salida or ('reportes' if args.por else 'reporte.pdf')
+    sections = report_sections(data_manager, output, args.por)
+    paths = generate_reports(data_manager, sections, args.entrada, args.procesos, args.dpi, args.ranking,
+                             args.tri, progress=print)
+    for path in paths:
+        print(f"[OK] {path}")
+    print(f"{len(paths)} reportes generados ({time.perf_counter() - start:.2f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
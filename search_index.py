@@ -0,0 +1,167 @@
+"""
+Índice de búsqueda de estudiantes
+
+Se construye una sola vez por conjunto de datos y responde cada consulta
+sin recorrer todas las filas:
+    - Códigos: arreglo ordenado; la búsqueda por prefijo es un par de
+      búsquedas binarias (np.searchsorted).
+    - Nombres: índice de trigramas sin acentos ni mayúsculas en formato
+      compacto (vocabulario ordenado + listas de filas concatenadas). Las
+      filas candidatas se cuentan con np.bincount sobre las listas de los
+      trigramas de la consulta. Cada nombre se indexa con dos espacios al
+      final, de modo que las consultas de 1 o 2 caracteres también
+      encuentran los finales de palabra ('an' en 'juan').
+
+Los resultados se ordenan por relevancia y se entregan paginados.
+"""
+
+import threading
+import unicodedata
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+# Resultados por página en la interfaz
+DEFAULT_PAGE_SIZE = 20
+
+# Fracción mínima de trigramas compartidos para coincidencias aproximadas
+FUZZY_THRESHOLD = 0.6
+
+# Relleno al final de cada nombre: todo final de palabra queda al inicio de un trigrama
+_NAME_PADDING = '  '
+
+# Carácter mayor que cualquier otro, para delimitar rangos de prefijo
+_MAX_CHAR = '\U0010ffff'
+
+
+def normalize_text(text) -> str:
+    """Minúsculas, sin acentos y con espacios simples"""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.lower().split())
+
+
+def trigrams(text: str) -> List[str]:
+    """Trigramas distintos de un texto ya normalizado"""
+    return list({text[i:i + 3] for i in range(len(text) - 2)})
+
+
+class SearchResult(NamedTuple):
+    """Página de resultados de una búsqueda"""
+    rows: np.ndarray        # posiciones de fila en el DataFrame
+    total: int              # total de coincidencias
+    offset: int
+    limit: int
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset + len(self.rows) < self.total
+
+
+class StudentSearchIndex:
+    """Índice por prefijo de código y trigramas de nombre"""
+
+    def __init__(self, codes: Sequence, names: Sequence):
+        self.size = len(codes)
+
+        # Códigos ordenados para búsqueda por prefijo
+        code_strings = np.array([str(code).lower() for code in codes], dtype=str)
+        self._code_order = np.argsort(code_strings, kind='stable').astype(np.int32)
+        self._sorted_codes = code_strings[self._code_order]
+
+        # Nombres normalizados e índice de trigramas
+        self._names = np.array([normalize_text(name) for name in names], dtype=str)
+        # Posición alfabética de cada nombre, para desempatar sin comparar cadenas
+        self._name_rank = np.empty(self.size, dtype=np.int32)
+        self._name_rank[np.argsort(self._names, kind='stable')] = np.arange(self.size, dtype=np.int32)
+        grams: List[str] = []
+        rows: List[int] = []
+        for row, name in enumerate(self._names.tolist()):
+            name_grams = trigrams(name + _NAME_PADDING)
+            grams.extend(name_grams)
+            rows.extend([row] * len(name_grams))
+
+        gram_array = np.array(grams, dtype='<U3')
+        row_array = np.array(rows, dtype=np.int32)
+        order = np.argsort(gram_array, kind='stable')
+        self._vocabulary, starts = np.unique(gram_array[order], return_index=True)
+        self._offsets = np.append(starts, len(order)).astype(np.int64)
+        self._postings = row_array[order]
+
+        self._memo_lock = threading.Lock()
+        self._memo: Tuple[str, np.ndarray] = ('', np.empty(0, dtype=np.int32))
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por el índice"""
+        return sum(a.nbytes for a in (self._code_order, self._sorted_codes, self._names, self._name_rank,
+                                      self._vocabulary, self._offsets, self._postings))
+
+    def _prefix_range(self, sorted_values: np.ndarray, prefix: str) -> Tuple[int, int]:
+        lo = int(np.searchsorted(sorted_values, prefix, side='left'))
+        hi = int(np.searchsorted(sorted_values, prefix + _MAX_CHAR, side='left'))
+        return lo, hi
+
+    def _postings_for(self, gram: str) -> np.ndarray:
+        position = int(np.searchsorted(self._vocabulary, gram))
+        if position < len(self._vocabulary) and self._vocabulary[position] == gram:
+            return self._postings[self._offsets[position]:self._offsets[position + 1]]
+        return self._postings[:0]
+
+    def _code_matches(self, query: str) -> np.ndarray:
+        lo, hi = self._prefix_range(self._sorted_codes, query)
+        return self._code_order[lo:hi]
+
+    def _name_matches(self, query: str) -> np.ndarray:
+        """Filas cuyo nombre contiene la consulta, ordenadas por relevancia"""
+        if len(query) < 3:
+            # Consultas cortas: unión de los trigramas que empiezan con la consulta
+            lo, hi = self._prefix_range(self._vocabulary, query)
+            candidates = np.unique(self._postings[self._offsets[lo]:self._offsets[hi]])
+        else:
+            query_grams = trigrams(query)
+            lists = [self._postings_for(gram) for gram in query_grams]
+            counts = np.bincount(np.concatenate(lists), minlength=self.size) if lists else np.zeros(self.size)
+            candidates = np.flatnonzero(counts == len(query_grams))
+            if len(candidates) == 0:
+                # Sin coincidencias exactas: aproximadas por trigramas compartidos
+                needed = max(1, int(np.ceil(len(query_grams) * FUZZY_THRESHOLD)))
+                fuzzy = np.flatnonzero(counts >= needed)
+                return fuzzy[np.argsort(-counts[fuzzy], kind='stable')].astype(np.int32)
+
+        names = self._names[candidates]
+        position = np.char.find(names, query)
+        contains = position >= 0
+        candidates, names, position = candidates[contains], names[contains], position[contains]
+
+        # Relevancia: empieza con la consulta, alguna palabra empieza con ella, la contiene
+        rank = np.where(position == 0, 0, 2)
+        inner = np.flatnonzero(rank == 2)
+        rank[inner[np.char.find(names[inner], ' ' + query) >= 0]] = 1
+        order = np.lexsort((self._name_rank[candidates], rank))
+        return candidates[order].astype(np.int32)
+
+    def matches(self, query: str) -> np.ndarray:
+        """Todas las filas que coinciden con la consulta, ordenadas por relevancia"""
+        query = normalize_text(query)
+        if not query:
+            return np.empty(0, dtype=np.int32)
+
+        with self._memo_lock:
+            if self._memo[0] == query:
+                return self._memo[1]
+
+        code_rows = self._code_matches(query)
+        name_rows = self._name_matches(query)
+        if len(code_rows) and len(name_rows):
+            name_rows = name_rows[~np.isin(name_rows, code_rows)]
+        rows = np.concatenate([code_rows, name_rows])
+
+        with self._memo_lock:
+            self._memo = (query, rows)
+        return rows
+
+    def search(self, query: str, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> SearchResult:
+        """Retorna una página de resultados"""
+        rows = self.matches(query)
+        return SearchResult(rows[offset:offset + limit], len(rows), offset, limit)
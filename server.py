@@ -0,0 +1,445 @@
+"""
+ExamAnalytics - servicio local de análisis
+
+Mantiene uno o más conjuntos de datos cargados e indexados en memoria y
+atiende consultas HTTP con respuestas JSON, para que varios coordinadores
+consulten las mismas estadísticas sin cargar cada uno el archivo. Solo usa
+la biblioteca estándar (http.server con un hilo por conexión):
+
+    - las consultas son de solo lectura; cada una usa una vista del
+      DataManager con su propio filtro (DataManager.with_filter), de modo
+      que consultas concurrentes con filtros distintos no se interfieren y
+      comparten la caché de resultados
+    - cada respuesta se guarda ya serializada y comprimida con gzip en una
+      caché por (conjunto, versión, ruta, parámetros); si varias consultas
+      iguales llegan a la vez, se calcula una sola (AnalyticsCache)
+    - la respuesta se envía comprimida si el cliente acepta gzip
+
+Rutas (GET):
+    /api/conjuntos                      conjuntos cargados
+    /api/<conjunto>/grupos              tipos de examen, cohortes y conteos
+    /api/<conjunto>/resumen             resumen y percentiles de la nota
+    /api/<conjunto>/preguntas           acierto por pregunta
+    /api/<conjunto>/psicometria         indicadores por pregunta y KR-20
+    /api/<conjunto>/distractores        proporciones y análisis por opción
+    /api/<conjunto>/cohortes            nota por año de ingreso
+    /api/<conjunto>/comparaciones       intervalos y pruebas (?columna=examen)
+    /api/<conjunto>/similitud           pares de respuestas similares (?alfa=0.05)
+    /api/<conjunto>/buscar              estudiantes (?q=texto&desde=0&limite=20)
+    /api/<conjunto>/graficas/<nombre>   datos de una gráfica (modo cliente)
+
+Todas las rutas de un conjunto aceptan los filtros ?examen=A&cohorte=2021
+(repetibles). Las tablas se envían como {"columnas", "filas", "tipos"} y
+los arreglos de NumPy como {"valores", "tipo"} (ver encode_value).
+
+Uso:
+    python server.py resultados.json otro.jsonl --puerto 8765
+    python main.py --servidor http://127.0.0.1:8765 --conjunto resultados
+"""
+
+import argparse
+import gzip
+import json
+import math
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from analytics_cache import AnalyticsCache
+from data_manager import DataManager
+from group_index import DataFilter
+from irt import MODELS
+from profiling import profiler
+from search_index import DEFAULT_PAGE_SIZE
+from similarity import DEFAULT_ALPHA
+from visualization import VisualizationEngine
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+API_PREFIX = '/api'
+
+# Presupuesto de la caché de respuestas comprimidas (bytes)
+RESPONSE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Máximo de estudiantes por página de búsqueda
+MAX_SEARCH_LIMIT = 500
+
+# Columnas de las comparaciones y gráficas que se pueden consultar
+COMPARISON_COLUMNS = ('examen', 'año_ingreso')
+CHART_NAMES = tuple(VisualizationEngine.FIGSIZES)
+
+# Tasas de falsos descubrimientos de la similitud que se pueden consultar
+# (cada una es un cálculo O(N²) y una entrada de caché aparte)
+ALLOWED_ALPHAS = (0.01, DEFAULT_ALPHA, 0.1)
+
+# Tipos de columna que se restauran al decodificar una tabla
+_RESTORED_KINDS = 'biuf'
+
+
+class RequestError(Exception):
+    """Consulta inválida; se responde con el estado HTTP dado"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_value(value):
+    """Convierte un resultado a tipos de JSON
+
+    Las tablas (DataFrame) quedan como columnas, filas y tipos, con el índice
+    si no es el predeterminado; los arreglos como valores y tipo. Los
+    valores no finitos (NaN, infinito) se convierten en null.
+    """
+    if isinstance(value, pd.DataFrame):
+        rows = value.astype(object).to_numpy().tolist()
+        table = {'columnas': [str(column) for column in value.columns],
+                 'filas': encode_value(rows),
+                 'tipos': [dtype.str if dtype.kind in _RESTORED_KINDS else 'O' for dtype in value.dtypes]}
+        if not isinstance(value.index, pd.RangeIndex) or value.index.start != 0 or value.index.step != 1:
+            table['indice'] = encode_value(value.index.tolist())
+            table['nombre_indice'] = value.index.name
+        return table
+    if isinstance(value, pd.Series):
+        return encode_value(value.to_numpy())
+    if isinstance(value, np.ndarray):
+        return {'valores': encode_value(value.tolist()),
+                'tipo': value.dtype.str if value.dtype.kind in _RESTORED_KINDS else 'O'}
+    if isinstance(value, dict):
+        return {str(key): encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if math.isfinite(value) else None
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def decode_value(value):
+    """Inverso de encode_value: reconstruye tablas y arreglos"""
+    if isinstance(value, dict):
+        if 'columnas' in value and 'filas' in value and 'tipos' in value:
+            table = pd.DataFrame(value['filas'], columns=value['columnas'])
+            for column, dtype in zip(value['columnas'], value['tipos']):
+                if dtype != 'O':
+                    table[column] = table[column].astype(dtype)
+            if 'indice' in value:
+                table.index = pd.Index(value['indice'], name=value['nombre_indice'])
+            return table
+        if set(value) == {'valores', 'tipo'}:
+            return np.array(value['valores'], dtype=None if value['tipo'] == 'O' else value['tipo'])
+        return {key: decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
+
+
+def dumps(payload) -> bytes:
+    """JSON estricto (sin NaN) en UTF-8"""
+    return json.dumps(encode_value(payload), ensure_ascii=False, allow_nan=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+class _Query:
+    """Parámetros de una consulta (los filtros pueden repetirse)"""
+
+    def __init__(self, pairs: Sequence[Tuple[str, str]]):
+        self.pairs = pairs
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.all(name)
+        return values[-1] if values else default
+
+    def all(self, name: str) -> List[str]:
+        return [value for key, value in self.pairs if key == name]
+
+    def integer(self, name: str, default: int, low: int, high: int) -> int:
+        text = self.get(name)
+        if text is None:
+            return default
+        try:
+            number = int(text)
+        except ValueError:
+            raise RequestError(400, f"'{name}' debe ser un número entero")
+        return min(max(number, low), high)
+
+    def data_filter(self) -> DataFilter:
+        exams, cohorts = self.all('examen'), self.all('cohorte')
+        return DataFilter(tuple(exams) if exams else None, tuple(cohorts) if cohorts else None)
+
+    def key(self) -> Tuple:
+        """Clave canónica (el orden de los parámetros no importa)"""
+        return tuple(sorted(self.pairs))
+
+
+class AnalyticsService:
+    """Conjuntos de datos cargados y consultas sobre ellos (sin HTTP)"""
+
+    def __init__(self, response_cache_bytes: int = RESPONSE_CACHE_BYTES):
+        self.datasets: Dict[str, DataManager] = {}
+        self.sources: Dict[str, str] = {}
+        self.responses = AnalyticsCache(response_cache_bytes)
+        self._lock = threading.Lock()
+        self.routes: Dict[str, Callable[[DataManager, _Query], Dict]] = {
+            'grupos': self.groups,
+            'resumen': self.summary,
+            'preguntas': self.questions,
+            'psicometria': self.items,
+            'distractores': self.distractors,
+            'cohortes': self.cohorts,
+            'comparaciones': self.comparisons,
+            'similitud': self.similarity,
+            'buscar': self.search,
+        }
+
+    def add_dataset(self, path: str, name: Optional[str] = None, use_cache: bool = True) -> Tuple[bool, str]:
+        """Carga un archivo y construye sus agregados e índices; retorna (éxito, mensaje)
+
+        Sin name el conjunto se llama como el archivo sin extensión, con un
+        sufijo numérico si ya existe otro con ese nombre; un name explícito
+        repetido se rechaza.
+        """
+        with self._lock:
+            if name is not None and name in self.datasets:
+                return False, f"Ya existe un conjunto llamado '{name}'"
+        data_manager = DataManager()
+        data_manager.use_cache = use_cache
+        success, message = data_manager.load_data(path)
+        if not success:
+            return False, message
+        # Se calculan antes de crear vistas para que todas los compartan
+        data_manager.get_full_aggregate()
+        data_manager.get_search_index()
+        with self._lock:
+            if name is None:
+                base = os.path.splitext(os.path.basename(path))[0]
+                name, suffix = base, 1
+                while name in self.datasets:
+                    suffix += 1
+                    name = f"{base}_{suffix}"
+            elif name in self.datasets:
+                return False, f"Ya existe un conjunto llamado '{name}'"
+            self.datasets[name] = data_manager
+            self.sources[name] = os.path.abspath(path)
+        return True, f"{message} (conjunto '{name}')"
+
+    def respond(self, path: str, pairs: Sequence[Tuple[str, str]]) -> Tuple[int, bytes]:
+        """Atiende una ruta; retorna el estado HTTP y el cuerpo JSON comprimido con gzip"""
+        parts = [unquote(part) for part in path.split('/') if part]
+        query = _Query(pairs)
+        try:
+            if len(parts) < 2 or '/' + parts[0] != API_PREFIX:
+                raise RequestError(404, f"Ruta desconocida: {path}")
+            if parts[1:] == ['conjuntos']:
+                return 200, gzip.compress(dumps(self.list_datasets()))
+            data_manager = self.datasets.get(parts[1])
+            if data_manager is None:
+                raise RequestError(404, f"Conjunto desconocido: {parts[1]}")
+            handler = self._route(parts[2:])
+            key = (parts[1], data_manager.version, tuple(parts[2:]), query.key())
+
+            def compute() -> bytes:
+                with profiler.span(f"servidor:{'/'.join(parts[2:])}", 'servidor'):
+                    view = data_manager.with_filter(query.data_filter())
+                    if parts[2] != 'grupos' and not view.filtered_count():
+                        raise RequestError(404, f"Ningún estudiante cumple el filtro ({view.filter.describe()})")
+                    return gzip.compress(dumps(handler(view, query)))
+
+            return 200, self.responses.get_or_compute(key, compute)
+        except RequestError as e:
+            return e.status, gzip.compress(dumps({'error': str(e)}))
+        except Exception as e:
+            return 500, gzip.compress(dumps({'error': f"Error inesperado: {e}"}))
+
+    def _route(self, parts: List[str]) -> Callable[[DataManager, _Query], Dict]:
+        if len(parts) == 1 and parts[0] in self.routes:
+            return self.routes[parts[0]]
+        if len(parts) == 2 and parts[0] == 'graficas':
+            name = parts[1]
+            if name not in CHART_NAMES:
+                raise RequestError(404, f"Gráfica desconocida: {name}")
+            return lambda view, query: self.chart(view, query, name)
+        raise RequestError(404, f"Ruta desconocida: {'/'.join(parts)}")
+
+    def list_datasets(self) -> Dict:
+        with self._lock:
+            datasets = list(self.datasets.items())
+        return {'conjuntos': [{'nombre': name, 'archivo': self.sources[name],
+                               'estudiantes': data_manager.total_count(), 'version': data_manager.version}
+                              for name, data_manager in datasets]}
+
+    @staticmethod
+    def groups(view: DataManager, query: _Query) -> Dict:
+        return {
+            'examen': view.groups.labels('examen'),
+            'año_ingreso': view.groups.labels('año_ingreso'),
+            'estudiantes': view.total_count(),
+            'filtrados': view.filtered_count(),
+            'filtro': view.filter.describe(),
+            'version': view.version
+        }
+
+    @staticmethod
+    def summary(view: DataManager, query: _Query) -> Dict:
+        summary = dict(view.get_summary())
+        summary['examen_tipos'] = [str(exam) for exam in summary['examen_tipos']]
+        return {'filtro': view.filter.describe(), 'resumen': summary, 'percentiles': view.get_percentiles()}
+
+    @staticmethod
+    def questions(view: DataManager, query: _Query) -> Dict:
+        return {'preguntas': view.get_questions_analysis()}
+
+    @staticmethod
+    def items(view: DataManager, query: _Query) -> Dict:
+        report = view.get_item_report()
+        return {'preguntas': report.items, 'confiabilidad_kr20': report.reliability, 'estudiantes': report.students}
+
+    @staticmethod
+    def distractors(view: DataManager, query: _Query) -> Dict:
+        report = view.get_distractor_analysis()
+        return {'proporciones': report.proportions, 'opciones': report.options, 'claves': report.main_keys}
+
+    @staticmethod
+    def cohorts(view: DataManager, query: _Query) -> Dict:
+        return {'cohortes': view.get_cohort_stats()}
+
+    @staticmethod
+    def comparisons(view: DataManager, query: _Query) -> Dict:
+        column = query.get('columna', 'examen')
+        if column not in COMPARISON_COLUMNS:
+            raise RequestError(400, f"'columna' debe ser una de: {', '.join(COMPARISON_COLUMNS)}")
+        report = view.get_comparisons(column)
+        return {'columna': report.column, 'intervalos': report.intervals, 'pruebas': report.tests,
+                'remuestras': report.resamples, 'confianza': report.confidence, 'semilla': report.seed}
+
+    @staticmethod
+    def similarity(view: DataManager, query: _Query) -> Dict:
+        allowed = ', '.join(f"{alpha:g}" for alpha in ALLOWED_ALPHAS)
+        try:
+            alpha = float(query.get('alfa', str(DEFAULT_ALPHA)))
+        except ValueError:
+            raise RequestError(400, f"'alfa' debe ser uno de: {allowed}")
+        if alpha not in ALLOWED_ALPHAS:
+            raise RequestError(400, f"'alfa' debe ser uno de: {allowed}")
+        report = view.get_similarity(alpha)
+        return {'pares': report.pairs, 'pares_comparados': report.compared_pairs,
+                'pares_marcados': report.flagged_pairs, 'alfa': report.alpha}
+
+    @staticmethod
+    def search(view: DataManager, query: _Query) -> Dict:
+        offset = query.integer('desde', 0, 0, sys.maxsize)
+        limit = query.integer('limite', DEFAULT_PAGE_SIZE, 1, MAX_SEARCH_LIMIT)
+        students, result = view.search_students(query.get('q', ''), offset, limit)
+        return {'estudiantes': students.reset_index(drop=True), 'total': result.total,
+                'desde': result.offset, 'limite': result.limit}
+
+    @staticmethod
+    def chart(view: DataManager, query: _Query, name: str) -> Dict:
+        viz_engine = VisualizationEngine(view)
+        model = query.get('modelo')
+        if model is not None:
+            if model not in MODELS:
+                raise RequestError(400, f"'modelo' debe ser uno de: {', '.join(MODELS)}")
+            viz_engine.ICC_MODEL = model
+        return {'grafica': name, 'datos': getattr(viz_engine, f'prepare_{name}')()}
+
+
+class AnalyticsRequestHandler(BaseHTTPRequestHandler):
+    """Traduce las consultas HTTP a AnalyticsService.respond"""
+
+    server_version = 'ExamAnalytics/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        status, body = self.server.service.respond(url.path, parse_qsl(url.query, keep_blank_values=True))
+        compressed = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if not compressed:
+            body = gzip.decompress(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept-Encoding')
+        if compressed:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class AnalyticsServer(ThreadingHTTPServer):
+    """Servidor HTTP con un hilo por conexión"""
+
+    daemon_threads = True
+
+    def __init__(self, service: AnalyticsService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 verbose: bool = False):
+        super().__init__((host, port), AnalyticsRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(service: AnalyticsService, host: str = DEFAULT_HOST, port: int = 0) -> AnalyticsServer:
+    """Inicia el servidor en un hilo (port=0 elige un puerto libre); detener con shutdown()"""
+    server = AnalyticsServer(service, host, port)
+    threading.Thread(target=server.serve_forever, name='servidor-analitica', daemon=True).start()
+    return server
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='server.py',
+        description="Servicio local que mantiene los datos en memoria y atiende consultas JSON.")
+    parser.add_argument('entradas', nargs='+', help="Archivos JSON/JSON Lines a cargar")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f"Dirección de escucha (por defecto: {DEFAULT_HOST}, solo este equipo)")
+    parser.add_argument('--puerto', type=int, default=DEFAULT_PORT,
+                        help=f"Puerto (por defecto: {DEFAULT_PORT})")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="No leer ni escribir la caché binaria junto a los archivos")
+    parser.add_argument('--registro', action='store_true', help="Muestra cada consulta atendida")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    service = AnalyticsService()
+    for source in args.entradas:
+        success, message = service.add_dataset(source, use_cache=not args.sin_cache)
+        print(f"[{'OK' if success else 'ERROR'}] {source}: {message}", file=sys.stdout if success else sys.stderr)
+    if not service.datasets:
+        return 1
+
+    server = AnalyticsServer(service, args.host, args.puerto, args.registro)
+    print(f"Atendiendo en {server.url}{API_PREFIX}/ ({', '.join(service.datasets)}); Ctrl+C para salir")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
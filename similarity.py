@@ -0,0 +1,320 @@
+"""
+Detección de hojas de respuestas similares (posible copia)
+
+Se comparan todos los pares de estudiantes de un mismo tipo de examen. La
+evidencia principal son las respuestas incorrectas idénticas: dos
+estudiantes que se equivocan en la misma pregunta con la misma opción. Para
+cada par (a, b) se calcula, sobre la matriz codificada de respuestas:
+
+    M = Σ_q [ambos erraron q con la misma opción]
+    E = Σ_q [ambos erraron q] · s_q
+    V = Σ_q [ambos erraron q] · s_q (1 - s_q)
+
+donde s_q = Σ_o p_qo² es la probabilidad de que dos respuestas incorrectas
+independientes a la pregunta q coincidan (p_qo: proporción de la opción o
+entre quienes erraron q, sin contar las respuestas de a y b, para que una
+copia no eleve su propia tasa esperada). E y V son la media y la varianza
+de M si los estudiantes respondieran de forma independiente, y
+z = (M - E) / √V.
+
+Los p-valores (una cola) de todos los pares comparados se ajustan por
+Benjamini-Hochberg: un par queda marcado si su p-valor ajustado no supera
+alfa (tasa de falsos descubrimientos) y M alcanza un mínimo. El reporte
+incluye los pares marcados y, aunque no lo estén, los de mayor z.
+
+Las cantidades son productos de matrices indicadoras (una columna por
+pregunta y opción incorrecta) y de conteos por pregunta, que se calculan por
+bloques de filas: cada bloque produce una tesela de pares de tamaño fijo y
+solo se conservan los pares candidatos (los únicos que el ajuste podría
+marcar), por lo que la memoria no crece con N². Las teselas se reparten
+entre procesos (ProcessPoolExecutor).
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from answer_store import AnswerStore
+from item_analysis import BLANK, NOT_ASKED, OPTIONS
+
+# Estudiantes por bloque (cada tesela es de BLOCK_SIZE × BLOCK_SIZE pares)
+BLOCK_SIZE = 1024
+
+# Tasa de falsos descubrimientos (Benjamini-Hochberg) sobre todos los pares
+DEFAULT_ALPHA = 0.05
+
+# Mínimo de respuestas incorrectas idénticas para informar un par
+MIN_IDENTICAL_INCORRECT = 3
+
+# Máximo de pares que se conservan (los de mayor z)
+MAX_PAIRS = 5_000
+
+# Pares de mayor z que se informan aunque no estén marcados
+TOP_PAIRS = 20
+
+# Pares por lote al calcular E y V exactos de los candidatos de una tesela
+EXACT_CHUNK = 16_384
+
+# Teselas mínimas para usar varios procesos
+MIN_PARALLEL_TILES = 4
+
+PAIR_COLUMNS = ['examen', 'fila_a', 'fila_b', 'codigo_a', 'nombre_a', 'codigo_b', 'nombre_b',
+                'incorrectas_identicas', 'esperadas', 'respuestas_identicas', 'preguntas', 'z', 'p_valor',
+                'p_ajustado', 'marcado']
+
+
+class SimilarityReport(NamedTuple):
+    """Pares de estudiantes con respuestas incorrectas idénticas inusuales"""
+    pairs: pd.DataFrame         # marcados y TOP_PAIRS de mayor z, ordenados por z descendente
+    compared_pairs: int         # pares comparados en todos los grupos
+    flagged_pairs: int          # pares marcados (exacto hasta MAX_PAIRS)
+    alpha: float
+
+
+class _Block(NamedTuple):
+    """Indicadores de un bloque de estudiantes (se envía a los procesos)"""
+    offset: int
+    wrong_options: np.ndarray   # n × (Q·4): erró q eligiendo la opción o
+    wrong: np.ndarray           # n × Q: erró q
+    correct: np.ndarray         # n × Q: acertó q
+    asked: np.ndarray           # n × Q: q forma parte de su examen
+    shared: np.ndarray          # n × Q: estudiantes del grupo que eligieron su misma opción incorrecta
+
+
+class CoincidenceRates(NamedTuple):
+    """Términos por pregunta de s_q sin el par
+
+    Con c_o estudiantes del grupo en cada opción incorrecta, T = Σ_o c_o,
+    B = Σ_o c_o² + 2 y D = (T - 2)², la tasa sin el par (a, b) es
+    s_q = (B - 2 c_a - 2 c_b + 2 [misma opción]) / D, donde c_a y c_b son los
+    estudiantes que eligieron la opción de a y la de b. Si solo el par erró
+    la pregunta no hay con qué estimarla y se toma s_q = 1 (sin evidencia).
+    """
+    inverse: np.ndarray         # Q: 1 / D (0 si T ≤ 2)
+    sums: np.ndarray            # Q: B
+    lower: np.ndarray           # Q: mínimo de s_q entre los pares posibles
+    variance_lower: np.ndarray  # Q: mínimo de s_q (1 - s_q) entre los pares posibles
+
+
+class _TilePairs(NamedTuple):
+    """Pares marcados de una tesela (índices dentro del grupo)"""
+    left: np.ndarray
+    right: np.ndarray
+    identical_incorrect: np.ndarray
+    expected: np.ndarray
+    identical: np.ndarray
+    common: np.ndarray
+    z: np.ndarray
+
+
+def _indicators(answers: np.ndarray, keys: np.ndarray) -> Tuple[Tuple[np.ndarray, ...], CoincidenceRates]:
+    """Matrices indicadoras float32 de un conjunto de estudiantes y sus tasas de coincidencia"""
+    asked = keys != NOT_ASKED
+    answered = asked & (answers != BLANK)
+    correct = answered & (answers == keys)
+    wrong = answered & ~correct
+    wrong_options = np.concatenate([wrong & (answers == code) for code in range(1, len(OPTIONS) + 1)],
+                                   axis=1)
+    rates, options = coincidence_rates(wrong_options, answers.shape[1])
+    shared = (wrong_options * options).reshape(len(answers), len(OPTIONS), -1).sum(axis=1)
+    return (wrong_options.astype(np.float32), wrong.astype(np.float32), correct.astype(np.float32),
+            asked.astype(np.float32), shared.astype(np.float32)), rates
+
+
+def coincidence_rates(wrong_options: np.ndarray, n_questions: int) -> Tuple[CoincidenceRates, np.ndarray]:
+    """Términos de la probabilidad s_q de que dos respuestas incorrectas a q coincidan
+
+    Retorna también c_o por columna de wrong_options.
+    """
+    options = wrong_options.sum(axis=0, dtype=np.float64)
+    counts = options.reshape(len(OPTIONS), n_questions)
+    others = counts.sum(axis=0) - 2
+    estimable = others > 0
+    inverse = np.zeros(n_questions)
+    np.divide(1, others ** 2, out=inverse, where=estimable)
+    sums = (counts ** 2).sum(axis=0) + 2
+
+    # Cotas inferiores de s_q y s_q (1 - s_q) sobre las opciones que pueden tener a y b
+    lower = np.full(n_questions, np.inf)
+    variance_lower = np.full(n_questions, np.inf)
+    for first in range(len(OPTIONS)):
+        for second in range(len(OPTIONS)):
+            same = first == second
+            possible = counts[first] >= (2 if same else 1)
+            possible &= counts[second] >= 1
+            rate = np.where(estimable, (sums - 2 * counts[first] - 2 * counts[second] + 2 * same) * inverse, 1.0)
+            lower = np.where(possible, np.minimum(lower, rate), lower)
+            variance_lower = np.where(possible, np.minimum(variance_lower, rate * (1 - rate)), variance_lower)
+    unused = np.isinf(lower)
+    lower[unused] = variance_lower[unused] = 0
+    return CoincidenceRates(inverse, sums, lower, variance_lower), options
+
+
+def _pair_statistics(left: _Block, right: _Block, rows: np.ndarray, columns: np.ndarray,
+                     rates: CoincidenceRates) -> Tuple[np.ndarray, np.ndarray]:
+    """E y V exactos (con s_q sin el par) de los pares indicados"""
+    wrong = left.wrong[rows] * right.wrong[columns]
+    same = left.wrong_options[rows] * right.wrong_options[columns]
+    same = same.reshape(len(rows), len(OPTIONS), -1).sum(axis=1)
+    counts = rates.sums - 2 * left.shared[rows] - 2 * right.shared[columns] + 2 * same
+    rate = np.where(rates.inverse > 0, counts * rates.inverse, 1.0)
+    return (wrong * rate).sum(axis=1), (wrong * rate * (1 - rate)).sum(axis=1)
+
+
+def _tile(left: _Block, right: _Block, rates: CoincidenceRates, z_min: float,
+          min_matches: int) -> _TilePairs:
+    """Compara dos bloques y retorna solo los pares con z ≥ z_min
+
+    Con las cotas inferiores de s_q y de s_q (1 - s_q) se obtiene, con dos
+    productos de matrices, una cota superior de z para toda la tesela; E y
+    V exactos solo se calculan para los pares que la superan.
+    """
+    identical_incorrect = left.wrong_options @ right.wrong_options.T
+    expected_lower = (left.wrong * rates.lower.astype(np.float32)) @ right.wrong.T
+    variance_lower = (left.wrong * rates.variance_lower.astype(np.float32)) @ right.wrong.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z_bound = (identical_incorrect - expected_lower) / np.sqrt(np.maximum(variance_lower, 0))
+    candidates = (identical_incorrect >= min_matches) & (z_bound >= z_min)
+    if left.offset == right.offset:
+        # Bloque diagonal: cada par una sola vez
+        candidates &= np.triu(np.ones(candidates.shape, dtype=bool), k=1)
+    rows, columns = np.nonzero(candidates)
+
+    matches = identical_incorrect[rows, columns]
+    expected = np.empty(len(rows))
+    variance = np.empty(len(rows))
+    for start in range(0, len(rows), EXACT_CHUNK):
+        chunk = slice(start, start + EXACT_CHUNK)
+        expected[chunk], variance[chunk] = _pair_statistics(left, right, rows[chunk], columns[chunk], rates)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = (matches - expected) / np.sqrt(variance)
+    keep = z >= z_min
+    rows, columns, matches, expected, z = rows[keep], columns[keep], matches[keep], expected[keep], z[keep]
+
+    identical = matches + (left.correct[rows] * right.correct[columns]).sum(axis=1)
+    common = (left.asked[rows] * right.asked[columns]).sum(axis=1)
+    return _TilePairs(rows + left.offset, columns + right.offset, matches, expected, identical, common, z)
+
+
+def _blocks(indicators: Tuple[np.ndarray, ...], block_size: int) -> List[_Block]:
+    n = len(indicators[0])
+    return [_Block(start, *(matrix[start:start + block_size] for matrix in indicators))
+            for start in range(0, n, block_size)]
+
+
+def _tile_tasks(blocks: List[_Block]) -> Iterator[Tuple[_Block, _Block]]:
+    for i, left in enumerate(blocks):
+        for right in blocks[i:]:
+            yield left, right
+
+
+def candidate_threshold(alpha: float, n_pairs: int, max_pairs: int = MAX_PAIRS) -> float:
+    """Menor z (una cola) que Benjamini-Hochberg podría marcar entre los max_pairs de mayor z
+
+    El k-ésimo p-valor más pequeño se marca si no supera k·alpha/n_pairs;
+    con k ≤ max_pairs basta conservar los pares con p ≤ max_pairs·alpha/n_pairs.
+    """
+    return NormalDist().inv_cdf(1 - min(alpha * max_pairs / max(n_pairs, 1), 0.5))
+
+
+def benjamini_hochberg(p_values: np.ndarray, n_tests: int) -> np.ndarray:
+    """P-valores ajustados por Benjamini-Hochberg (n_tests ≥ len(p_values) pruebas en total)
+
+    Los p-valores que no se entregan se suponen mayores que todos los
+    entregados; el ajuste es exacto para los que quedan por debajo de alfa.
+    """
+    m = len(p_values)
+    order = np.argsort(p_values, kind='stable')
+    scaled = p_values[order] * n_tests / np.arange(1, m + 1)
+    adjusted = np.minimum(1, np.minimum.accumulate(scaled[::-1])[::-1])
+    result = np.empty(m)
+    result[order] = adjusted
+    return result
+
+
+def compare_group(answers: np.ndarray, keys: np.ndarray, z_min: float,
+                  min_matches: int = MIN_IDENTICAL_INCORRECT, block_size: int = BLOCK_SIZE,
+                  executor: Optional[ProcessPoolExecutor] = None) -> _TilePairs:
+    """Compara todos los pares de un grupo de estudiantes (respuestas y claves n × Q)
+
+    Retorna los pares con z ≥ z_min y al menos min_matches respuestas
+    incorrectas idénticas.
+    """
+    indicators, rates = _indicators(answers, keys)
+    tasks = list(_tile_tasks(_blocks(indicators, block_size)))
+
+    if executor is None or len(tasks) < MIN_PARALLEL_TILES:
+        results = [_tile(left, right, rates, z_min, min_matches) for left, right in tasks]
+    else:
+        futures = [executor.submit(_tile, left, right, rates, z_min, min_matches)
+                   for left, right in tasks]
+        results = [future.result() for future in futures]
+    return _TilePairs(*(np.concatenate(parts) for parts in zip(*results)))
+
+
+def find_similar_pairs(store: AnswerStore, df: pd.DataFrame, groups: Dict[str, np.ndarray],
+                       alpha: float = DEFAULT_ALPHA, min_matches: int = MIN_IDENTICAL_INCORRECT,
+                       max_workers: Optional[int] = None, block_size: int = BLOCK_SIZE,
+                       max_pairs: int = MAX_PAIRS) -> SimilarityReport:
+    """Busca pares similares dentro de cada grupo (tipo de examen)
+
+    alpha es la tasa de falsos descubrimientos sobre todos los pares
+    comparados. groups asocia cada grupo con sus filas (ordenadas) en store y df. Con
+    max_workers=1 todo se calcula en el proceso actual. Los procesos de
+    trabajo se crean con 'spawn' para poder usarse desde la interfaz, que
+    tiene hilos en ejecución.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    tables = []
+    compared = sum(len(rows) * (len(rows) - 1) // 2 for rows in groups.values())
+    z_min = candidate_threshold(alpha, compared, max_pairs)
+    try:
+        for label, rows in groups.items():
+            if len(rows) < 2:
+                continue
+            group_store = store.take(rows).compact()
+            pairs = compare_group(group_store.answers, group_store.key_matrix(), z_min, min_matches,
+                                  block_size, executor)
+            if not len(pairs.z):
+                continue
+            left, right = rows[pairs.left], rows[pairs.right]
+            tables.append(pd.DataFrame({
+                'examen': label,
+                'fila_a': left,
+                'fila_b': right,
+                'codigo_a': df['codigo'].to_numpy()[left],
+                'nombre_a': df['apellidos_nombres'].to_numpy()[left],
+                'codigo_b': df['codigo'].to_numpy()[right],
+                'nombre_b': df['apellidos_nombres'].to_numpy()[right],
+                'incorrectas_identicas': pairs.identical_incorrect.astype(np.int64),
+                'esperadas': pairs.expected.astype(np.float64),
+                'respuestas_identicas': pairs.identical.astype(np.int64),
+                'preguntas': pairs.common.astype(np.int64),
+                'z': pairs.z.astype(np.float64),
+            }))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if tables:
+        pairs = pd.concat(tables, ignore_index=True)
+    else:
+        pairs = pd.DataFrame({column: [] for column in PAIR_COLUMNS[:-3]})
+    normal = NormalDist()
+    pairs['p_valor'] = np.array([normal.cdf(-z) for z in pairs['z']], dtype=np.float64)
+    pairs['p_ajustado'] = benjamini_hochberg(pairs['p_valor'].to_numpy(), compared)
+    pairs['marcado'] = pairs['p_ajustado'].to_numpy() <= alpha
+    flagged = int(pairs['marcado'].sum())
+    pairs = pairs.sort_values('z', ascending=False, kind='stable').reset_index(drop=True)
+    pairs = pairs[pairs['marcado'] | (pairs.index < TOP_PAIRS)].head(max_pairs).reset_index(drop=True)
+    return SimilarityReport(pairs[PAIR_COLUMNS], compared, flagged, alpha)
+
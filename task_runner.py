@@ -0,0 +1,142 @@
+"""
+Ejecución de tareas en segundo plano para la interfaz Tk
+
+Las funciones pesadas (carga de archivos, estadísticas, preparación de
+gráficas) se ejecutan en hilos de trabajo. Los hilos nunca tocan widgets:
+publican sus eventos (progreso, resultado, error) en una cola que el hilo de
+Tk revisa periódicamente con root.after(), y es allí donde se invocan los
+callbacks de la interfaz.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Intervalo de revisión de la cola desde el hilo de Tk (ms)
+POLL_INTERVAL_MS = 50
+
+
+class TaskCancelled(Exception):
+    """Se lanza dentro de una tarea cuando fue cancelada"""
+
+
+class BackgroundTask:
+    """Tarea enviada al planificador
+
+    La función de trabajo recibe la tarea como primer argumento y puede usar
+    report_progress() para enviar avances a la interfaz y check_cancelled()
+    para detenerse si el usuario canceló.
+    """
+
+    def __init__(self, scheduler: 'TaskScheduler', name: str,
+                 on_done: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[BaseException], None]] = None,
+                 on_progress: Optional[Callable[[Any], None]] = None,
+                 on_cancel: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.finished = False
+        self._scheduler = scheduler
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Solicita la cancelación; la tarea se detiene en su próximo chequeo"""
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        """Lanza TaskCancelled si se solicitó la cancelación"""
+        if self._cancel_event.is_set():
+            raise TaskCancelled(self.name)
+
+    def report_progress(self, value: Any):
+        """Envía un avance a la interfaz (y permite cancelar en ese punto)"""
+        self.check_cancelled()
+        self._scheduler._post(self, 'progress', value)
+
+
+class TaskScheduler:
+    """Planificador de tareas en hilos de trabajo con entrega en el hilo de Tk"""
+
+    def __init__(self, root, max_workers: int = 2, poll_interval_ms: int = POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='exam-worker')
+        self._events: 'queue.Queue' = queue.Queue()
+        self._active = 0
+        self._polling = False
+
+    def submit(self, name: str, func: Callable[..., Any], *args,
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_progress: Optional[Callable[[Any], None]] = None,
+               on_cancel: Optional[Callable[[], None]] = None) -> BackgroundTask:
+        """Ejecuta func(task, *args) en un hilo de trabajo
+
+        Los callbacks se invocan siempre en el hilo de Tk.
+        """
+        task = BackgroundTask(self, name, on_done, on_error, on_progress, on_cancel)
+        self._active += 1
+        self._executor.submit(self._run, task, func, args)
+        self._ensure_polling()
+        return task
+
+    def shutdown(self):
+        """Libera los hilos de trabajo sin esperar a las tareas en curso"""
+        self._executor.shutdown(wait=False)
+
+    def _run(self, task: BackgroundTask, func: Callable[..., Any], args):
+        try:
+            task.check_cancelled()
+            result = func(task, *args)
+            task.check_cancelled()
+        except TaskCancelled:
+            self._post(task, 'cancelled', None)
+        except BaseException as e:
+            self._post(task, 'error', e)
+        else:
+            self._post(task, 'done', result)
+
+    def _post(self, task: BackgroundTask, kind: str, value: Any):
+        self._events.put((task, kind, value))
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        """Despacha los eventos pendientes en el hilo de Tk"""
+        while True:
+            try:
+                task, kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                if task.on_progress and not task.cancelled:
+                    task.on_progress(value)
+                continue
+
+            self._active -= 1
+            task.finished = True
+            if kind == 'done' and not task.cancelled:
+                if task.on_done:
+                    task.on_done(value)
+            elif kind == 'error':
+                if task.on_error:
+                    task.on_error(value)
+            elif task.on_cancel:
+                task.on_cancel()
+
+        if self._active > 0 or not self._events.empty():
+            self.root.after(self.poll_interval_ms, self._poll)
+        else:
+            self._polling = False
@@ -0,0 +1,24 @@
+import pytest
+
+from benchmarks.generate_dataset import DatasetSpec, write_dataset
+from data_manager import DataManager
+
+# Conjunto pequeño con versiones de examen que no incluyen todas las preguntas
+SPEC = DatasetSpec(students=600, questions=12, versions=3, questions_per_version=10,
+                   first_cohort=2019, last_cohort=2022, seed=5)
+
+
+@pytest.fixture(scope='session')
+def dataset_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp('datos') / 'resultados.json'
+    write_dataset(str(path), SPEC)
+    return str(path)
+
+
+@pytest.fixture
+def data_manager(dataset_file):
+    manager = DataManager()
+    manager.use_cache = False
+    success, message = manager.load_data(dataset_file)
+    assert success, message
+    return manager
@@ -0,0 +1,92 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregates import PartialAggregate, RunningStats
+from data_manager import DataManager
+
+
+def assert_same_aggregate(merged: PartialAggregate, whole: PartialAggregate):
+    assert merged.students == whole.students
+    assert merged.scores.count == whole.scores.count
+    assert merged.scores.mean == pytest.approx(whole.scores.mean)
+    assert merged.scores.variance == pytest.approx(whole.scores.variance)
+    assert (merged.scores.minimum, merged.scores.maximum) == (whole.scores.minimum, whole.scores.maximum)
+    assert merged.percentiles((0.1, 0.25, 0.5, 0.75, 0.9, 0.95)) == \
+        pytest.approx(whole.percentiles((0.1, 0.25, 0.5, 0.75, 0.9, 0.95)))
+    pd.testing.assert_frame_equal(merged.items_table(), whole.items_table())
+    for label in ('exams', 'cohorts'):
+        merged_groups, whole_groups = getattr(merged, label), getattr(whole, label)
+        assert list(merged_groups) == list(whole_groups)
+        for group, stats in whole_groups.items():
+            assert merged_groups[group].count == stats.count
+            assert merged_groups[group].mean == pytest.approx(stats.mean)
+            assert merged_groups[group].variance == pytest.approx(stats.variance, nan_ok=True)
+
+
+def test_running_stats_merge_matches_one_pass():
+    rng = np.random.default_rng(3)
+    values = rng.normal(12, 4, 1000)
+    values[rng.choice(1000, 20, replace=False)] = np.nan
+    for cuts in ([500], [1, 2, 999], [100, 350, 351, 800]):
+        merged = RunningStats()
+        for part in np.split(values, cuts):
+            merged = merged.merge(RunningStats.from_values(part))
+        present = values[~np.isnan(values)]
+        assert merged.count == len(present)
+        assert merged.mean == pytest.approx(present.mean())
+        assert merged.variance == pytest.approx(present.var(ddof=1))
+        assert (merged.minimum, merged.maximum) == (present.min(), present.max())
+    assert np.isnan(RunningStats.from_values(np.array([5.0])).variance)
+    assert RunningStats().merge(RunningStats()).count == 0
+
+
+@pytest.mark.parametrize('parts', [2, 3, 7])
+def test_merged_partial_aggregates_match_one_shot(data_manager, parts):
+    store, df = data_manager.store, data_manager.df
+    whole = PartialAggregate.from_dataset('', store, df)
+    rng = np.random.default_rng(parts)
+    order = rng.permutation(len(df))
+    merged = None
+    for rows in np.array_split(order, parts):
+        rows = np.sort(rows)
+        # compact deja en cada parte solo sus preguntas, para probar la alineación
+        part = PartialAggregate.from_dataset('', store.take(rows).compact(), df, rows=rows)
+        merged = part if merged is None else merged.merge(part)
+    assert_same_aggregate(merged, whole)
+
+
+def test_append_skips_loaded_and_repeated_records(dataset_file, tmp_path):
+    with open(dataset_file, encoding='utf-8') as f:
+        records = json.load(f)
+    first, rest = tmp_path / 'primero.json', tmp_path / 'lote.jsonl'
+    first.write_text(json.dumps(records[:400], ensure_ascii=False), encoding='utf-8')
+    # El lote repite 50 registros ya cargados y 10 de los nuevos
+    batch = records[350:] + records[500:510]
+    rest.write_text('\n'.join(json.dumps(record, ensure_ascii=False) for record in batch), encoding='utf-8')
+
+    manager = DataManager()
+    manager.use_cache = False
+    assert manager.load_data(str(first))[0]
+    manager.get_full_aggregate()
+    result = manager.read_append(str(rest))
+    assert result.success, result.message
+    assert (result.added, result.duplicates) == (len(records) - 400, 60)
+    assert manager.apply_append(result)
+
+    assert len(manager.df) == len(records)
+    assert not manager.df.duplicated(['codigo', 'examen']).any()
+    assert manager.df['codigo'].tolist() == [record['codigo'] for record in records]
+
+    reference = DataManager()
+    reference.use_cache = False
+    assert reference.load_data(dataset_file)[0]
+    assert_same_aggregate(manager.get_full_aggregate(), reference.get_full_aggregate())
+
+    # Volver a agregar el mismo lote no agrega nada ni cambia el estado
+    version = manager.version
+    result = manager.read_append(str(rest))
+    assert not result.success and not manager.apply_append(result)
+    assert manager.version == version
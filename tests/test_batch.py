@@ -0,0 +1,68 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from aggregates import PartialAggregate
+from batch import report_directories, run_batch
+from data_manager import DataManager
+
+
+@pytest.fixture(scope='module')
+def split_files(dataset_file, tmp_path_factory):
+    """El conjunto de prueba repartido en tres archivos (uno en JSON Lines)"""
+    with open(dataset_file, encoding='utf-8') as f:
+        records = json.load(f)
+    directory = tmp_path_factory.mktemp('lote')
+    paths = []
+    for i, (start, end) in enumerate([(0, 150), (150, 420), (420, len(records))]):
+        part = records[start:end]
+        if i == 1:
+            path = directory / f'seccion{i}.jsonl'
+            path.write_text('\n'.join(json.dumps(r, ensure_ascii=False) for r in part), encoding='utf-8')
+        else:
+            path = directory / f'seccion{i}.json'
+            path.write_text(json.dumps(part, ensure_ascii=False), encoding='utf-8')
+        paths.append(str(path))
+    return paths
+
+
+def test_batch_total_matches_single_load(dataset_file, split_files):
+    manager = DataManager()
+    manager.use_cache = False
+    assert manager.load_data(dataset_file)[0]
+    whole = PartialAggregate.from_dataset('', manager.store, manager.df)
+
+    result = run_batch(split_files, max_workers=1, use_cache=False)
+    assert not result.errors
+    assert list(result.per_file) == split_files
+    assert [aggregate.students for aggregate in result.per_file.values()] == [150, 270, len(manager.df) - 420]
+    total = result.total
+    assert total.sources == split_files
+    assert total.students == whole.students
+    assert total.summary()['nota_promedio'] == pytest.approx(whole.summary()['nota_promedio'])
+    assert total.summary()['std_nota'] == pytest.approx(whole.summary()['std_nota'])
+    assert total.percentiles() == pytest.approx(whole.percentiles())
+    pd.testing.assert_frame_equal(total.items_table(), whole.items_table())
+    pd.testing.assert_frame_equal(PartialAggregate.group_table(total.cohorts, 'año_ingreso'),
+                                  PartialAggregate.group_table(whole.cohorts, 'año_ingreso'))
+
+
+def test_process_pool_gives_the_same_result(split_files, tmp_path):
+    missing = str(tmp_path / 'no_existe.json')
+    sequential = run_batch(split_files, max_workers=1, use_cache=False)
+    parallel = run_batch(split_files + [missing], max_workers=2, use_cache=False)
+    assert list(parallel.errors) == [missing]
+    assert list(parallel.per_file) == split_files
+    assert parallel.total.summary() == sequential.total.summary()
+    pd.testing.assert_frame_equal(parallel.total.items_table(), sequential.total.items_table())
+
+
+def test_report_directories_keep_same_named_files_apart(tmp_path):
+    sources = [str(tmp_path / 'a' / 'x.json'), str(tmp_path / 'b' / 'x.json'),
+               str(tmp_path / 'a' / 'x.jsonl')]
+    assert report_directories(sources) == {
+        sources[0]: os.path.join('a', 'x'), sources[1]: os.path.join('b', 'x'),
+        sources[2]: os.path.join('a', 'x_2')}
+    assert report_directories([sources[0]]) == {sources[0]: 'x'}
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import comparisons
+from comparisons import compare_groups, holm_adjust
+
+
+def score_groups(seed: int = 4):
+    rng = np.random.default_rng(seed)
+    return {'A': rng.integers(0, 21, 300).astype(float),
+            'B': np.clip(rng.integers(0, 21, 250) + 2, 0, 20).astype(float),
+            'C': rng.integers(0, 21, 40).astype(float)}
+
+
+def assert_same_report(first, second):
+    pd.testing.assert_frame_equal(first.intervals, second.intervals)
+    pd.testing.assert_frame_equal(first.tests, second.tests)
+
+
+def test_fixed_seed_gives_the_same_report():
+    groups = score_groups()
+    first = compare_groups(groups, 'examen', resamples=2000, seed=9, max_workers=1)
+    assert_same_report(first, compare_groups(groups, 'examen', resamples=2000, seed=9, max_workers=1))
+    other = compare_groups(groups, 'examen', resamples=2000, seed=10, max_workers=1)
+    assert not first.intervals['inferior'].equals(other.intervals['inferior'])
+
+    means = first.interval('media')
+    assert means.loc['A', 'valor'] == pytest.approx(groups['A'].mean())
+    assert (means['inferior'] <= means['valor']).all() and (means['valor'] <= means['superior']).all()
+    assert first.tests[['grupo_a', 'grupo_b']].values.tolist() == [['A', 'B'], ['A', 'C'], ['B', 'C']]
+    assert first.tests.loc[0, 'significativa']
+
+
+def test_result_does_not_depend_on_the_processes(monkeypatch):
+    groups = score_groups()
+    sequential = compare_groups(groups, 'examen', resamples=600, seed=3, max_workers=1)
+    monkeypatch.setattr(comparisons, 'MIN_PARALLEL_ELEMENTS', 0)
+    monkeypatch.setattr(comparisons, 'BATCH_ELEMENTS', 2000)
+    # Lotes más pequeños cambian las semillas; con los mismos lotes, el número de procesos no importa
+    small_batches = compare_groups(groups, 'examen', resamples=600, seed=3, max_workers=1)
+    assert_same_report(small_batches, compare_groups(groups, 'examen', resamples=600, seed=3, max_workers=2))
+    assert sequential.intervals['valor'].equals(small_batches.intervals['valor'])
+
+
+def test_continuous_scores_are_reproducible(monkeypatch):
+    # Con demasiados valores distintos se remuestrean los estudiantes
+    monkeypatch.setattr(comparisons, 'MAX_DISTINCT_VALUES', 8)
+    rng = np.random.default_rng(5)
+    groups = {'2019': rng.normal(12, 3, 120), '2020': rng.normal(12, 3, 90)}
+    first = compare_groups(groups, 'año_ingreso', resamples=500, seed=1, max_workers=1)
+    assert_same_report(first, compare_groups(groups, 'año_ingreso', resamples=500, seed=1, max_workers=1))
+    assert first.tests.loc[0, 'p_valor'] > 1 / 501
+
+
+def test_holm_adjustment():
+    adjusted = holm_adjust(np.array([0.01, 0.04, 0.03, 0.5]))
+    assert adjusted == pytest.approx([0.04, 0.09, 0.09, 0.5])
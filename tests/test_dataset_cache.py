@@ -0,0 +1,81 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import dataset_cache
+from data_manager import DataManager
+from dataset_cache import cache_dir_for, load_dataset
+
+
+@pytest.fixture
+def source(dataset_file, tmp_path):
+    """Copia del conjunto de prueba con su caché ya escrita"""
+    path = str(tmp_path / 'resultados.json')
+    shutil.copy(dataset_file, path)
+    success, message = load(path)
+    assert success and not message.endswith('(caché)')
+    assert os.path.isdir(cache_dir_for(path))
+    return path
+
+
+def load(path: str):
+    manager = DataManager()
+    success, message = manager.load_data(path)
+    return success, message
+
+
+def set_mtime(path: str, offset_ns: int):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset_ns))
+
+
+def test_cached_load_matches_the_json(source):
+    manager = DataManager()
+    success, message = manager.load_data(source)
+    assert success and message.endswith('(caché)')
+    reference = DataManager()
+    reference.use_cache = False
+    assert reference.load_data(source)[0]
+    # copy() convierte las columnas mapeadas en memoria en arreglos normales
+    pd.testing.assert_frame_equal(manager.df.copy(), reference.df)
+    assert (manager.store.answers == reference.store.answers).all()
+    assert manager.validation.summary().equals(reference.validation.summary())
+
+
+def test_touching_the_source_keeps_the_cache(source):
+    set_mtime(source, 5 * 10 ** 9)
+    assert load_dataset(source) is not None
+    assert load(source)[1].endswith('(caché)')
+
+
+def test_changed_source_invalidates_the_cache(source):
+    with open(source, encoding='utf-8') as f:
+        text = f.read()
+    # Mismo tamaño, otro contenido: cambia la inicial del primer estudiante
+    start = text.index('"apellidos_nombres": "') + len('"apellidos_nombres": "')
+    changed = text[:start] + ('Z' if text[start] != 'Z' else 'Y') + text[start + 1:]
+    assert changed != text and len(changed) == len(text)
+    with open(source, 'w', encoding='utf-8') as f:
+        f.write(changed)
+    set_mtime(source, 5 * 10 ** 9)
+    assert load_dataset(source) is None
+
+    manager = DataManager()
+    success, message = manager.load_data(source)
+    assert success and not message.endswith('(caché)')
+    assert manager.df.loc[0, 'apellidos_nombres'][0] == changed[start]
+    # La carga vuelve a escribir la caché con el contenido nuevo
+    assert load(source)[1].endswith('(caché)')
+
+    with open(source, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    assert load_dataset(source) is None
+
+
+def test_format_version_bump_invalidates_the_cache(source, monkeypatch):
+    monkeypatch.setattr(dataset_cache, 'CACHE_VERSION', dataset_cache.CACHE_VERSION + 1)
+    assert load_dataset(source) is None
+    assert not load(source)[1].endswith('(caché)')
+    assert load_dataset(source) is not None
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import distractors
+from distractors import distractor_analysis, option_counts, score_groups
+from item_analysis import NOT_ASKED, OPTIONS, score_matrix
+
+
+def random_sheets(seed: int, n_students: int = 300, n_items: int = 8):
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(1, len(OPTIONS) + 1, (n_students, n_items)).astype(np.int8)
+    keys[rng.random(keys.shape) < 0.15] = NOT_ASKED
+    answers = rng.integers(0, len(OPTIONS) + 1, keys.shape).astype(np.int8)
+    answers = np.where(rng.random(keys.shape) < 0.5, np.maximum(keys, 0), answers).astype(np.int8)
+    answers[keys == NOT_ASKED] = 0
+    return answers, keys
+
+
+def test_score_groups_are_quartiles_of_the_proportion_correct():
+    answers, keys = random_sheets(1)
+    asked = (keys != NOT_ASKED).sum(axis=1)
+    groups = score_groups(score_matrix(answers, keys), asked)
+    assert np.bincount(groups).tolist() == [75, 75, 75, 75]
+    proportion = score_matrix(answers, keys).sum(axis=1) / asked
+    for g in range(3):
+        assert proportion[groups == g].max() <= proportion[groups == g + 1].min()
+
+
+@pytest.mark.parametrize('block_rows', [7, 65_536])
+def test_option_counts_match_per_quartile_loop(monkeypatch, block_rows):
+    monkeypatch.setattr(distractors, 'BLOCK_ROWS', block_rows)
+    answers, keys = random_sheets(2)
+    groups = np.random.default_rng(3).integers(0, 4, len(answers)).astype(np.int8)
+    chosen, chosen_as_key, key_counts = option_counts(answers, keys, groups)
+
+    n_codes = len(OPTIONS) + 2
+    expected = np.zeros((3, 4, answers.shape[1], n_codes), dtype=np.int64)
+    for student in range(len(answers)):
+        for item in range(answers.shape[1]):
+            key, answer = keys[student, item], answers[student, item]
+            g = groups[student]
+            if key == NOT_ASKED:
+                expected[0, g, item, -1] += 1
+                expected[2, g, item, -1] += 1
+                continue
+            expected[0, g, item, answer] += 1
+            expected[1, g, item, answer] += answer == key
+            expected[2, g, item, key] += 1
+    assert np.array_equal(chosen, expected[0])
+    assert np.array_equal(chosen_as_key, expected[1])
+    assert np.array_equal(key_counts, expected[2])
+
+
+def test_report_proportions_and_flags():
+    # Clave A en todo; Q1-Q4 ordenan a los estudiantes en cuartiles de 4
+    # (0, 1, 3 y 4 aciertos) y Q5 es la pregunta analizada: el cuartil
+    # inferior elige B, nadie elige C y D solo la elige el cuartil superior
+    ranking = np.repeat([[2, 2, 2, 2], [1, 2, 2, 2], [1, 1, 1, 2], [1, 1, 1, 1]], 4, axis=0)
+    q5 = np.array([2, 2, 2, 2, 1, 1, 2, 1, 1, 1, 1, 1, 4, 1, 1, 1])
+    answers = np.column_stack([ranking, q5]).astype(np.int8)
+    keys = np.ones_like(answers)
+    report = distractor_analysis(answers, keys, ['Q1', 'Q2', 'Q3', 'Q4', 'Q5'])
+    options = report.options[report.options['pregunta'] == 'Q5'].set_index('opcion')
+    assert report.main_keys.tolist() == [1] * 5
+    assert report.proportions.loc['Q5'].tolist() == pytest.approx([10 / 16, 5 / 16, 0, 1 / 16, 0])
+    assert options['es_clave'].tolist() == [True, False, False, False]
+    assert options['elegida'].tolist() == [10, 5, 0, 1]
+    assert options.loc['B', 'tasa_distractor'] == pytest.approx(5 / 16)
+    assert options['proporcion_q1'].tolist() == pytest.approx([0, 1, 0, 0])
+    assert options['proporcion_q4'].tolist() == pytest.approx([0.75, 0, 0, 0.25])
+    assert options['no_funcional'].tolist() == [False, False, True, True]
+    assert options.loc['C', 'motivo'] == 'Elegido por menos del 5%'
+    assert options.loc['D', 'motivo'] == 'Atrae más al grupo superior'
@@ -0,0 +1,28 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from export import write_json, write_table
+
+
+def test_non_finite_values_are_written_as_null(tmp_path):
+    path = tmp_path / 'resumen.json'
+    write_json(str(path), {'a': np.float64('nan'), 'b': float('inf'), 'c': [np.float32(1.5), np.int8(3)],
+                           'd': np.array([1.0, np.nan]), 'e': np.bool_(True), 2019: pd.NA})
+    assert json.loads(path.read_text(encoding='utf-8')) == {
+        'a': None, 'b': None, 'c': [1.5, 3], 'd': [1.0, None], 'e': True, '2019': None}
+
+
+def test_tables_with_nan_are_valid_json(tmp_path):
+    table = pd.DataFrame({'pregunta': ['Q1', 'Q2'], 'punto_biserial': [np.nan, 0.25],
+                          'total': np.array([3, 4], dtype=np.int64)})
+    paths = write_table(str(tmp_path), 'psicometria', table, ['json', 'csv'])
+    with open(paths[0], encoding='utf-8') as f:
+        rows = json.load(f, parse_constant=_reject_constant)
+    assert rows == [{'pregunta': 'Q1', 'punto_biserial': None, 'total': 3},
+                    {'pregunta': 'Q2', 'punto_biserial': 0.25, 'total': 4}]
+
+
+def _reject_constant(name):
+    raise AssertionError(f"JSON inválido: {name}")
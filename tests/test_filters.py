@@ -0,0 +1,143 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_manager import DataManager
+from group_index import DataFilter, GroupIndex
+
+
+def reference_mask(df: pd.DataFrame, data_filter: DataFilter) -> np.ndarray:
+    """Filas del filtro calculadas con una máscara booleana de pandas"""
+    mask = pd.Series(True, index=df.index)
+    if data_filter.exams is not None:
+        mask &= df['examen'].astype(str).isin(data_filter.exams)
+    if data_filter.cohorts is not None:
+        mask &= df['año_ingreso'].astype(str).isin(data_filter.cohorts)
+    return mask.to_numpy()
+
+
+def test_group_index_matches_pandas_groups():
+    df = pd.DataFrame({'examen': pd.Categorical(['B', 'A', 'B', None, 'A', 'B'], categories=['A', 'B', 'C']),
+                       'año_ingreso': ['2020', '2019', '2019', '2020', '2021', '2020']})
+    groups = GroupIndex.from_frame(df)
+    # Los grupos vacíos (C) y los valores ausentes no aparecen
+    assert groups.labels('examen') == ['A', 'B']
+    assert groups.sizes('examen') == {'A': 2, 'B': 3}
+    assert groups.sizes('año_ingreso') == {'2019': 2, '2020': 3, '2021': 1}
+    for column in ('examen', 'año_ingreso'):
+        for label in groups.labels(column):
+            expected = np.flatnonzero(df[column].astype(str) == label)
+            assert np.array_equal(groups.rows(column, label), expected)
+    assert len(groups.rows('examen', 'C')) == 0
+    assert np.array_equal(groups.union('año_ingreso', ['2021', '2019']), [1, 2, 4])
+    assert groups.select(DataFilter()) is None
+    assert np.array_equal(groups.select(DataFilter(('B',), ('2020',))), [0, 5])
+    assert len(groups.select(DataFilter(('A',), ('2020',)))) == 0
+
+
+def test_data_filter_selections_and_description():
+    assert DataFilter().is_empty and DataFilter().selections() == {}
+    data_filter = DataFilter(exams=('P1', 'P2'))
+    assert not data_filter.is_empty
+    assert data_filter.selections() == {'examen': ('P1', 'P2')}
+    assert data_filter.describe() == "Examen: P1, P2"
+    assert DataFilter(('P1',), ('2020',)).describe() == "Examen: P1 | Cohorte: 2020"
+
+
+def filters_of(data_manager):
+    exams = data_manager.groups.labels('examen')
+    cohorts = data_manager.groups.labels('año_ingreso')
+    return [DataFilter((exams[0],)), DataFilter(cohorts=tuple(cohorts[1:3])),
+            DataFilter(tuple(exams[:2]), (cohorts[0], cohorts[-1]))]
+
+
+def test_filtered_rows_match_pandas_mask(data_manager):
+    for data_filter in filters_of(data_manager):
+        mask = reference_mask(data_manager.df, data_filter)
+        assert np.array_equal(data_manager.groups.select(data_filter), np.flatnonzero(mask))
+        view = data_manager.with_filter(data_filter)
+        assert view.filtered_count() == mask.sum()
+        for column in ('examen', 'año_ingreso'):
+            expected = {label: np.flatnonzero(mask & (data_manager.df[column].astype(str) == label).to_numpy())
+                        for label in data_manager.groups.labels(column)}
+            assert {label: rows.tolist() for label, rows in view.filtered_groups(column).items()} == \
+                {label: rows.tolist() for label, rows in expected.items() if len(rows)}
+
+
+def test_filtered_aggregates_match_pandas_reference(data_manager):
+    df, store = data_manager.df, data_manager.store
+    correct = store.correct_matrix()
+    asked = store.asked_mask()
+    for data_filter in filters_of(data_manager):
+        mask = reference_mask(df, data_filter)
+        view = data_manager.with_filter(data_filter)
+        notas = df.loc[mask, 'nota']
+
+        summary = view.get_summary()
+        assert summary['total_estudiantes'] == mask.sum()
+        assert summary['examen_tipos'] == sorted(df.loc[mask, 'examen'].astype(str).unique())
+        assert summary['nota_promedio'] == pytest.approx(notas.mean())
+        assert summary['std_nota'] == pytest.approx(notas.std())
+        assert (summary['nota_min'], summary['nota_max']) == (notas.min(), notas.max())
+
+        quantiles = (0.1, 0.25, 0.5, 0.9)
+        expected = notas.quantile(list(quantiles))
+        assert view.get_percentiles(quantiles) == pytest.approx(dict(zip(quantiles, expected)))
+
+        table = view.get_questions_analysis().set_index('pregunta')
+        asked_rows = asked[mask] if asked is not None else np.ones(correct[mask].shape, dtype=bool)
+        expected = pd.DataFrame({'correctas': correct[mask].sum(axis=0), 'total': asked_rows.sum(axis=0)},
+                                index=store.questions)
+        expected = expected[expected['total'] > 0]
+        assert table.index.tolist() == expected.index.tolist()
+        assert table['correctas'].tolist() == expected['correctas'].tolist()
+        assert table['total'].tolist() == expected['total'].tolist()
+
+        cohorts = view.get_cohort_stats().set_index('año_ingreso')
+        grouped = notas.groupby(df.loc[mask, 'año_ingreso'].astype(str)).agg(['count', 'mean', 'std'])
+        assert cohorts.index.tolist() == grouped.index.tolist()
+        assert cohorts['count'].tolist() == grouped['count'].tolist()
+        assert np.allclose(cohorts['mean'], grouped['mean'])
+        assert np.allclose(cohorts['std'], grouped['std'], equal_nan=True)
+
+    # La instancia original conserva su filtro y sus resultados sin filtro
+    assert data_manager.filter.is_empty
+    assert data_manager.get_summary()['total_estudiantes'] == len(df)
+
+
+def test_compute_keeps_the_filter_of_its_cache_key(data_manager, monkeypatch):
+    """Cambiar el filtro durante un cálculo no guarda el resultado bajo la clave equivocada"""
+    exam_a, exam_b = data_manager.groups.labels('examen')[:2]
+    filter_a, filter_b = DataFilter((exam_a,)), DataFilter((exam_b,))
+    size_a = len(data_manager.groups.rows('examen', exam_a))
+    size_b = len(data_manager.groups.rows('examen', exam_b))
+    assert size_a != size_b
+
+    started, release = threading.Event(), threading.Event()
+    get_aggregate = DataManager.get_aggregate
+
+    def slow_get_aggregate(self):
+        # Pausa el cálculo del resumen antes de que lea el filtro
+        started.set()
+        assert release.wait(10)
+        return get_aggregate(self)
+
+    monkeypatch.setattr(DataManager, 'get_aggregate', slow_get_aggregate)
+    data_manager.set_filter(filter_a)
+    results = []
+    worker = threading.Thread(target=lambda: results.append(data_manager.get_summary()))
+    worker.start()
+    assert started.wait(10)
+    data_manager.set_filter(filter_b)
+    release.set()
+    worker.join()
+    monkeypatch.undo()
+
+    assert results[0]['total_estudiantes'] == size_a
+    assert data_manager.get_summary()['total_estudiantes'] == size_b
+    data_manager.set_filter(filter_a)
+    assert data_manager.get_summary()['total_estudiantes'] == size_a
+    assert data_manager.filtered_count() == size_a
+    assert np.array_equal(data_manager.filtered_rows(), data_manager.groups.rows('examen', exam_a))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from irt import ONE_PL, TWO_PL, calibrate
+
+
+def simulate(slopes: np.ndarray, difficulties: np.ndarray, n_students: int, seed: int):
+    """Aciertos simulados de un modelo 2PL con habilidades normales estándar"""
+    rng = np.random.default_rng(seed)
+    theta = rng.standard_normal(n_students)
+    probability = 1 / (1 + np.exp(-slopes[None, :] * (theta[:, None] - difficulties[None, :])))
+    return rng.random(probability.shape) < probability, theta
+
+
+def questions(n: int):
+    return [f'Q{i + 1}' for i in range(n)]
+
+
+def test_2pl_recovers_known_parameters():
+    rng = np.random.default_rng(11)
+    slopes, difficulties = rng.uniform(0.7, 2.0, 15), np.linspace(-1.5, 1.5, 15)
+    scores, theta = simulate(slopes, difficulties, 5000, seed=12)
+    result = calibrate(scores, questions(15), model=TWO_PL)
+    assert result.converged
+    assert np.abs(result.difficulties - difficulties).max() < 0.25
+    assert np.abs(result.slopes - slopes).max() < 0.35
+    assert np.corrcoef(result.slopes, slopes)[0, 1] > 0.9
+    assert np.corrcoef(result.abilities, theta)[0, 1] > 0.85
+    assert np.all(result.ability_se > 0)
+
+
+def test_1pl_recovers_a_common_slope():
+    difficulties = np.linspace(-2, 2, 12)
+    scores, _ = simulate(np.full(12, 1.3), difficulties, 4000, seed=13)
+    result = calibrate(scores, questions(12), model=ONE_PL)
+    assert result.converged
+    assert np.ptp(result.slopes) == pytest.approx(0)
+    assert result.slopes[0] == pytest.approx(1.3, abs=0.15)
+    assert np.abs(result.difficulties - difficulties).max() < 0.25
+
+
+def test_forms_with_common_items_share_the_scale():
+    rng = np.random.default_rng(14)
+    slopes, difficulties = rng.uniform(0.8, 1.8, 16), np.linspace(-1.5, 1.5, 16)
+    scores, _ = simulate(slopes, difficulties, 6000, seed=15)
+    # Dos formas: las preguntas pares son comunes, las impares de cada mitad son propias
+    mask = np.ones(scores.shape, dtype=bool)
+    mask[:3000, 1:8:2] = False
+    mask[3000:, 9::2] = False
+    result = calibrate(scores & mask, questions(16), mask=mask, model=TWO_PL, block_rows=1000)
+    assert result.converged
+    assert np.abs(result.difficulties - difficulties).max() < 0.3
+
+    # Partiendo de la calibración anterior converge en menos iteraciones
+    again = calibrate(scores & mask, questions(16), mask=mask, model=TWO_PL, warm_start=result)
+    assert again.iterations < result.iterations
+    assert again.difficulties == pytest.approx(result.difficulties, abs=0.01)
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from json_stream import JsonRecordReader
+
+VALUES = [333.5e2, -12, {"nota": 1.5e-3, "codigo": "2021000001"}, 7, [1, 2.25], 0.125, True, None, "x"]
+
+
+@pytest.mark.parametrize('read_size', range(1, 10))
+def test_values_split_across_reads(tmp_path, read_size):
+    array = tmp_path / 'datos.json'
+    array.write_text('[333.5e2, -12, {"nota": 1.5e-3, "codigo": "2021000001"}, 7, [1, 2.25], 0.125, '
+                     'true, null, "x"]')
+    lines = tmp_path / 'datos.jsonl'
+    lines.write_text('\n'.join(json.dumps(value) for value in VALUES).replace('33350.0', '333.5e2'))
+
+    assert list(JsonRecordReader(str(array), read_size=read_size)) == VALUES
+    assert list(JsonRecordReader(str(lines), read_size=read_size)) == VALUES
+
+
+def test_invalid_number_is_rejected(tmp_path):
+    path = tmp_path / 'datos.json'
+    path.write_text('[1, 12.x]')
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonRecordReader(str(path), read_size=3))
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from psychometrics import discrimination_index, item_report, item_statistics, kr20
+
+# 6 estudiantes × 3 preguntas; puntajes totales 3, 2, 2, 1, 1, 0
+SCORES = np.array([[1, 1, 1],
+                   [1, 1, 0],
+                   [1, 0, 1],
+                   [0, 1, 0],
+                   [1, 0, 0],
+                   [0, 0, 0]], dtype=bool)
+
+
+def test_indicators_match_hand_computed_values():
+    stats = item_statistics(SCORES)
+    assert stats['p'] == pytest.approx([4 / 6, 3 / 6, 2 / 6])
+    # Grupos de ceil(6 × 0,27) = 2: inferior {6, 4}, superior {3, 1}
+    assert stats['discrimination'] == pytest.approx([1.0, 0.0, 1.0])
+    # Correlación con el total sin la pregunta: 1/9 / sqrt(2/9 · 17/36) = 2 / sqrt(34)
+    assert stats['point_biserial'] == pytest.approx([2 / np.sqrt(34), 0.0, 2 / np.sqrt(34)], abs=1e-6)
+    # KR-20 = 3/2 · (1 - (25/36) / (11/12)) = 4/11
+    assert stats['alpha'] == pytest.approx(4 / 11)
+    assert kr20(SCORES) == pytest.approx(4 / 11)
+    assert stats['alpha_if_deleted'] == pytest.approx([0.0, 2 / 3, 0.0], abs=1e-6)
+
+
+def test_full_mask_gives_the_same_indicators():
+    plain = item_statistics(SCORES)
+    masked = item_statistics(SCORES, np.ones(SCORES.shape, dtype=bool))
+    for name in ('p', 'discrimination', 'point_biserial', 'alpha_if_deleted'):
+        assert masked[name] == pytest.approx(plain[name], abs=1e-6)
+    assert masked['alpha'] == pytest.approx(plain['alpha'])
+
+
+def test_masked_discrimination_uses_only_students_asked():
+    rng = np.random.default_rng(7)
+    mask = np.ones((200, 6), dtype=bool)
+    mask[:100, 4] = False   # la forma 1 no incluye la pregunta 5
+    mask[100:, 1] = False   # la forma 2 no incluye la pregunta 2
+    scores = (rng.random(mask.shape) < np.linspace(0.3, 0.8, 6)) & mask
+    totals = scores.sum(axis=1)
+    result = discrimination_index(scores, totals, mask)
+
+    proportion = totals / mask.sum(axis=1)
+    for j in range(mask.shape[1]):
+        asked = np.flatnonzero(mask[:, j])
+        ranked = asked[np.argsort(proportion[asked], kind='stable')]
+        size = int(np.ceil(len(asked) * 0.27))
+        expected = scores[ranked[-size:], j].mean() - scores[ranked[:size], j].mean()
+        assert result[j] == pytest.approx(expected)
+
+
+def test_item_report_flags_problem_items():
+    report = item_report(SCORES, ['Q1', 'Q2', 'Q3'])
+    assert report.students == 6
+    assert report.items['pregunta'].tolist() == ['Q1', 'Q2', 'Q3']
+    # Q2 no discrimina y su eliminación aumenta la confiabilidad
+    assert report.items['problematica'].tolist() == [False, True, False]
+    assert 'Discriminación baja' in report.items.loc[1, 'motivo']
+    assert 'Reduce la confiabilidad' in report.items.loc[1, 'motivo']
@@ -0,0 +1,19 @@
+from search_index import StudentSearchIndex
+
+
+def names_found(index, names, query):
+    return [names[row] for row in index.matches(query)]
+
+
+def test_short_queries_match_word_endings():
+    names = ['PEREZ JUAN', 'LOPEZ IVAN', 'ANDRADE LUIS', 'QUISPE ROSA']
+    index = StudentSearchIndex(['1', '2', '3', '4'], names)
+    assert set(names_found(index, names, 'an')) == {'PEREZ JUAN', 'LOPEZ IVAN', 'ANDRADE LUIS'}
+    assert set(names_found(index, names, 'n')) == {'PEREZ JUAN', 'LOPEZ IVAN', 'ANDRADE LUIS'}
+
+
+def test_results_consistent_while_typing():
+    names = ['PEREZ JUAN', 'LOPEZ IVAN', 'JUANA ROJAS']
+    index = StudentSearchIndex(['1', '2', '3'], names)
+    for query in ('j', 'ju', 'jua', 'juan'):
+        assert {'PEREZ JUAN', 'JUANA ROJAS'} <= set(names_found(index, names, query))
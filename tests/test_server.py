@@ -0,0 +1,130 @@
+import gzip
+import json
+import shutil
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from group_index import DataFilter
+from server import API_PREFIX, CHART_NAMES, AnalyticsServer, AnalyticsService, decode_value, dumps, encode_value
+
+
+@pytest.fixture(scope='module')
+def service(dataset_file):
+    service = AnalyticsService()
+    success, message = service.add_dataset(dataset_file, use_cache=False)
+    assert success, message
+    return service
+
+
+def get(service, path, pairs=()):
+    status, body = service.respond(f'{API_PREFIX}/{path}', list(pairs))
+    return status, decode_value(json.loads(gzip.decompress(body)))
+
+
+def test_encode_decode_round_trip():
+    table = pd.DataFrame({'pregunta': ['Q1', 'Q2'], 'p': [0.5, np.nan], 'n': np.array([3, 4], dtype=np.int32),
+                          'ok': [True, False]}, index=pd.Index(['a', 'b'], name='clave'))
+    payload = {'tabla': table, 'arreglo': np.array([1.5, np.inf]), 'lista': (np.int64(2), np.float32(0.25)),
+               2019: None}
+    decoded = decode_value(json.loads(dumps(payload)))
+    pd.testing.assert_frame_equal(decoded['tabla'], table)
+    assert decoded['arreglo'].dtype == np.float64
+    assert np.isnan(decoded['arreglo'][1])
+    assert decoded['lista'] == [2, 0.25] and decoded['2019'] is None
+    assert encode_value(np.float64('nan')) is None
+
+
+def test_responses_match_local_results(service, dataset_file):
+    local = service.datasets['resultados']
+    exam = local.groups.labels('examen')[0]
+    view = local.with_filter(DataFilter((exam,)))
+
+    status, body = get(service, 'resultados/resumen', [('examen', exam)])
+    assert status == 200
+    assert body['resumen']['total_estudiantes'] == view.filtered_count()
+    assert body['resumen']['nota_promedio'] == pytest.approx(view.get_summary()['nota_promedio'])
+    assert body['percentiles'] == {str(q): value for q, value in view.get_percentiles().items()}
+
+    status, body = get(service, 'resultados/preguntas', [('examen', exam)])
+    pd.testing.assert_frame_equal(body['preguntas'], view.get_questions_analysis())
+    status, body = get(service, 'resultados/psicometria')
+    pd.testing.assert_frame_equal(body['preguntas'], local.get_item_report().items)
+
+    status, body = get(service, 'conjuntos')
+    assert status == 200
+    assert body['conjuntos'][0]['nombre'] == 'resultados'
+    assert body['conjuntos'][0]['estudiantes'] == local.total_count()
+
+
+def test_identical_queries_share_the_cached_response(service):
+    first = service.respond(f'{API_PREFIX}/resultados/cohortes', [('examen', 'A'), ('cohorte', '2020')])
+    second = service.respond(f'{API_PREFIX}/resultados/cohortes', [('cohorte', '2020'), ('examen', 'A')])
+    assert first[1] is second[1]
+
+
+@pytest.mark.parametrize('path, pairs, field', [
+    ('resultados/comparaciones', [('columna', 'carrera')], "'columna'"),
+    ('resultados/similitud', [('alfa', '0.2')], "'alfa'"),
+    ('resultados/similitud', [('alfa', 'x')], "'alfa'"),
+    ('resultados/buscar', [('limite', 'diez')], "'limite'"),
+    (f'resultados/graficas/{CHART_NAMES[0]}', [('modelo', '3PL')], "'modelo'"),
+])
+def test_invalid_parameters_are_400(service, path, pairs, field):
+    status, body = get(service, path, pairs)
+    assert status == 400
+    assert body['error'].startswith(field)
+
+
+@pytest.mark.parametrize('path, pairs', [
+    ('resultados', []),
+    ('otro/resumen', []),
+    ('resultados/desconocida', []),
+    ('resultados/graficas/torta', []),
+    ('resultados/resumen', [('examen', 'ZZZ')]),
+])
+def test_unknown_routes_and_empty_filters_are_404(service, path, pairs):
+    status, body = get(service, path, pairs)
+    assert status == 404
+    assert body['error']
+
+
+def test_paths_outside_the_api_are_404(service):
+    assert service.respond('/otra/resultados/resumen', [])[0] == 404
+    assert service.respond(API_PREFIX, [])[0] == 404
+
+
+def test_http_server(service):
+    server = AnalyticsServer(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with urllib.request.urlopen(f'{server.url}{API_PREFIX}/resultados/grupos?cohorte=2020') as response:
+            assert response.headers['Content-Type'].startswith('application/json')
+            body = json.loads(response.read())
+        assert body['filtro'] == "Cohorte: 2020"
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f'{server.url}{API_PREFIX}/resultados/similitud?alfa=1')
+        assert error.value.code == 400
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_files_with_the_same_name_get_unique_datasets(dataset_file, tmp_path):
+    other = tmp_path / 'otra' / 'resultados.json'
+    other.parent.mkdir()
+    shutil.copy(dataset_file, other)
+    service = AnalyticsService()
+    assert service.add_dataset(dataset_file, use_cache=False)[0]
+    assert service.add_dataset(str(other), use_cache=False)[0]
+    assert sorted(service.datasets) == ['resultados', 'resultados_2']
+    assert service.sources['resultados_2'] == str(other)
+
+    success, message = service.add_dataset(str(other), name='resultados', use_cache=False)
+    assert not success and 'resultados' in message
+    assert service.sources['resultados'] != str(other)
@@ -0,0 +1,82 @@
+import numpy as np
+
+from answer_store import AnswerStoreBuilder
+from benchmarks.generate_dataset import DatasetSpec, generate_records
+from group_index import GroupIndex
+from item_analysis import BLANK, NOT_ASKED
+from similarity import compare_group, find_similar_pairs
+
+
+def load(records):
+    builder = AnswerStoreBuilder()
+    builder.extend(records)
+    store, df = builder.build()
+    index = GroupIndex.from_frame(df)
+    return store, df, {label: index.rows('examen', label) for label in index.labels('examen')}
+
+
+def plant_copy(store, rows, matches=21):
+    """Copia en la fila rows[1] las primeras `matches` respuestas incorrectas de rows[0]"""
+    source, copier = rows[0], rows[1]
+    keys = store.key_matrix()
+    wrong = np.flatnonzero((store.answers[source] != keys[source]) & (store.answers[source] != BLANK)
+                           & (keys[source] != NOT_ASKED))
+    assert len(wrong) >= matches
+    store.answers[copier] = keys[copier]
+    store.answers[copier, wrong[:matches]] = store.answers[source, wrong[:matches]]
+
+
+def brute_force(answers, keys, a, b):
+    """M, E y V del par (a, b) con s_q calculada sin sus respuestas"""
+    others = np.ones(len(answers), dtype=bool)
+    others[[a, b]] = False
+    matches = expected = variance = 0.0
+    for q in range(answers.shape[1]):
+        wrong = (keys[:, q] != NOT_ASKED) & (answers[:, q] != BLANK) & (answers[:, q] != keys[:, q])
+        if not (wrong[a] and wrong[b]):
+            continue
+        matches += answers[a, q] == answers[b, q]
+        chosen = answers[wrong & others, q]
+        rate = ((np.bincount(chosen, minlength=5) / len(chosen)) ** 2).sum() if len(chosen) else 1.0
+        expected += rate
+        variance += rate * (1 - rate)
+    return matches, expected, variance
+
+
+def test_pair_statistics_exclude_the_pair():
+    rng = np.random.default_rng(3)
+    keys = np.tile(rng.integers(1, 5, size=12, dtype=np.int8), (30, 1))
+    keys[:10, :2] = NOT_ASKED
+    answers = np.where(rng.random(keys.shape) < 0.4, keys, rng.integers(0, 5, size=keys.shape)).astype(np.int8)
+    pairs = compare_group(answers, keys, -np.inf, min_matches=0, block_size=8)
+    # Quedan fuera solo los pares sin preguntas erradas por ambos (z indefinida)
+    assert len(pairs.z) > 30 * 29 // 4
+    for i in rng.choice(len(pairs.z), size=40, replace=False):
+        matches, expected, variance = brute_force(answers, keys, pairs.left[i], pairs.right[i])
+        assert pairs.identical_incorrect[i] == matches
+        assert np.isclose(pairs.expected[i], expected, rtol=1e-4, atol=1e-4)
+        if variance > 1e-6:
+            assert np.isclose(pairs.z[i], (matches - expected) / np.sqrt(variance), rtol=1e-3, atol=1e-3)
+
+
+def test_planted_copy_is_detected():
+    records = list(generate_records(DatasetSpec(students=3876, questions=25, seed=1)))
+    store, df, groups = load(records)
+    label, rows = next(iter(groups.items()))
+    keys = store.key_matrix()
+    wrong_counts = ((store.answers != keys) & (store.answers != BLANK))[rows].sum(axis=1)
+    source = rows[np.argmax(wrong_counts)]
+    copier = rows[0] if rows[0] != source else rows[1]
+    plant_copy(store, [source, copier])
+
+    report = find_similar_pairs(store, df, groups, max_workers=1)
+    top = report.pairs.iloc[0]
+    assert {top.fila_a, top.fila_b} == {source, copier}
+    assert top.examen == label and top.incorrectas_identicas == 21
+
+    # En un grupo más pequeño la misma copia supera el ajuste de Benjamini-Hochberg
+    small = {label: np.sort(np.concatenate([[source, copier], rows[~np.isin(rows, [source, copier])][:198]]))}
+    report = find_similar_pairs(store, df, small, max_workers=1)
+    assert report.flagged_pairs >= 1
+    assert {report.pairs.iloc[0].fila_a, report.pairs.iloc[0].fila_b} == {source, copier}
+    assert report.pairs.iloc[0].marcado
@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from data_manager import DataManager
+from validation import ERROR, WARNING, invalid_codes
+
+KEY = {'Q1': 'A', 'Q2': 'B', 'Q3': 'C'}
+
+
+def record(code, answers, correct, wrong):
+    return {'codigo': code, 'apellidos_nombres': 'PÉREZ, Ana', 'examen': 'P', 'correctas': correct,
+            'incorrectas': wrong, 'nota': 10.0, 'respuestas_estudiante': answers,
+            'respuestas_correctas': KEY}
+
+
+# Una fila por regla; la primera es válida (cuenta la pregunta en blanco como incorrecta)
+RECORDS = [
+    record('2020000001', {'Q1': 'A', 'Q2': 'C', 'Q3': ''}, 1, 2),
+    record('2020000002', {'Q1': 'A', 'Q2': 'B'}, 2, 0),
+    record('2020000003', {'Q1': 'A', 'Q2': 'X', 'Q3': 'C'}, 2, 1),
+    record('2020000004', {'Q1': 'A', 'Q2': 'C', 'Q3': 'D'}, 3, 2),
+    record('2020000005', {'Q1': 'A', 'Q2': 'C', 'Q3': ''}, 1, 0),
+    record('20ab', {'Q1': 'A', 'Q2': 'B', 'Q3': 'C'}, 3, 0),
+    {'codigo': '2020000007'},
+    5,
+]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    path = tmp_path / 'observados.json'
+    path.write_text(json.dumps(RECORDS), encoding='utf-8')
+    manager = DataManager()
+    manager.use_cache = False
+    success, message = manager.load_data(str(path))
+    assert success, message
+    return manager
+
+
+def test_each_rule_flags_its_record(manager):
+    validation = manager.validation
+    assert validation.omitted == 2
+    assert validation.counts() == {'registro_incompleto': 2, 'respuesta_faltante': 1, 'respuesta_invalida': 1,
+                                   'correctas_incoherente': 1, 'incorrectas_incoherente': 1,
+                                   'codigo_invalido': 1}
+    issues = validation.issues(manager.df)
+    assert issues[['fila', 'regla', 'pregunta']].values.tolist() == [
+        [1, 'respuesta_faltante', 'Q3'], [2, 'respuesta_invalida', 'Q2'], [3, 'correctas_incoherente', ''],
+        [4, 'incorrectas_incoherente', ''], [5, 'codigo_invalido', '']]
+    assert issues['detalle'].tolist()[2:4] == ['declaradas 3, calculadas 1', 'declaradas 0, calculadas 1']
+    assert validation.severity_counts() == {ERROR: 6, WARNING: 1}
+    assert validation.message() == "Validación: 6 errores y 1 advertencias en 7 registros"
+    assert validation.flagged_rows(WARNING).tolist() == [1]
+
+
+def test_omitted_records_survive_take_and_append(manager):
+    validation = manager.validation
+    summary = validation.summary().set_index('regla')
+    assert summary.loc['registro_incompleto', ['observaciones', 'registros']].tolist() == [2, 2]
+    part = validation.take(np.array([2, 5]))
+    assert part.rows.tolist() == [0, 1] and part.omitted == 2
+    combined = validation.append(part, validation.questions)
+    assert combined.counts()['registro_incompleto'] == 4
+    assert combined.flagged_rows().tolist() == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_invalid_codes():
+    codes = ['2020000001', '202012', '20201', '2020abc', '1900123456', '2020000000001', '']
+    assert invalid_codes(codes).tolist() == [False, False, True, True, True, True, True]
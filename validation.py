@@ -0,0 +1,287 @@
+"""
+Validación del conjunto de datos (requisitos, sección 5.2)
+
+Las reglas se evalúan una sola vez sobre el conjunto completo, con
+operaciones de NumPy sobre la matriz de respuestas y las columnas del
+DataFrame, en lugar de revisar los registros uno por uno:
+    - respuesta_faltante: una pregunta de la clave del estudiante no aparece
+      en sus respuestas
+    - respuesta_invalida: la respuesta no es A, B, C, D ni está en blanco
+    - correctas_incoherente: 'correctas' no coincide con los aciertos
+      calculados a partir de las respuestas y la clave
+    - incorrectas_incoherente: 'incorrectas' no coincide con las respuestas
+      erradas (se acepta también contar las preguntas en blanco como
+      incorrectas)
+    - codigo_invalido: el código no es el año de ingreso seguido de dígitos
+
+Las respuestas faltantes e inválidas se detectan al codificar (códigos
+MISSING e INVALID, ver AnswerStoreBuilder.flagged_answers) y en el almacén se
+guardan como BLANK, por lo que los análisis las tratan como preguntas en
+blanco. Los registros sin los campos obligatorios se omiten al leer
+(DataManager.validate_record) y solo se cuentan en el reporte.
+
+Todas las observaciones quedan en un ValidationReport: arreglos paralelos con
+la regla, la fila del DataFrame y la pregunta, sin crear un objeto por
+observación.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from answer_store import AnswerStore
+from item_analysis import BLANK, INVALID, MISSING, NOT_ASKED, score_matrix
+
+# Severidades
+ERROR = 'error'
+WARNING = 'advertencia'
+
+# Formato del código: año de ingreso (4 dígitos) seguido de dígitos
+CODE_MIN_LENGTH = 6
+CODE_MAX_LENGTH = 12
+CODE_YEAR_RANGE = (1950, 2100)
+
+# Filas por bloque al contar aciertos y errores
+BLOCK_ROWS = 65_536
+
+
+class ValidationRule(NamedTuple):
+    """Regla de validación"""
+    name: str
+    severity: str
+    description: str
+
+
+RULES: Tuple[ValidationRule, ...] = (
+    ValidationRule('registro_incompleto', ERROR, "Registro sin los campos obligatorios (omitido)"),
+    ValidationRule('respuesta_faltante', WARNING, "Pregunta de la clave sin respuesta del estudiante"),
+    ValidationRule('respuesta_invalida', ERROR, "Respuesta distinta de A, B, C, D o en blanco"),
+    ValidationRule('correctas_incoherente', ERROR, "'correctas' no coincide con las respuestas"),
+    ValidationRule('incorrectas_incoherente', ERROR, "'incorrectas' no coincide con las respuestas"),
+    ValidationRule('codigo_invalido', ERROR,
+                   f"El código no es el año de ingreso seguido de dígitos "
+                   f"({CODE_MIN_LENGTH} a {CODE_MAX_LENGTH} dígitos)"),
+)
+RULE_INDEX: Dict[str, int] = {rule.name: i for i, rule in enumerate(RULES)}
+
+# Columna declarada en el archivo que contrasta cada regla de coherencia
+_DECLARED_COLUMNS = {'correctas_incoherente': 'correctas', 'incorrectas_incoherente': 'incorrectas'}
+
+
+class ValidationReport:
+    """Observaciones de validación de un conjunto de datos
+
+    Cada observación ocupa la misma posición en cuatro arreglos: la regla
+    (índice en RULES), la fila del DataFrame, la columna de la pregunta (-1
+    si la regla se refiere al registro completo) y el valor calculado en las
+    reglas de coherencia (-1 en las demás). Los registros omitidos no tienen
+    fila y solo se cuentan en omitted.
+    """
+
+    def __init__(self, rules: np.ndarray, rows: np.ndarray, columns: np.ndarray, values: np.ndarray,
+                 questions: Sequence[str], n_rows: int, omitted: int = 0):
+        self.rules = np.asarray(rules, dtype=np.int8)
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.columns = np.asarray(columns, dtype=np.int32)
+        self.values = np.asarray(values, dtype=np.int32)
+        self.questions: List[str] = list(questions)
+        self.n_rows = n_rows
+        self.omitted = omitted
+
+    @classmethod
+    def empty(cls, questions: Sequence[str] = (), n_rows: int = 0, omitted: int = 0) -> 'ValidationReport':
+        return cls(np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0), questions, n_rows, omitted)
+
+    def __len__(self) -> int:
+        return len(self.rows) + self.omitted
+
+    def counts(self) -> Dict[str, int]:
+        """Observaciones por regla (solo las reglas con alguna)"""
+        counts = np.bincount(self.rules, minlength=len(RULES))
+        counts[RULE_INDEX['registro_incompleto']] += self.omitted
+        return {rule.name: int(count) for rule, count in zip(RULES, counts) if count}
+
+    def severity_counts(self) -> Dict[str, int]:
+        """Observaciones por severidad"""
+        totals = {ERROR: 0, WARNING: 0}
+        for name, count in self.counts().items():
+            totals[RULES[RULE_INDEX[name]].severity] += count
+        return totals
+
+    def flagged_rows(self, severity: Optional[str] = None) -> np.ndarray:
+        """Filas con al menos una observación (de la severidad indicada)"""
+        if severity is None:
+            return np.unique(self.rows)
+        rules = [i for i, rule in enumerate(RULES) if rule.severity == severity]
+        return np.unique(self.rows[np.isin(self.rules, rules)])
+
+    def summary(self) -> pd.DataFrame:
+        """Observaciones y registros afectados por regla"""
+        records = np.zeros(len(RULES), dtype=np.int64)
+        if len(self.rows):
+            # Pares (regla, fila) distintos
+            pairs = np.unique(self.rules.astype(np.int64) * (self.n_rows + 1) + self.rows)
+            records = np.bincount(pairs // (self.n_rows + 1), minlength=len(RULES))
+        records[RULE_INDEX['registro_incompleto']] += self.omitted
+        counts = self.counts()
+        return pd.DataFrame([
+            {'regla': rule.name, 'severidad': rule.severity, 'descripcion': rule.description,
+             'observaciones': counts[rule.name], 'registros': int(records[i])}
+            for i, rule in enumerate(RULES) if rule.name in counts
+        ], columns=['regla', 'severidad', 'descripcion', 'observaciones', 'registros'])
+
+    def message(self) -> str:
+        """Resumen de una línea para la barra de estado o un diálogo"""
+        if not len(self):
+            return "Validación: sin observaciones"
+        totals = self.severity_counts()
+        return (f"Validación: {totals[ERROR]} errores y {totals[WARNING]} advertencias "
+                f"en {len(self.flagged_rows()) + self.omitted} registros")
+
+    def issues(self, df: Optional[pd.DataFrame] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """Tabla de observaciones ordenada por fila
+
+        Con el DataFrame de estudiantes se agregan el código y, en las
+        reglas de coherencia, el valor declarado junto al calculado.
+        """
+        order = np.lexsort((self.columns, self.rules, self.rows))
+        if limit is not None:
+            order = order[:limit]
+        rules, rows, columns, values = (self.rules[order], self.rows[order],
+                                        self.columns[order], self.values[order])
+
+        questions = np.array(self.questions + [''], dtype=object)
+        table = pd.DataFrame({
+            'fila': rows,
+            'regla': np.array([rule.name for rule in RULES], dtype=object)[rules],
+            'severidad': np.array([rule.severity for rule in RULES], dtype=object)[rules],
+            'pregunta': questions[columns],
+        })
+        details = np.full(len(order), '', dtype=object)
+        if df is not None:
+            table.insert(1, 'codigo', df['codigo'].to_numpy()[rows])
+            for name, column in _DECLARED_COLUMNS.items():
+                selected = rules == RULE_INDEX[name]
+                if selected.any():
+                    declared = df[column].to_numpy()[rows[selected]]
+                    details[selected] = [f"declaradas {d:g}, calculadas {v}"
+                                         for d, v in zip(declared, values[selected])]
+        table['detalle'] = details
+        return table
+
+    def take(self, rows: np.ndarray) -> 'ValidationReport':
+        """Reporte de las filas indicadas (ordenadas), renumeradas desde 0"""
+        rows = np.asarray(rows, dtype=np.int64)
+        keep = np.isin(self.rows, rows)
+        return ValidationReport(self.rules[keep], np.searchsorted(rows, self.rows[keep]),
+                                self.columns[keep], self.values[keep], self.questions, len(rows),
+                                self.omitted)
+
+    def append(self, other: 'ValidationReport', questions: Sequence[str]) -> 'ValidationReport':
+        """Reporte de un conjunto con las filas de otro a continuación
+
+        questions es la lista de preguntas del almacén combinado; las
+        columnas de ambos reportes se traducen por nombre.
+        """
+        position = {question: i for i, question in enumerate(questions)}
+
+        def remap(report: 'ValidationReport') -> np.ndarray:
+            lookup = np.array([position[q] for q in report.questions] + [-1], dtype=np.int32)
+            return lookup[report.columns]
+
+        return ValidationReport(
+            np.concatenate([self.rules, other.rules]),
+            np.concatenate([self.rows, other.rows + self.n_rows]),
+            np.concatenate([remap(self), remap(other)]),
+            np.concatenate([self.values, other.values]),
+            questions, self.n_rows + other.n_rows, self.omitted + other.omitted)
+
+
+def invalid_codes(codes: Sequence) -> np.ndarray:
+    """Máscara de códigos que no son un año de ingreso seguido de dígitos
+
+    Los códigos se convierten a un arreglo de texto de ancho fijo y se
+    revisan como una matriz de caracteres (UCS-4), sin expresiones regulares.
+    """
+    text = np.asarray(codes, dtype=str)
+    width = text.dtype.itemsize // 4
+    if not len(text) or not width:
+        return np.ones(len(text), dtype=bool)
+    chars = text.view(np.uint32).reshape(len(text), width)
+    padding = chars == 0
+    digits = (chars >= ord('0')) & (chars <= ord('9'))
+    length = width - padding.sum(axis=1)
+    valid = (digits | padding).all(axis=1) & (length >= CODE_MIN_LENGTH) & (length <= CODE_MAX_LENGTH)
+    if width >= 4:
+        year = ((chars[:, :4].astype(np.int64) - ord('0')) * np.array([1000, 100, 10, 1])).sum(axis=1)
+        valid &= (year >= CODE_YEAR_RANGE[0]) & (year <= CODE_YEAR_RANGE[1])
+    return ~valid
+
+
+def answer_counts(store: AnswerStore, invalid_per_row: Optional[np.ndarray] = None
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aciertos, respuestas erradas y preguntas aplicadas de cada estudiante
+
+    Las respuestas inválidas (guardadas como BLANK) se cuentan como erradas.
+    Se recorre la matriz por bloques de filas para no crear matrices
+    intermedias del tamaño del conjunto.
+    """
+    n = len(store)
+    correct = np.zeros(n, dtype=np.int32)
+    wrong = np.zeros(n, dtype=np.int32)
+    asked = np.zeros(n, dtype=np.int32)
+    for start in range(0, n, BLOCK_ROWS):
+        block = slice(start, min(start + BLOCK_ROWS, n))
+        answers = store.answers[block]
+        keys = store.key_table[store.key_index[block]]
+        block_asked = keys != NOT_ASKED
+        correct[block] = score_matrix(answers, keys).sum(axis=1)
+        wrong[block] = ((answers != BLANK) & block_asked).sum(axis=1) - correct[block]
+        asked[block] = block_asked.sum(axis=1)
+    if invalid_per_row is not None:
+        wrong += invalid_per_row.astype(np.int32)
+    return correct, wrong, asked
+
+
+def validate_dataset(store: AnswerStore, df: pd.DataFrame,
+                     flagged_answers: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+                     omitted: int = 0) -> ValidationReport:
+    """Evalúa todas las reglas sobre el conjunto y reúne las observaciones
+
+    flagged_answers son las respuestas ausentes o inválidas registradas al
+    codificar (AnswerStoreBuilder.flagged_answers); omitted, el número de
+    registros descartados por falta de campos.
+    """
+    n = len(df)
+    parts: List[Tuple[int, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]] = []
+
+    invalid_per_row = None
+    if flagged_answers is not None and len(flagged_answers[0]):
+        rows, columns, codes = flagged_answers
+        for name, code in (('respuesta_faltante', MISSING), ('respuesta_invalida', INVALID)):
+            selected = codes == code
+            parts.append((RULE_INDEX[name], rows[selected], columns[selected], None))
+        invalid_per_row = np.bincount(rows[codes == INVALID], minlength=n)
+
+    correct, wrong, asked = answer_counts(store, invalid_per_row)
+    # Los valores no numéricos (NaN) nunca coinciden
+    declared_correct = df['correctas'].to_numpy(dtype=np.float64)
+    declared_wrong = df['incorrectas'].to_numpy(dtype=np.float64)
+    bad_correct = np.flatnonzero(declared_correct != correct)
+    bad_wrong = np.flatnonzero((declared_wrong != wrong) & (declared_wrong != asked - correct))
+    parts.append((RULE_INDEX['correctas_incoherente'], bad_correct, None, correct[bad_correct]))
+    parts.append((RULE_INDEX['incorrectas_incoherente'], bad_wrong, None, wrong[bad_wrong]))
+
+    parts.append((RULE_INDEX['codigo_invalido'], np.flatnonzero(invalid_codes(df['codigo'].to_numpy())),
+                  None, None))
+
+    def column(values: Optional[np.ndarray], size: int) -> np.ndarray:
+        return np.full(size, -1, dtype=np.int32) if values is None else values
+
+    return ValidationReport(
+        np.concatenate([np.full(len(rows), rule, dtype=np.int8) for rule, rows, _, _ in parts]),
+        np.concatenate([rows for _, rows, _, _ in parts]),
+        np.concatenate([column(columns, len(rows)) for _, rows, columns, _ in parts]),
+        np.concatenate([column(values, len(rows)) for _, rows, _, values in parts]),
+        store.questions, n, omitted)
@@ -0,0 +1,474 @@
+"""
+Gráficas de la aplicación
+
+VisualizationEngine prepara los datos de cada gráfica y actualiza figuras
+persistentes (Chart). Solo usa matplotlib.figure.Figure, sin pyplot ni
+backends de Tk: la misma figura se muestra en un FigureCanvasTkAgg en la
+interfaz o se guarda como PNG/PDF con Agg desde la línea de comandos.
+"""
+
+import copy
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from matplotlib import cbook
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+
+from data_manager import DataManager
+from distractors import RESPONSE_LABELS
+from profiling import profiler
+
+
+class VisualizationEngine:
+    """Motor de visualizaciones para la aplicación
+
+    Cada gráfica se divide en dos pasos: prepare_* calcula los datos a
+    dibujar (puede ejecutarse en un hilo de trabajo) y update_* actualiza en
+    el lugar la figura persistente (Chart) de esa gráfica.
+    """
+
+    # Número de intervalos del histograma de notas
+    HISTOGRAM_BINS = 20
+    # Curvas características: modelo TRI, máximo de curvas y puntos de θ
+    ICC_MODEL = '2PL'
+    MAX_ICC_CURVES = 30
+    ICC_THETA = np.linspace(-4, 4, 81)
+
+    def __init__(self, data_manager: DataManager):
+        self.data_manager = data_manager
+
+    def for_view(self, data_manager: DataManager) -> 'VisualizationEngine':
+        """El mismo motor sobre otra vista de los datos (DataManager.with_filter)"""
+        engine = copy.copy(self)
+        engine.data_manager = data_manager
+        return engine
+
+    def prepare_histogram(self) -> Optional[Dict]:
+        """Frecuencias del histograma de notas y promedio"""
+        if not self.data_manager.is_loaded:
+            return None
+
+        def compute(view: DataManager):
+            aggregate = view.get_aggregate()
+            counts, edges = aggregate.histogram(self.HISTOGRAM_BINS)
+            return {'counts': counts, 'edges': edges, 'mean': aggregate.scores.mean}
+
+        return self.data_manager.cached('histogram', compute, self.HISTOGRAM_BINS)
+
+    def prepare_boxplot(self) -> Optional[Dict]:
+        """Estadísticas de caja por tipo de examen e intervalos de confianza bootstrap
+
+        Las muescas de las cajas son el intervalo de la mediana y las barras
+        de error el de la media.
+        """
+        if not self.data_manager.is_loaded:
+            return None
+
+        def compute(view: DataManager):
+            # Notas de cada examen desde los índices de grupos (sin recorrer el DataFrame)
+            scores = view.get_group_scores('examen')
+            stats = cbook.boxplot_stats(list(scores.values()), labels=list(scores))
+            report = view.get_comparisons('examen')
+            medians, means = report.interval('mediana'), report.interval('media')
+            for stat in stats:
+                if stat['label'] in medians.index:
+                    stat['cilo'], stat['cihi'] = medians.loc[stat['label'], ['inferior', 'superior']]
+            return {'stats': stats, 'means': means, 'confidence': report.confidence}
+
+        return self.data_manager.cached('boxplot', compute)
+
+    def prepare_questions(self) -> Optional[Dict]:
+        """Porcentaje de acierto por pregunta"""
+        if not self.data_manager.is_loaded:
+            return None
+        return {'questions': self.data_manager.get_questions_analysis()}
+
+    def prepare_distractors(self) -> Optional[Dict]:
+        """Proporción de respuestas por opción en cada pregunta"""
+        if not self.data_manager.is_loaded:
+            return None
+        report = self.data_manager.get_distractor_analysis()
+        return {'proportions': report.proportions, 'main_keys': report.main_keys}
+
+    def prepare_cohort(self) -> Optional[Dict]:
+        """Nota promedio por año de ingreso con su intervalo de confianza bootstrap
+
+        Se muestran todas las cohortes: en las pequeñas el intervalo es ancho.
+        """
+        if not self.data_manager.is_loaded:
+            return None
+        report = self.data_manager.get_comparisons('año_ingreso')
+        return {'cohorts': report.interval('media').reset_index(), 'confidence': report.confidence}
+
+    def prepare_icc(self) -> Optional[Dict]:
+        """Curvas características de las preguntas según la calibración TRI
+
+        Con muchas preguntas se muestran MAX_ICC_CURVES repartidas por
+        dificultad, de la más fácil a la más difícil.
+        """
+        if not self.data_manager.is_loaded:
+            return None
+
+        def compute(view: DataManager):
+            calibration = view.get_irt(self.ICC_MODEL)
+            difficulties = calibration.difficulties
+            order = np.argsort(np.nan_to_num(difficulties, nan=np.inf), kind='stable')
+            if len(order) > self.MAX_ICC_CURVES:
+                order = order[np.linspace(0, len(order) - 1, self.MAX_ICC_CURVES).round().astype(int)]
+            return {
+                'theta': self.ICC_THETA,
+                'curves': calibration.curves(self.ICC_THETA)[order],
+                'questions': [calibration.questions[j] for j in order],
+                'shown': len(order),
+                'total': len(calibration.questions),
+                'model': calibration.model
+            }
+
+        return self.data_manager.cached('icc', compute, self.ICC_MODEL, self.MAX_ICC_CURVES)
+
+    # Modos de redibujo que retornan los métodos update_*
+    REDRAW_BLIT = 'blit'        # solo cambiaron artistas dinámicos; ejes intactos
+    REDRAW_FULL = 'full'        # cambiaron límites o artistas estáticos
+    REDRAW_LAYOUT = 'layout'    # cambió la estructura; recalcular márgenes
+
+    FIGSIZES = {
+        'histogram': (10, 6),
+        'boxplot': (10, 6),
+        'questions': (12, 6),
+        'distractors': (12, 6),
+        'cohort': (10, 6),
+        'icc': (10, 6)
+    }
+
+    def new_chart(self, name: str) -> 'Chart':
+        """Crea la figura persistente de una gráfica (sin datos)"""
+        return Chart(self.FIGSIZES[name])
+
+    def update_chart(self, chart: 'Chart', name: str, data: Optional[Dict]) -> str:
+        """Actualiza una gráfica con nuevos datos; retorna el modo de redibujo"""
+        with profiler.span(f'figura:{name}', 'grafica'):
+            return getattr(self, f'update_{name}')(chart, data)
+
+    @staticmethod
+    def _show_message(chart: 'Chart', text: str, fontsize: int = 14) -> str:
+        chart.reset()
+        chart.ax.text(0.5, 0.5, text,
+                      horizontalalignment='center', verticalalignment='center',
+                      transform=chart.ax.transAxes, fontsize=fontsize)
+        chart.ax.set_xticks([])
+        chart.ax.set_yticks([])
+        return VisualizationEngine.REDRAW_LAYOUT
+
+    # Máximo de etiquetas de pregunta visibles en el eje x
+    MAX_QUESTION_TICKS = 40
+
+    def _format_question_ticks(self, ax, n_questions: int):
+        """Rota las etiquetas del eje x y, con muchas preguntas, muestra solo algunas"""
+        if n_questions <= self.MAX_QUESTION_TICKS:
+            setp(ax.get_xticklabels(), rotation=45)
+            return
+        step = int(np.ceil(n_questions / self.MAX_QUESTION_TICKS))
+        for i, label in enumerate(ax.get_xticklabels()):
+            label.set_visible(i % step == 0)
+        setp(ax.get_xticklabels(), rotation=90, fontsize=8)
+
+    def _redraw_mode(self, chart: 'Chart', limits: Tuple) -> str:
+        """BLIT si los límites de los ejes no cambiaron, FULL en caso contrario"""
+        ax = chart.ax
+        old_limits = (ax.get_xlim(), ax.get_ylim())
+        ax.set_xlim(*limits[0])
+        ax.set_ylim(*limits[1])
+        return self.REDRAW_BLIT if old_limits == (ax.get_xlim(), ax.get_ylim()) else self.REDRAW_FULL
+
+    def update_histogram(self, chart: 'Chart', data: Optional[Dict]) -> str:
+        """Histograma de distribución de notas"""
+        if data is None:
+            return self._show_message(chart, 'No hay datos cargados')
+
+        ax = chart.ax
+        counts, edges = data['counts'], data['edges']
+        mean_nota = data['mean']
+        mode = None
+
+        if not chart.matches(('histogram', len(counts))):
+            chart.reset(('histogram', len(counts)))
+            _, _, patches = ax.hist(edges[:-1], bins=edges, weights=counts,
+                                    alpha=0.7, color='skyblue', edgecolor='black')
+            ax.set_xlabel('Nota')
+            ax.set_ylabel('Frecuencia')
+            ax.set_title('Distribución de Notas Finales')
+            ax.grid(True, alpha=0.3)
+
+            # Añadir línea de promedio
+            mean_line = ax.axvline(mean_nota, color='red', linestyle='--',
+                                   label=f'Promedio: {mean_nota:.2f}')
+            legend = ax.legend()
+            chart.artists.update(bars=list(patches), mean=mean_line, legend=legend)
+            chart.set_dynamic(list(patches) + [mean_line, legend])
+            mode = self.REDRAW_LAYOUT
+        else:
+            for patch, left, width, height in zip(chart.artists['bars'], edges[:-1], np.diff(edges), counts):
+                patch.set_x(left)
+                patch.set_width(width)
+                patch.set_height(height)
+            chart.artists['mean'].set_xdata([mean_nota, mean_nota])
+            chart.artists['legend'].get_texts()[0].set_text(f'Promedio: {mean_nota:.2f}')
+
+        margin = (edges[-1] - edges[0]) * 0.05 or 0.5
+        limits = ((edges[0] - margin, edges[-1] + margin), (0, max(counts.max(), 1) * 1.05))
+        return mode or self._redraw_mode(chart, limits)
+
+    def update_boxplot(self, chart: 'Chart', data: Optional[Dict]) -> str:
+        """Boxplot comparando notas por tipo de examen
+
+        Los artistas de las cajas se reemplazan; ejes, títulos y rejilla se
+        conservan.
+        """
+        if data is None:
+            return self._show_message(chart, 'No hay datos cargados')
+
+        ax = chart.ax
+        labels = tuple(stat['label'] for stat in data['stats'])
+        mode = self.REDRAW_FULL
+        if not chart.matches(('boxplot', labels)):
+            chart.reset(('boxplot', labels))
+            ax.set_xlabel('Tipo de Examen')
+            ax.set_ylabel('Nota')
+            ax.set_title('Distribución de Notas por Tipo de Examen')
+            ax.grid(True, alpha=0.3)
+            mode = self.REDRAW_LAYOUT
+        else:
+            for artist in chart.artists.pop('boxes', []):
+                artist.remove()
+
+        boxes = ax.bxp(data['stats'], shownotches=True)
+        chart.artists['boxes'] = [artist for group in boxes.values() for artist in group]
+        if 'means' in chart.artists:
+            chart.artists.pop('means').remove()
+
+        # Media de cada examen con su intervalo de confianza
+        means = data['means'].reindex([stat['label'] for stat in data['stats']])
+        values = means['valor'].to_numpy()
+        error = np.vstack([values - means['inferior'].to_numpy(), means['superior'].to_numpy() - values])
+        chart.artists['means'] = ax.errorbar(np.arange(1, len(values) + 1), values, yerr=error, fmt='D',
+                                             color='red', markersize=5, capsize=6)
+        ax.legend([chart.artists['means']], [f"Media (IC {data['confidence']:.0%})"], loc='best')
+        ax.relim()
+        ax.autoscale_view()
+        return mode
+
+    def update_questions(self, chart: 'Chart', data: Optional[Dict]) -> str:
+        """Gráfico de barras con porcentaje de acierto por pregunta"""
+        if data is None:
+            return self._show_message(chart, 'No hay datos cargados')
+
+        ax = chart.ax
+        questions_df = data['questions']
+        labels = tuple(questions_df['pregunta'])
+        values = questions_df['porcentaje_acierto'].to_numpy()
+        colors = ['green' if x > 70 else 'red' if x < 30 else 'orange' for x in values]
+
+        if not chart.matches(('questions', labels)):
+            chart.reset(('questions', labels))
+            bars = ax.bar(labels, values, color=colors, alpha=0.7)
+
+            ax.set_xlabel('Pregunta')
+            ax.set_ylabel('Porcentaje de Acierto (%)')
+            ax.set_title('Dificultad por Pregunta')
+            ax.set_ylim(0, 100)
+            ax.grid(True, alpha=0.3)
+
+            # Añadir líneas de referencia
+            ax.axhline(70, color='green', linestyle='--', alpha=0.5, label='Fácil (>70%)')
+            ax.axhline(30, color='red', linestyle='--', alpha=0.5, label='Difícil (<30%)')
+            ax.legend()
+
+            self._format_question_ticks(ax, len(labels))
+            chart.artists['bars'] = list(bars)
+            chart.set_dynamic(list(bars))
+            return self.REDRAW_LAYOUT
+
+        # Misma estructura: solo cambian alturas y colores (eje Y fijo en 0-100)
+        for bar, value, color in zip(chart.artists['bars'], values, colors):
+            bar.set_height(value)
+            bar.set_color(color)
+        return self.REDRAW_BLIT
+
+    # Colores de las respuestas A, B, C, D y en blanco
+    RESPONSE_COLORS = ('#4c72b0', '#dd8452', '#55a868', '#c44e52', '#bbbbbb')
+
+    def update_distractors(self, chart: 'Chart', data: Optional[Dict]) -> str:
+        """Barras apiladas con la proporción de estudiantes que eligió cada opción
+
+        La opción que es clave para la mayoría se resalta con borde negro.
+        """
+        if data is None:
+            return self._show_message(chart, 'No hay datos cargados')
+
+        ax = chart.ax
+        proportions = data['proportions']
+        labels = tuple(proportions.index)
+        values = proportions.to_numpy() * 100
+        bottoms = np.zeros(len(labels))
+
+        if not chart.matches(('distractors', labels)):
+            chart.reset(('distractors', labels))
+            segments = []
+            for column, (label, color) in enumerate(zip(RESPONSE_LABELS, self.RESPONSE_COLORS)):
+                bars = ax.bar(labels, values[:, column], bottom=bottoms, color=color,
+                              alpha=0.85, label=label)
+                segments.append(list(bars))
+                bottoms = bottoms + values[:, column]
+
+            ax.set_xlabel('Pregunta')
+            ax.set_ylabel('Estudiantes (%)')
+            ax.set_title('Distribución de Respuestas por Opción')
+            ax.set_ylim(0, 100)
+            ax.legend(loc='upper left', bbox_to_anchor=(1.0, 1.0))
+            self._format_question_ticks(ax, len(labels))
+            chart.artists['segments'] = segments
+            chart.set_dynamic([bar for bars in segments for bar in bars])
+            mode = self.REDRAW_LAYOUT
+        else:
+            for column, bars in enumerate(chart.artists['segments']):
+                for bar, bottom, value in zip(bars, bottoms, values[:, column]):
+                    bar.set_y(bottom)
+                    bar.set_height(value)
+                bottoms = bottoms + values[:, column]
+            mode = self.REDRAW_BLIT
+
+        # Resaltar la clave (columna main_key - 1 de las opciones A-D)
+        for column, bars in enumerate(chart.artists['segments']):
+            for bar, key in zip(bars, data['main_keys']):
+                is_key = column == key - 1
+                bar.set_edgecolor('black' if is_key else 'none')
+                bar.set_linewidth(1.5 if is_key else 0)
+        return mode
+
+    def update_cohort(self, chart: 'Chart', data: Optional[Dict]) -> str:
+        """Gráfico de rendimiento por cohorte (año de ingreso)"""
+        if data is None:
+            return self._show_message(chart, 'No hay datos cargados')
+
+        cohort_stats = data['cohorts']
+        if cohort_stats.empty:
+            return self._show_message(chart, 'Datos insuficientes para análisis por cohorte', fontsize=12)
+
+        ax = chart.ax
+        labels = tuple(cohort_stats['grupo'])
+        means = cohort_stats['valor'].to_numpy()
+        upper = cohort_stats['superior'].to_numpy()
+        error = np.vstack([means - cohort_stats['inferior'].to_numpy(), upper - means])
+        texts = [f'{value:.1f}\nn={count:,}' for value, count in zip(means, cohort_stats['estudiantes'])]
+
+        if not chart.matches(('cohort', labels)):
+            chart.reset(('cohort', labels))
+            bars = ax.bar(labels, means, alpha=0.7, color='lightcoral')
+            ax.set_xlabel('Año de Ingreso')
+            ax.set_ylabel('Nota Promedio')
+            ax.set_title('Rendimiento Promedio por Cohorte')
+            ax.grid(True, alpha=0.3)
+
+            # Añadir valores y número de estudiantes sobre las barras de error
+            chart.artists['bars'] = list(bars)
+            chart.artists['texts'] = [ax.text(bar.get_x() + bar.get_width() / 2, top + 0.1, text,
+                                              ha='center', va='bottom', fontsize=9)
+                                      for bar, top, text in zip(bars, upper, texts)]
+            mode = self.REDRAW_LAYOUT
+        else:
+            for bar, label, value, top, text in zip(chart.artists['bars'], chart.artists['texts'],
+                                                     means, upper, texts):
+                bar.set_height(value)
+                label.set_y(top + 0.1)
+                label.set_text(text)
+            chart.artists.pop('errors').remove()
+
+        # Intervalo de confianza de la media (se reemplaza en cada actualización)
+        bars = chart.artists['bars']
+        positions = [bar.get_x() + bar.get_width() / 2 for bar in bars]
+        chart.artists['errors'] = ax.errorbar(positions, means, yerr=error, fmt='none', ecolor='black',
+                                              capsize=5, label=f"IC {data['confidence']:.0%} de la media")
+        ax.legend(loc='lower right')
+        ax.set_xlim(bars[0].get_x() - 0.5, bars[-1].get_x() + bars[-1].get_width() + 0.5)
+        ax.set_ylim(0, max(np.nanmax(upper), 0) * 1.15 + 0.5)
+        # Las barras de error se reemplazan, por lo que siempre se redibuja todo
+        return mode or self.REDRAW_FULL
+
+    def update_icc(self, chart: 'Chart', data: Optional[Dict]) -> str:
+        """Curvas características de las preguntas (probabilidad de acierto según θ)"""
+        if data is None:
+            return self._show_message(chart, 'No hay datos cargados')
+        if not data['shown']:
+            return self._show_message(chart, 'No hay preguntas para calibrar', fontsize=12)
+
+        ax = chart.ax
+        labels = tuple(data['questions'])
+        title = f"Curvas Características de las Preguntas (TRI {data['model']})"
+        if data['shown'] < data['total']:
+            title += f" - {data['shown']} de {data['total']} preguntas"
+
+        if not chart.matches(('icc', labels)):
+            chart.reset(('icc', labels))
+            lines = ax.plot(data['theta'], data['curves'].T, linewidth=1.2, alpha=0.8)
+            for line, label in zip(lines, labels):
+                line.set_label(label)
+            ax.set_xlabel('Habilidad (θ)')
+            ax.set_ylabel('Probabilidad de Acierto')
+            ax.set_xlim(data['theta'][0], data['theta'][-1])
+            ax.set_ylim(0, 1)
+            ax.axhline(0.5, color='gray', linestyle=':', alpha=0.6)
+            ax.grid(True, alpha=0.3)
+            if len(lines) <= 10:
+                ax.legend(loc='upper left', bbox_to_anchor=(1.0, 1.0))
+            chart.artists['title'] = ax.set_title(title)
+            chart.artists['lines'] = lines
+            chart.set_dynamic(list(lines))
+            return self.REDRAW_LAYOUT
+
+        # Mismas preguntas: solo cambian las curvas (ejes fijos)
+        for line, curve in zip(chart.artists['lines'], data['curves']):
+            line.set_ydata(curve)
+        if chart.artists['title'].get_text() != title:
+            chart.artists['title'].set_text(title)
+            return self.REDRAW_FULL
+        return self.REDRAW_BLIT
+
+
+class Chart:
+    """Figura persistente de una gráfica
+
+    La figura y sus ejes se crean una sola vez; las actualizaciones modifican
+    los artistas existentes (alturas de barras, posiciones de líneas, textos)
+    en lugar de construir una figura nueva. Los artistas dinámicos se marcan
+    como animados para poder redibujarlos con blitting sobre un fondo fijo.
+    """
+
+    def __init__(self, figsize: Tuple[float, float], dpi: int = 100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.figure.add_subplot(111)
+        self.artists: Dict[str, object] = {}
+        self.dynamic: List = []
+        self.structure: Optional[Tuple] = None
+
+    def matches(self, structure: Tuple) -> bool:
+        """Indica si la gráfica ya tiene la estructura dada y puede actualizarse en el lugar"""
+        return self.structure == structure
+
+    def reset(self, structure: Optional[Tuple] = None):
+        """Limpia los ejes para construir una nueva estructura"""
+        self.ax.clear()
+        self.artists = {}
+        self.dynamic = []
+        self.structure = structure
+
+    def set_dynamic(self, artists: List):
+        """Marca los artistas que se actualizan con blitting"""
+        for artist in artists:
+            artist.set_animated(True)
+        self.dynamic = list(artists)
+
+    def draw_dynamic(self):
+        """Dibuja los artistas dinámicos sobre el renderizador actual"""
+        for artist in self.dynamic:
+            self.figure.draw_artist(artist)